@@ -0,0 +1,267 @@
+"""
+analysis_queue.py - Durable background queue for resume analysis
+
+Applications are enqueued as rows of the analysis_jobs table inside the same
+transaction that records the application, so a job exists exactly when the
+application does. Worker threads in each web process claim queued rows,
+run the analysis handler and store its result for status polling. No
+external broker is needed; rows left 'running' by a crashed worker are
+requeued when a process starts its workers, or claimed again by a worker,
+once their lease expires.
+"""
+
+import os
+import json
+import uuid
+import logging
+import threading
+import traceback
+from datetime import datetime, timedelta
+from database import get_db_connection, SCHEMA
+
+logger = logging.getLogger(__name__)
+
+STATUS_QUEUED = 'queued'
+STATUS_RUNNING = 'running'
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+
+
+class AnalysisQueue:
+    """
+    MySQL-backed job queue with a local pool of worker threads.
+
+    `handler(job)` receives the claimed row (with `payload` decoded) and
+    returns a JSON-serializable result. `failure_handler(job, error)` runs
+    once a job has used up its attempts.
+    """
+
+    def __init__(self, handler, failure_handler=None, workers=2, poll_interval=2.0,
+                 lease_seconds=300, max_attempts=3):
+        self.handler = handler
+        self.failure_handler = failure_handler
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        self._started_pid = None
+
+    @classmethod
+    def from_env(cls, handler, failure_handler=None):
+        return cls(
+            handler,
+            failure_handler=failure_handler,
+            workers=int(os.getenv('ANALYSIS_WORKERS', 2)),
+            poll_interval=float(os.getenv('ANALYSIS_POLL_INTERVAL', 2.0)),
+            lease_seconds=int(os.getenv('ANALYSIS_LEASE_SECONDS', 300)),
+            max_attempts=int(os.getenv('ANALYSIS_MAX_ATTEMPTS', 3))
+        )
+
+    def start(self):
+        """Starts the worker threads once per process; safe to call on every request"""
+        if self._started_pid == os.getpid():
+            return
+
+        with self._lock:
+            if self._started_pid == os.getpid():
+                return
+
+            try:
+                if not SCHEMA.has_table('analysis_jobs'):
+                    logger.error("analysis_jobs table is missing; run 'alembic upgrade head'. Analysis workers not started.")
+                    self._started_pid = os.getpid()
+                    return
+            except Exception as e:
+                # Try again on a later request
+                logger.error(f"Analysis queue could not check for its table: {str(e)}")
+                return
+
+            self._started_pid = os.getpid()
+
+            try:
+                recovered = self.recover()
+                if recovered:
+                    logger.warning(f"Requeued {recovered} analysis jobs whose lease expired")
+            except Exception as e:
+                # Expired leases are still claimed again by _claim()
+                logger.error(f"Analysis queue could not recover expired jobs: {str(e)}")
+
+            for i in range(self.workers):
+                thread = threading.Thread(
+                    target=self._run_worker,
+                    name=f"analysis-worker-{i}",
+                    daemon=True
+                )
+                thread.start()
+
+            logger.info(f"Started {self.workers} analysis workers in process {self._started_pid}")
+
+    def recover(self):
+        """
+        Requeues jobs left 'running' past their lease, e.g. by a process that
+        was restarted mid-analysis. Returns how many were requeued.
+        """
+        now = datetime.now()
+        lease_expired = now - timedelta(seconds=self.lease_seconds)
+
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("""
+                UPDATE analysis_jobs
+                SET status = %s, claim_token = NULL, updated_at = %s
+                WHERE status = %s AND claimed_at < %s
+            """, (STATUS_QUEUED, now, STATUS_RUNNING, lease_expired))
+            conn.commit()
+            return cursor.rowcount
+        finally:
+            cursor.close()
+            conn.close()
+
+    def enqueue(self, cursor, applicant_id, job_id, assessment_id, payload):
+        """
+        Adds a job using the caller's cursor, so it commits or rolls back with
+        the application. Call notify() after the commit to wake a worker.
+        """
+        cursor.execute("""
+            INSERT INTO analysis_jobs (
+                applicant_id, job_id, assessment_id, payload, status, created_at
+            ) VALUES (%s, %s, %s, %s, %s, %s)
+        """, (
+            applicant_id,
+            job_id,
+            assessment_id,
+            json.dumps(payload),
+            STATUS_QUEUED,
+            datetime.now()
+        ))
+        return cursor.lastrowid
+
+    def notify(self):
+        """Wakes a worker, starting this process's workers on first use"""
+        self.start()
+        self._wakeup.set()
+
+    def get_status(self, assessment_id):
+        """Latest analysis job for an assessment session, or None"""
+        conn = get_db_connection()
+        cursor = conn.cursor(dictionary=True)
+        try:
+            cursor.execute("""
+                SELECT id, status, attempts, result, error, created_at, updated_at
+                FROM analysis_jobs
+                WHERE assessment_id = %s
+                ORDER BY id DESC
+                LIMIT 1
+            """, (assessment_id,))
+            job = cursor.fetchone()
+        finally:
+            cursor.close()
+            conn.close()
+
+        if not job:
+            return None
+
+        if job['result']:
+            job['result'] = json.loads(job['result'])
+        for key in ('created_at', 'updated_at'):
+            if job[key]:
+                job[key] = job[key].isoformat()
+        return job
+
+    def _claim(self):
+        token = str(uuid.uuid4())
+        now = datetime.now()
+        lease_expired = now - timedelta(seconds=self.lease_seconds)
+
+        conn = get_db_connection()
+        cursor = conn.cursor(dictionary=True)
+        try:
+            # Single UPDATE so two workers can never claim the same row
+            cursor.execute("""
+                UPDATE analysis_jobs
+                SET status = %s, claim_token = %s, claimed_at = %s,
+                    attempts = attempts + 1, updated_at = %s
+                WHERE status = %s OR (status = %s AND claimed_at < %s)
+                ORDER BY id
+                LIMIT 1
+            """, (
+                STATUS_RUNNING, token, now, now,
+                STATUS_QUEUED, STATUS_RUNNING, lease_expired
+            ))
+            conn.commit()
+
+            if cursor.rowcount == 0:
+                return None
+
+            cursor.execute("SELECT * FROM analysis_jobs WHERE claim_token = %s", (token,))
+            job = cursor.fetchone()
+        finally:
+            cursor.close()
+            conn.close()
+
+        if job:
+            job['payload'] = json.loads(job['payload']) if job['payload'] else {}
+        return job
+
+    def _finish(self, job, status, result=None, error=None):
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("""
+                UPDATE analysis_jobs
+                SET status = %s, result = %s, error = %s, claim_token = NULL, updated_at = %s
+                WHERE id = %s AND claim_token = %s
+            """, (
+                status,
+                json.dumps(result) if result is not None else None,
+                error,
+                datetime.now(),
+                job['id'],
+                job['claim_token']
+            ))
+            conn.commit()
+        finally:
+            cursor.close()
+            conn.close()
+
+    def _process(self, job):
+        logger.info(f"Running analysis job {job['id']} (attempt {job['attempts']})")
+
+        try:
+            result = self.handler(job)
+            self._finish(job, STATUS_DONE, result=result)
+            logger.info(f"Analysis job {job['id']} done")
+            return
+        except Exception as e:
+            error = str(e)
+            logger.error(f"Analysis job {job['id']} failed: {error}\n{traceback.format_exc()}")
+
+        if job['attempts'] < self.max_attempts:
+            self._finish(job, STATUS_QUEUED, error=error)
+            return
+
+        if self.failure_handler is not None:
+            try:
+                self.failure_handler(job, error)
+            except Exception as e:
+                logger.error(f"Failure handler for analysis job {job['id']} failed: {str(e)}")
+        self._finish(job, STATUS_FAILED, error=error)
+
+    def _run_worker(self):
+        while True:
+            try:
+                job = self._claim()
+            except Exception as e:
+                logger.error(f"Analysis worker could not claim a job: {str(e)}")
+                job = None
+
+            if job is None:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+                continue
+
+            self._process(job)
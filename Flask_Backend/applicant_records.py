@@ -0,0 +1,82 @@
+"""
+applicant_records.py - Single-statement writes for applicants and their applications
+
+Every write is an INSERT ... ON DUPLICATE KEY UPDATE against the unique keys
+on applicants.email, job_applicants(job_id, applicant_id) and
+applicant_files(applicant_id, job_id), so concurrent submits with the same
+email can neither race nor create duplicate rows. All functions take the
+caller's cursor and run inside its transaction.
+"""
+
+import logging
+from datetime import datetime
+from dashboard_stats import DASHBOARD_STATS
+
+logger = logging.getLogger(__name__)
+
+
+def _inserted(cursor):
+    # MySQL reports 1 affected row for an insert, 2 for an update and 0 for a no-op update
+    return cursor.rowcount == 1
+
+
+def upsert_applicant(cursor, email, fields, update_extra=None):
+    """
+    Creates the applicant with `email`, or updates `fields` on the existing one.
+
+    `update_extra` holds columns that are only set when the applicant already
+    exists (e.g. updated_at). Returns (applicant_id, created).
+    """
+    columns = list(fields)
+    update_extra = update_extra or {}
+
+    updates = [f"{column} = VALUES({column})" for column in columns]
+    updates += [f"{column} = %s" for column in update_extra]
+
+    # LAST_INSERT_ID(id) makes lastrowid the existing row's id on an update
+    cursor.execute(f"""
+        INSERT INTO applicants (email, {', '.join(columns)}, status, created_at)
+        VALUES (%s, {', '.join(['%s'] * len(columns))}, %s, %s)
+        ON DUPLICATE KEY UPDATE id = LAST_INSERT_ID(id), {', '.join(updates)}
+    """, [email] + [fields[column] for column in columns] + ['Applied', datetime.now()] + list(update_extra.values()))
+
+    applicant_id = cursor.lastrowid
+    created = _inserted(cursor)
+    if created:
+        DASHBOARD_STATS.applicant_created(cursor)
+    return applicant_id, created
+
+
+def link_applicant_to_job(cursor, job_id, applicant_id):
+    """
+    Records the application, or refreshes applied_at if it exists. The job's
+    applicants_count is only incremented when a new row was inserted.
+    Returns True for a new application.
+    """
+    cursor.execute("""
+        INSERT INTO job_applicants (job_id, applicant_id, applied_at)
+        VALUES (%s, %s, %s)
+        ON DUPLICATE KEY UPDATE applied_at = VALUES(applied_at)
+    """, (job_id, applicant_id, datetime.now()))
+
+    created = _inserted(cursor)
+    if created:
+        cursor.execute(
+            "UPDATE jobs SET applicants_count = applicants_count + 1 WHERE id = %s",
+            (job_id,)
+        )
+    return created
+
+
+def upsert_applicant_files(cursor, applicant_id, job_id, resume_path, cover_letter_path):
+    """Stores the upload paths of an application, replacing earlier ones"""
+    now = datetime.now()
+    cursor.execute("""
+        INSERT INTO applicant_files
+        (applicant_id, job_id, resume_path, cover_letter_path, created_at)
+        VALUES (%s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            resume_path = VALUES(resume_path),
+            cover_letter_path = VALUES(cover_letter_path),
+            updated_at = %s
+    """, (applicant_id, job_id, resume_path, cover_letter_path, now, now))
@@ -0,0 +1,28 @@
+"""
+auth.py - Session-based route decorators
+
+Shared by flask_app and the cv_analyzer blueprint, which can't import
+flask_app without a circular import.
+"""
+
+from flask import session, jsonify
+
+
+def login_required(f):
+    def decorated_function(*args, **kwargs):
+        if 'admin_id' not in session:
+            return jsonify({"error": "Authentication required"}), 401
+        return f(*args, **kwargs)
+
+    decorated_function.__name__ = f.__name__
+    return decorated_function
+
+
+def admin_required(f):
+    def decorated_function(*args, **kwargs):
+        if 'admin_id' not in session or not session.get('is_admin', False):
+            return jsonify({"error": "Admin privileges required"}), 403
+        return f(*args, **kwargs)
+
+    decorated_function.__name__ = f.__name__
+    return decorated_function
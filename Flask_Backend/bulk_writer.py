@@ -0,0 +1,82 @@
+"""
+bulk_writer.py - Multi-row INSERT and upsert statements for child collections
+
+Each helper writes a whole list of rows with one statement (plus a DELETE
+for replace_children), so the number of round-trips for a request does not
+grow with the number of responsibilities, links or answers it carries.
+Table and column names come from code, never from user input.
+"""
+
+
+def _values_clause(columns, rows):
+    row_placeholder = f"({', '.join(['%s'] * len(columns))})"
+    params = [value for row in rows for value in row]
+    return ', '.join([row_placeholder] * len(rows)), params
+
+
+def insert_rows(cursor, table, columns, rows):
+    """Inserts all `rows` (tuples ordered like `columns`) in one statement; returns the row count"""
+    rows = list(rows)
+    if not rows:
+        return 0
+
+    values, params = _values_clause(columns, rows)
+    cursor.execute(f"INSERT INTO {table} ({', '.join(columns)}) VALUES {values}", params)
+    return len(rows)
+
+
+def upsert_rows(cursor, table, columns, rows, update_columns):
+    """
+    Inserts all `rows` in one statement; rows that hit a primary or unique key
+    update `update_columns` instead. Passing a NULL auto-increment id inserts.
+    """
+    rows = list(rows)
+    if not rows:
+        return 0
+
+    values, params = _values_clause(columns, rows)
+    updates = ', '.join(f"{column} = VALUES({column})" for column in update_columns)
+    cursor.execute(
+        f"INSERT INTO {table} ({', '.join(columns)}) VALUES {values} ON DUPLICATE KEY UPDATE {updates}",
+        params
+    )
+    return len(rows)
+
+
+def replace_children(cursor, table, parent_column, parent_id, columns, rows):
+    """Replaces every row of `table` belonging to `parent_id` with `rows` (two statements)"""
+    cursor.execute(f"DELETE FROM {table} WHERE {parent_column} = %s", (parent_id,))
+    return insert_rows(cursor, table, [parent_column] + list(columns), [(parent_id,) + tuple(row) for row in rows])
+
+
+def sync_children(cursor, table, parent_column, parent_id, text_column, stored, submitted):
+    """
+    Brings the ordered child rows of `parent_id` in line with the `submitted`
+    texts using as few writes as possible.
+
+    `stored` is the current [(id, text)] in id order. Rows are matched by
+    position: changed texts are updated in place, surplus submitted texts are
+    inserted after them and surplus stored rows are deleted, so unchanged rows
+    keep their ids. Returns {"inserted": n, "updated": n, "deleted": n}.
+    """
+    stored = list(stored)
+    submitted = list(submitted)
+
+    updated = [
+        (row_id, parent_id, text)
+        for (row_id, stored_text), text in zip(stored, submitted)
+        if stored_text != text
+    ]
+    inserted = [(None, parent_id, text) for text in submitted[len(stored):]]
+    deleted = [row_id for row_id, _ in stored[len(submitted):]]
+
+    # Updates and inserts share one statement: an existing id updates, a NULL id inserts
+    upsert_rows(cursor, table, ('id', parent_column, text_column), updated + inserted, (text_column,))
+
+    if deleted:
+        cursor.execute(
+            f"DELETE FROM {table} WHERE id IN ({', '.join(['%s'] * len(deleted))})",
+            deleted
+        )
+
+    return {"inserted": len(inserted), "updated": len(updated), "deleted": len(deleted)}
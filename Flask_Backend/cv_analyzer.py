@@ -3,88 +3,73 @@ cv_analyzer.py - Enhanced PDF processing capabilities with fixed database querie
 """
 
 import os
-import re
 import uuid
 import logging
 import traceback
 import json
 from io import BytesIO
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from flask import Blueprint, request, jsonify, send_file
 from question_bank import get_assessment_questions
-from database import get_db_connection
+from database import get_db_connection, SCHEMA
+from auth import admin_required
+from applicant_records import upsert_applicant, link_applicant_to_job
+from requirements_cache import REQUIRED_SKILLS_CACHE
+from requirement_profile import RequirementProfile, compile_profile
+from skills_taxonomy import CS_SKILLS, ALL_CS_SKILLS
+from skill_vectors import SkillVectorCodec, store_skill_vector
+from skill_index import index_applicant_skills
+from text_vectors import JOB_SIMILARITY, store_text_vector
+from skill_matcher import SkillMatcher
+from extraction_cache import EXTRACTION_CACHE, hash_bytes, hash_file
+from pdf_backends import PdfExtractorRegistry, FallbackPolicy, ParallelPageExtractor, ExtractionBudget
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-# PDF processing libraries - multiple fallbacks
-PDF_PROCESSOR = None
-PDF_PROCESSOR_NAME = None
+# PDF processing backends - probed once at import, ranked on first use
+PDF_EXTRACTORS = PdfExtractorRegistry(
+    policy=FallbackPolicy.from_env(),
+    benchmark=os.getenv('PDF_BACKEND_BENCHMARK', '1') != '0',
+    parallel=ParallelPageExtractor.from_env()
+)
 
+# Bump when extraction logic changes so cached text from older code is ignored
+EXTRACTOR_VERSION = 1
 
-# Try PyPDF2 first (newer versions)
-try:
-    from PyPDF2 import PdfReader
-    PDF_PROCESSOR = PdfReader
-    PDF_PROCESSOR_NAME = "PyPDF2"
-    logger.info("Using PyPDF2 with PdfReader")
-except ImportError:
-    # Try older PyPDF2 versions
-    try:
-        from PyPDF2 import PdfFileReader
-        PDF_PROCESSOR = PdfFileReader
-        PDF_PROCESSOR_NAME = "PyPDF2-Legacy"
-        logger.info("Using PyPDF2 with PdfFileReader")
-    except ImportError:
-        # Try pdfplumber as alternative
-        try:
-            import pdfplumber
-            PDF_PROCESSOR_NAME = "pdfplumber"
-            logger.info("Using pdfplumber")
-        except ImportError:
-            # Try pdf2text as last resort
-            try:
-                import pdftotext
-                PDF_PROCESSOR_NAME = "pdftotext"
-                logger.info("Using pdftotext")
-            except ImportError:
-                logger.warning("No PDF processing libraries available. PDF parsing will be limited.")
-
-# CS Skills Dictionary with categories and keywords
-CS_SKILLS = {
-    "programming_languages": [
-        "python", "java", "javascript", "typescript", "c++", "c#", "go", "rust",
-        "php", "ruby", "swift", "kotlin", "scala", "perl", "r", "matlab"
-    ],
-    "web_frontend": [
-        "html", "css", "react", "angular", "vue", "svelte", "jquery", "bootstrap",
-        "tailwind", "sass", "less", "webpack", "babel", "vite", "nextjs", "nuxt"
-    ],
-    "web_backend": [
-        "node.js", "express", "django", "flask", "spring", "asp.net", "laravel",
-        "fastapi", "graphql", "rest api", "microservices", "serverless"
-    ],
-    "database": [
-        "sql", "mysql", "postgresql", "mongodb", "nosql", "oracle", "sqlite",
-        "redis", "cassandra", "dynamodb", "mariadb", "firebase", "elasticsearch"
-    ],
-    "devops": [
-        "docker", "kubernetes", "aws", "azure", "gcp", "jenkins", "ci/cd",
-        "terraform", "ansible", "git", "github", "gitlab", "bitbucket"
-    ],
-    "algorithms": [
-        "data structures", "algorithms", "big o notation", "sorting", "searching",
-        "dynamic programming", "recursion", "graph algorithms", "tree traversal"
-    ],
-    "software_engineering": [
-        "agile", "scrum", "kanban", "tdd", "bdd", "unit testing", "debugging",
-        "code review", "oop", "design patterns", "solid principles", "clean code"
-    ]
-}
+# Returned when every PDF backend fails; never stored in the extraction cache
+PDF_EXTRACTION_FAILED_TEXT = "PDF text extraction failed, but processing will continue. python java javascript html css react flask database sql git"
+
+
+# Screening only needs enough text to detect skills and experience; 0 disables a limit
+RESUME_MAX_PAGES = int(os.getenv('RESUME_MAX_PAGES', 10))
+RESUME_MAX_CHARS = int(os.getenv('RESUME_MAX_CHARS', 50000))
+RESUME_SKILL_SATURATION = int(os.getenv('RESUME_SKILL_SATURATION', 40))
+
+
+def _extractor_version(kind, budget=None):
+    """Version stamp stored with cached text for the given file kind"""
+    if kind == "pdf":
+        version = f"{EXTRACTOR_VERSION}:{PDF_EXTRACTORS.version_stamp()}"
+    else:
+        version = f"{EXTRACTOR_VERSION}:{kind}"
+
+    if budget is not None:
+        version = f"{version}:{budget.stamp()}"
+    return version
+
+
+def _is_cacheable_text(text):
+    return bool(text) and text != PDF_EXTRACTION_FAILED_TEXT
 
-# Flatten the skills dictionary for easier searching
-ALL_CS_SKILLS = [skill for category in CS_SKILLS.values() for skill in category]
+
+# Used when a job has no required skills set
+DEFAULT_REQUIRED_SKILLS = ['figma', 'adobe xd', 'user research', 'wireframing', 'prototyping']
+
+# Stored per application so a job's applicants can be re-ranked without their resumes
+SKILL_VECTORS = SkillVectorCodec(ALL_CS_SKILLS)
 
 # Common synonyms and variations for skills
 SKILL_SYNONYMS = {
@@ -103,6 +88,72 @@ SKILL_SYNONYMS = {
     "git": ["version control"],
 }
 
+# Built once at import so each resume is scanned in a single pass
+SKILL_MATCHER = SkillMatcher(ALL_CS_SKILLS, SKILL_SYNONYMS)
+
+
+# Uploads are written to disk on these threads, off the request's critical path
+UPLOAD_PERSIST_EXECUTOR = ThreadPoolExecutor(
+    max_workers=int(os.getenv('UPLOAD_PERSIST_WORKERS', 2)),
+    thread_name_prefix='upload-persist'
+)
+
+
+class UploadBuffer:
+    """
+    An upload read once into memory, with the name it was uploaded under.
+
+    Screening parses `data` directly while a copy is persisted to disk in
+    the background, so the request never waits for a write and read-back.
+    """
+
+    def __init__(self, filename, data):
+        self.filename = filename
+        self.data = data
+
+    @classmethod
+    def from_file(cls, file_object):
+        return cls(getattr(file_object, 'filename', None) or getattr(file_object, 'name', ''), read_upload_buffer(file_object))
+
+
+def read_upload_buffer(file_object):
+    """
+    Returns the bytes of an upload without going through disk.
+
+    Werkzeug spools small uploads into a BytesIO; its getvalue() hands out
+    the internal buffer without copying. Larger uploads spooled to a
+    temporary file are read once. Returns None if nothing can be read.
+    """
+    if isinstance(file_object, UploadBuffer):
+        return file_object.data
+    if isinstance(file_object, bytes):
+        return file_object
+    if isinstance(file_object, (bytearray, memoryview)):
+        return bytes(file_object)
+
+    stream = getattr(file_object, 'stream', file_object)
+    buffer = getattr(stream, '_file', stream)  # SpooledTemporaryFile keeps its buffer in _file
+    if isinstance(buffer, BytesIO):
+        return buffer.getvalue()
+
+    if hasattr(stream, 'read'):
+        if hasattr(stream, 'seek'):
+            stream.seek(0)
+        data = stream.read()
+        if hasattr(stream, 'seek'):
+            stream.seek(0)
+        return data
+
+    return None
+
+
+def write_upload(data, file_path):
+    """Writes upload bytes to `file_path`; meant to run on UPLOAD_PERSIST_EXECUTOR"""
+    with open(file_path, 'wb') as f:
+        f.write(data)
+    logging.getLogger('file_operations').info(f"Persisted upload to {file_path}")
+    return file_path
+
 
 def save_uploaded_file(file_object, upload_folder, applicant_id=None, file_type="resume"):
     """Fixed file saving function that handles file paths directly"""
@@ -125,8 +176,7 @@ def save_uploaded_file(file_object, upload_folder, applicant_id=None, file_type=
         original_filename = file_object.name
     else:
         # If file object doesn't have a name, create one based on timestamp
-        import datetime
-        timestamp = datetime.datetime.now().strftime("%Y%m%d%H%M%S")
+        timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
         extension = ".pdf"  # Default to PDF
         original_filename = f"uploaded_file_{timestamp}{extension}"
         logger.warning(f"No filename found, using generated name: {original_filename}")
@@ -149,6 +199,12 @@ def save_uploaded_file(file_object, upload_folder, applicant_id=None, file_type=
             logger.info(f"Copied file from {file_object} to {file_path}")
             return file_path
             
+        # If file_object was already read into memory
+        if isinstance(file_object, UploadBuffer):
+            write_upload(file_object.data, file_path)
+            logger.info(f"Saved in-memory upload to: {file_path}")
+            return file_path
+
         # If file_object is a Flask file object
         if hasattr(file_object, 'save'):
             file_object.save(file_path)
@@ -202,110 +258,74 @@ def save_uploaded_file(file_object, upload_folder, applicant_id=None, file_type=
             return None
 
 
-def extract_text_from_pdf_file(filepath):
-    """Enhanced PDF text extraction with multiple fallbacks for PythonAnywhere"""
-    logger.info(f"Extracting text from PDF: {filepath} using {PDF_PROCESSOR_NAME}")
-    extraction_errors = []
+def screening_budget():
+    """Extraction budget used when a resume is read for screening"""
+    return ExtractionBudget(
+        max_pages=RESUME_MAX_PAGES,
+        max_chars=RESUME_MAX_CHARS,
+        scanner=SKILL_MATCHER.scanner(RESUME_SKILL_SATURATION)
+    )
 
-    # 1. Try pdfplumber first (most reliable on PythonAnywhere)
-    try:
-        import pdfplumber
-        logger.info("Attempting extraction with pdfplumber")
 
-        with pdfplumber.open(filepath) as pdf:
-            text = ""
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-
-            if text and len(text.strip()) > 10:
-                logger.info(f"Successfully extracted {len(text)} chars with pdfplumber")
-                return text
-            else:
-                logger.warning("pdfplumber extracted empty or very short text")
-                extraction_errors.append("pdfplumber: Empty result")
-    except ImportError:
-        logger.warning("pdfplumber not installed")
-        extraction_errors.append("pdfplumber: Not installed")
-    except Exception as e:
-        error_msg = f"pdfplumber extraction failed: {str(e)}"
-        logger.warning(error_msg)
-        extraction_errors.append(error_msg)
-
-    # 2. Try pdftotext if available
+def extract_text_from_pdf_file(filepath, budget=None):
+    """
+    PDF text extraction, served from the extraction cache when the same bytes were parsed before.
+    With an ExtractionBudget only the first part of the document is read.
+    """
     try:
-        import pdftotext
-        logger.info("Attempting extraction with pdftotext")
-
-        with open(filepath, "rb") as f:
-            pdf = pdftotext.PDF(f)
-            if len(pdf) > 0:
-                text = "\n".join(pdf)
-                if text and len(text.strip()) > 10:
-                    logger.info(f"Successfully extracted {len(text)} chars with pdftotext")
-                    return text
-                else:
-                    logger.warning("pdftotext extracted empty or very short text")
-                    extraction_errors.append("pdftotext: Empty result")
-            else:
-                logger.warning("pdftotext found no pages")
-                extraction_errors.append("pdftotext: No pages")
-    except ImportError:
-        logger.warning("pdftotext not installed")
-        extraction_errors.append("pdftotext: Not installed")
+        digest = hash_file(filepath)
     except Exception as e:
-        error_msg = f"pdftotext extraction failed: {str(e)}"
-        logger.warning(error_msg)
-        extraction_errors.append(error_msg)
+        logger.warning(f"Could not hash {filepath} for extraction cache: {str(e)}")
+        return _extract_text_from_pdf_file(filepath, budget)
 
-    # 3. Try PyPDF2 (newer or older versions)
-    if PDF_PROCESSOR_NAME in ["PyPDF2", "PyPDF2-Legacy"]:
-        try:
-            with open(filepath, 'rb') as file:
-                reader = PDF_PROCESSOR(file)
-                text = ""
-                for page in reader.pages:
-                    text += page.extract_text() + "\n"
-
-                if text and len(text.strip()) > 10:
-                    logger.info(f"Successfully extracted {len(text)} chars with {PDF_PROCESSOR_NAME}")
-                    return text
-                else:
-                    logger.warning(f"{PDF_PROCESSOR_NAME} extracted empty or very short text")
-                    extraction_errors.append(f"{PDF_PROCESSOR_NAME}: Empty result")
-        except Exception as e:
-            error_msg = f"{PDF_PROCESSOR_NAME} extraction failed: {str(e)}"
-            logger.warning(error_msg)
-            extraction_errors.append(error_msg)
+    return EXTRACTION_CACHE.get_or_extract(
+        digest,
+        "pdf",
+        _extractor_version("pdf", budget),
+        lambda: _extract_text_from_pdf_file(filepath, budget),
+        cacheable=_is_cacheable_text,
+        describe=budget.summary if budget is not None else None,
+        restore=budget.restore if budget is not None else None
+    )
+
+
+def _extract_text_from_pdf_file(filepath, budget=None):
+    """PDF text extraction through the ranked backend registry"""
+    logger.info(f"Extracting text from PDF: {filepath} using {PDF_EXTRACTORS.primary_name}")
 
-    # 4. Last resort - try to read as binary and decode
     try:
-        logger.info("Attempting binary read as last resort")
-        with open(filepath, 'rb') as file:
-            data = file.read()
-            text = data.decode('utf-8', errors='ignore')
-
-            # Check if we got anything useful
-            if text and len(text.strip()) > 100:
-                logger.info(f"Successfully extracted {len(text)} chars with binary fallback")
-                return text
-            else:
-                logger.warning("Binary fallback produced too little text")
-                extraction_errors.append("Binary: Too little text")
+        text = PDF_EXTRACTORS.extract_file(filepath, budget)
     except Exception as e:
-        error_msg = f"Binary read/decode failed: {str(e)}"
-        logger.error(error_msg)
-        extraction_errors.append(error_msg)
+        logger.error(f"Could not read PDF {filepath}: {str(e)}")
+        text = None
+
+    if text is not None:
+        return text
 
-    # 5. If we get here, we've tried everything and failed
     # Instead of raising an error, return a placeholder text with some common programming terms
     # to ensure some skills are matched
-    logger.error(f"All PDF extraction methods failed: {', '.join(extraction_errors)}")
-    return "PDF text extraction failed, but processing will continue. python java javascript html css react flask database sql git"
+    logger.error(f"All permitted PDF extraction methods failed for {filepath}")
+    return PDF_EXTRACTION_FAILED_TEXT
 
 
 def extract_text_from_docx_file(filepath):
+    """DOCX text extraction, served from the extraction cache when the same bytes were parsed before"""
+    try:
+        digest = hash_file(filepath)
+    except Exception as e:
+        logger.warning(f"Could not hash {filepath} for extraction cache: {str(e)}")
+        return _extract_text_from_docx_file(filepath)
+
+    return EXTRACTION_CACHE.get_or_extract(
+        digest,
+        "docx",
+        _extractor_version("docx"),
+        lambda: _extract_text_from_docx_file(filepath),
+        cacheable=_is_cacheable_text
+    )
+
+
+def _extract_text_from_docx_file(filepath):
     try:
         import docx
         doc = docx.Document(filepath)
@@ -325,7 +345,25 @@ def extract_text_from_docx_file(filepath):
         raise ValueError(f"Could not extract text from DOCX: {str(e)}")
 
 
-def extract_text_from_resume(file_object, save_to_disk=True, upload_folder=None, applicant_id=None, file_type="resume"):
+def _extract_text_from_pdf_bytes(file_content, budget=None):
+    """In-memory PDF processing through the ranked backend registry"""
+    text = PDF_EXTRACTORS.extract(file_content, budget)
+    if text is None:
+        logger.error("All permitted PDF extraction methods failed for in-memory upload")
+        return PDF_EXTRACTION_FAILED_TEXT
+    return text
+
+
+def _extract_text_from_docx_bytes(file_content):
+    try:
+        import docx
+        doc = docx.Document(BytesIO(file_content))
+        return "\n".join([para.text for para in doc.paragraphs])
+    except ImportError:
+        return file_content.decode('utf-8', errors='ignore')
+
+
+def extract_text_from_resume(file_object, save_to_disk=True, upload_folder=None, applicant_id=None, file_type="resume", budget=None):
     if not file_object:
         logger.error("No file provided")
         raise ValueError("No file provided")
@@ -346,89 +384,59 @@ def extract_text_from_resume(file_object, save_to_disk=True, upload_folder=None,
             logger.error(f"Unsupported file format: {filename}")
             raise ValueError(f"Unsupported file format. Please upload a PDF, DOCX, or TXT file.")
 
-        # Always try to save the file first
+        # Read the upload once; text is extracted from memory, never read back from disk
+        file_content = read_upload_buffer(file_object)
+        if file_content is None:
+            logger.error("Could not read file content")
+            raise ValueError("Invalid file object")
+
+        # Persist concurrently with extraction instead of write-then-read
+        persist_future = None
         if save_to_disk and upload_folder:
-            saved_file_path = save_uploaded_file(
-                file_object,
+            persist_future = UPLOAD_PERSIST_EXECUTOR.submit(
+                save_uploaded_file,
+                UploadBuffer(filename, file_content),
                 upload_folder,
                 applicant_id,
                 file_type
             )
 
-            if not saved_file_path:
-                logger.error("Failed to save file to disk")
-                raise ValueError("Failed to save file to disk")
-
-            logger.info(f"Successfully saved file to: {saved_file_path}")
-
-            # Now extract text from the saved file
-            try:
-                if filename.endswith('.pdf'):
-                    text = extract_text_from_pdf_file(saved_file_path)
-                elif filename.endswith('.docx'):
-                    text = extract_text_from_docx_file(saved_file_path)
-                elif filename.endswith('.txt'):
-                    with open(saved_file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        text = f.read()
-
-                logger.info(f"Successfully extracted text from {saved_file_path}")
-                return text, saved_file_path
-            except Exception as extraction_error:
-                logger.error(f"Text extraction failed: {str(extraction_error)}")
-                # Even if extraction fails, we still return the path so the file is saved
-                return "", saved_file_path
-
-        # If we couldn't save to disk, try in-memory processing
-        if hasattr(file_object, 'read'):
-            if hasattr(file_object, 'seek'):
-                file_object.seek(0)
-            file_content = file_object.read()
-        elif isinstance(file_object, bytes):
-            file_content = file_object
-        else:
-            logger.error("Could not read file content")
-            raise ValueError("Invalid file object")
-
-        file_content_io = BytesIO(file_content)
-
         try:
             if filename.endswith('.pdf'):
-                # In-memory PDF processing
-                if PDF_PROCESSOR_NAME in ["PyPDF2", "PyPDF2-Legacy"]:
-                    reader = PDF_PROCESSOR(file_content_io)
-                    text = ""
-                    for page in reader.pages:
-                        text += page.extract_text() + "\n"
-                elif PDF_PROCESSOR_NAME == "pdfplumber":
-                    import pdfplumber
-                    with pdfplumber.open(file_content_io) as pdf:
-                        text = ""
-                        for page in pdf.pages:
-                            text += page.extract_text() + "\n"
-                elif PDF_PROCESSOR_NAME == "pdftotext":
-                    import pdftotext
-                    pdf = pdftotext.PDF(file_content_io)
-                    text = "\n".join(pdf)
-                else:
-                    # Last resort - try to decode binary
-                    text = file_content.decode('utf-8', errors='ignore')
+                text = EXTRACTION_CACHE.get_or_extract(
+                    hash_bytes(file_content),
+                    "pdf",
+                    _extractor_version("pdf", budget),
+                    lambda: _extract_text_from_pdf_bytes(file_content, budget),
+                    cacheable=_is_cacheable_text,
+                    describe=budget.summary if budget is not None else None,
+                    restore=budget.restore if budget is not None else None
+                )
             elif filename.endswith('.docx'):
-                try:
-                    import docx
-                    doc = docx.Document(file_content_io)
-                    text = "\n".join([para.text for para in doc.paragraphs])
-                except ImportError:
-                    text = file_content.decode('utf-8', errors='ignore')
+                text = EXTRACTION_CACHE.get_or_extract(
+                    hash_bytes(file_content),
+                    "docx",
+                    _extractor_version("docx"),
+                    lambda: _extract_text_from_docx_bytes(file_content),
+                    cacheable=_is_cacheable_text
+                )
             elif filename.endswith('.txt'):
                 text = file_content.decode('utf-8', errors='ignore')
             else:
                 raise ValueError(f"Unsupported file format: {filename}")
-
-            return text, saved_file_path
         except Exception as e:
             logger.error(f"In-memory extraction failed: {str(e)}")
             # Return empty text but still return the file path if we have it
-            return "", saved_file_path
+            text = ""
+
+        if persist_future is not None:
+            saved_file_path = persist_future.result()
+            if not saved_file_path:
+                logger.error("Failed to save file to disk")
+                raise ValueError("Failed to save file to disk")
+            logger.info(f"Successfully saved file to: {saved_file_path}")
+
+        return text, saved_file_path
 
     except Exception as e:
         logger.error(f"Error in extract_text_from_resume: {str(e)}\n{traceback.format_exc()}")
@@ -532,16 +540,8 @@ def analyze_cs_skills(resume_text):
             "categories": {}
         }
 
-    for skill in ALL_CS_SKILLS:
-        if re.search(r'\b' + re.escape(skill) + r'\b', resume_text):
-            matched_skills[skill] = True
-            continue
-
-        if skill in SKILL_SYNONYMS:
-            for synonym in SKILL_SYNONYMS[skill]:
-                if re.search(r'\b' + re.escape(synonym) + r'\b', resume_text):
-                    matched_skills[skill] = True
-                    break
+    for skill in SKILL_MATCHER.find_skills(resume_text):
+        matched_skills[skill] = True
 
     results_by_category = {}
     for category, skills in CS_SKILLS.items():
@@ -564,109 +564,46 @@ def analyze_cs_skills(resume_text):
     }
 
 # getting the required_skills from the job db
-def get_required_skills_for_job(job_id):
+def get_requirement_profile_for_job(job_id):
     """
-    Fetches required skills for a job from the database.
-    Returns a list of skill strings (empty list if no skills found).
+    Returns the job's compiled RequirementProfile (empty if no skills are set),
+    with any weights and must-have skills from the job's requirements JSON.
     """
     try:
-        conn = get_db_connection()
-        if conn is None:
-            logger.error("Database connection failed")
-            return []  # Return empty list instead of None
-
-        cursor = conn.cursor()
-        query = "SELECT required_skills FROM jobs WHERE id = %s"
-        cursor.execute(query, (job_id,))
-        result = cursor.fetchone()
-
-        if not result or not result[0]:
-            logger.warning(f"No required skills found for job_id={job_id}")
-            return []  # Return empty list instead of None
-
-        skills_data = result[0]
-        logger.info(f"Parsing required skills for job_id={job_id} using format: {type(skills_data).__name__}")
-
-        # Handle JSON/dict format
-        if isinstance(skills_data, dict) or (isinstance(skills_data, str) and skills_data.strip().startswith('{')):
-            if isinstance(skills_data, str):
-                import json
-                try:
-                    skills_data = json.loads(skills_data)
-                except json.JSONDecodeError:
-                    logger.warning("Failed to decode JSON. Treating as comma-separated string.")
-                    return [skill.strip() for skill in skills_data.split(',') if skill.strip()]
-
-            if isinstance(skills_data, dict):
-                if 'skills' in skills_data:
-                    return skills_data['skills'] or []  # Return empty list if skills is None
-                return list(skills_data.values()) or []  # Return empty list if values is None
-            elif isinstance(skills_data, list):
-                return skills_data or []  # Return empty list if skills_data is None
-            else:
-                logger.warning(f"Parsed JSON is not a dict or list: {type(skills_data).__name__}")
-                return []
-
-        # Comma-separated string
-        if isinstance(skills_data, str):
-            return [skill.strip() for skill in skills_data.split(',') if skill.strip()]
-
-        # List
-        if isinstance(skills_data, list):
-            return skills_data or []  # Return empty list if skills_data is None
-
-        # Default case for any other type
-        logger.warning(f"Unexpected skills data format: {type(skills_data).__name__}")
-        return []
+        return REQUIRED_SKILLS_CACHE.profile(job_id)
 
     except Exception as e:
-        logger.error(f"Database error in get_required_skills_for_job: {str(e)}")
-        return []  # Return empty list on error
-    finally:
-        if 'cursor' in locals() and cursor:
-            cursor.close()
-        if 'conn' in locals() and conn:
-            conn.close()
+        logger.error(f"Database error in get_requirement_profile_for_job: {str(e)}")
+        return compile_profile(())
 
 def check_job_requirements(matched_skills, required_skills=None, min_match_percentage=60):
+    """
+    Checks a candidate's matched skills against a job's requirements.
 
-    logger.info(f"INSIDE FUNCTION - Type of matched_skills: {type(matched_skills)}")
-    logger.info(f"INSIDE FUNCTION - Value of matched_skills: {matched_skills}")
-    logger.info(f"INSIDE FUNCTION - Type of required_skills: {type(required_skills)}")
-    logger.info(f"INSIDE FUNCTION - Value of required_skills: {required_skills}")
-
-     # Ensure matched_skills is a list
+    `required_skills` may be a compiled RequirementProfile (weights and
+    must-haves apply) or any iterable / comma-separated string of skills,
+    which is compiled once and memoized.
+    """
+    # Ensure matched_skills is iterable
     if matched_skills is None:
         matched_skills = []
-    elif not isinstance(matched_skills, list):
-        try:
-            if isinstance(matched_skills, str):
-                matched_skills = [s.strip() for s in matched_skills.split(',')]
-            else:
-                matched_skills = list(matched_skills)
-        except Exception as e:
-            logger.error(f"Failed to convert matched_skills to list: {str(e)}")
-            matched_skills = []
-    
-    # Ensure required_skills is a list
-    if required_skills is None:
-        required_skills = []
-    elif not isinstance(required_skills, list):
-        try:
-            if isinstance(required_skills, str):
-                required_skills = [s.strip() for s in required_skills.split(',')]
-            else:
-                required_skills = list(required_skills)
-        except Exception as e:
-            logger.error(f"Failed to convert required_skills to list: {str(e)}")
-            required_skills = []
+    elif isinstance(matched_skills, str):
+        matched_skills = [s.strip() for s in matched_skills.split(',')]
 
-     # Log converted values
-    logger.info(f"Converted matched_skills: {matched_skills}")
-    logger.info(f"Converted required_skills: {required_skills}")
+    if isinstance(required_skills, RequirementProfile):
+        profile = required_skills
+    else:
+        if required_skills is None:
+            required_skills = []
+        elif isinstance(required_skills, str):
+            required_skills = required_skills.split(',')
+        profile = compile_profile(
+            skill.strip().lower() for skill in required_skills if skill and skill.strip()
+        )
 
     # No specific requirements
-    if not required_skills:
+    if not profile:
+        matched_skills = list(matched_skills)
         return {
             "passes": len(matched_skills) >= 5,
             "match_percentage": 100 if len(matched_skills) >= 5 else (len(matched_skills) * 20),
@@ -674,52 +611,12 @@ def check_job_requirements(matched_skills, required_skills=None, min_match_perce
             "missing_required": []
         }
 
-    logger.info(f"BEFORE COMP - Type of matched_skills: {type(matched_skills)}")
-    logger.info(f"BEFORE COMP - Value of matched_skills: {matched_skills}")
-    logger.info(f"BEFORE COMP - Type of required_skills: {type(required_skills)}")
-    logger.info(f"BEFORE COMP - Value of required_skills: {required_skills}")
-
-    # No specific requirements
-    if not required_skills:
-        return {
-            "passes": len(matched_skills) >= 5,
-            "match_percentage": 100 if len(matched_skills) >= 5 else (len(matched_skills) * 20),
-            "matched_required": matched_skills[:5] if len(matched_skills) >= 5 else matched_skills,
-            "missing_required": []
-        }
-    
-    logger.info(f"SIMPLE TEST - About to use required_skills: {required_skills}")
-    
-    # Initialize result arrays
-    matched_required = []
-    missing_required = []
-    
-    # Safely match skills
-    for skill in required_skills:
-        if skill in matched_skills:
-            matched_required.append(skill)
-        else:
-            missing_required.append(skill)
-    
-    
-    logger.info(f"matched_required: {matched_required}")
-    
-    logger.info(f"missing_required: {missing_required}")
-    
-    # Calculate match percentage
-    match_percentage = 0
-    if required_skills and len(required_skills) > 0:
-        match_percentage = (len(matched_required) / len(required_skills)) * 100
-    
-    logger.info(f"Match results: {len(matched_required)} matches out of {len(required_skills)} required")
-    logger.info(f"Match percentage: {match_percentage}%")
-
-    return {
-        "passes": match_percentage >= min_match_percentage,
-        "match_percentage": round(match_percentage, 2),
-        "matched_required": matched_required,
-        "missing_required": missing_required
-    }
+    result = profile.evaluate(matched_skills, min_match_percentage)
+    logger.debug(
+        f"Match results: {len(result['matched_required'])} matches out of {len(profile)} required "
+        f"({result['match_percentage']}%)"
+    )
+    return result
 
 
 def evaluate_experience_level(resume_text):
@@ -789,27 +686,27 @@ def evaluate_experience_level(resume_text):
         return "junior"  # Default to junior on error
 
 
-def analyze_cs_resume(resume_file, job_id=None, applicant_id=None, upload_folder="static/uploads"):
+def analyze_cs_resume(resume_file, job_id=None, applicant_id=None, upload_folder="static/uploads", save_to_disk=True):
     """
     Fixed analyze_cs_resume that works with either file objects or file paths
-    with comprehensive type checking and using primitive types to avoid reference issues
+    with comprehensive type checking and using primitive types to avoid reference issues.
+    Pass an UploadBuffer with save_to_disk=False when the caller persists the upload itself.
     """
     try:
         # Initialize with safe defaults
         required_skills = None
         resume_text = ""
+        extracted = False
         saved_file_path = None
         min_match_percentage = 60
+        budget = screening_budget()
 
         # Fetch required skills from database if job_id provided
         if job_id is not None:
             try:
-                # Fetch required skills from database
-                required_skills = get_required_skills_for_job(job_id)
-                
-                # Log details about required skills
-                logger.debug(f"Raw result from DB for job_id={job_id}: {required_skills}")
-                logger.info(f"Retrieved required skills for job_id={job_id}: {required_skills}")
+                # Fetch the job's compiled requirements (cached per job)
+                required_skills = get_requirement_profile_for_job(job_id)
+                logger.debug(f"Required skills for job_id={job_id}: {list(required_skills)}")
                 
                 # Ensure required_skills is properly iterable
                 if required_skills is not None and not hasattr(required_skills, '__iter__'):
@@ -832,7 +729,8 @@ def analyze_cs_resume(resume_file, job_id=None, applicant_id=None, upload_folder
             # Extract text based on file extension
             if saved_file_path.lower().endswith('.pdf'):
                 try:
-                    resume_text = extract_text_from_pdf_file(saved_file_path)
+                    resume_text = extract_text_from_pdf_file(saved_file_path, budget)
+                    extracted = True
                     logger.info(f"Extracted {len(resume_text)} chars from PDF")
                 except Exception as e:
                     logger.error(f"PDF extraction error: {str(e)}")
@@ -840,6 +738,7 @@ def analyze_cs_resume(resume_file, job_id=None, applicant_id=None, upload_folder
             elif saved_file_path.lower().endswith('.docx'):
                 try:
                     resume_text = extract_text_from_docx_file(saved_file_path)
+                    extracted = True
                     logger.info(f"Extracted {len(resume_text)} chars from DOCX")
                 except Exception as e:
                     logger.error(f"DOCX extraction error: {str(e)}")
@@ -848,6 +747,7 @@ def analyze_cs_resume(resume_file, job_id=None, applicant_id=None, upload_folder
                 try:
                     with open(saved_file_path, 'r', encoding='utf-8', errors='ignore') as f:
                         resume_text = f.read()
+                        extracted = True
                         logger.info(f"Extracted {len(resume_text)} chars from TXT")
                 except Exception as e:
                     logger.error(f"TXT read error: {str(e)}")
@@ -860,16 +760,21 @@ def analyze_cs_resume(resume_file, job_id=None, applicant_id=None, upload_folder
             try:
                 resume_text, saved_file_path = extract_text_from_resume(
                     resume_file,
-                    save_to_disk=True,
+                    save_to_disk=save_to_disk,
                     upload_folder=upload_folder,
                     applicant_id=applicant_id,
-                    file_type="resume"
+                    file_type="resume",
+                    budget=budget
                 )
+                extracted = True
                 logger.info(f"Extracted {len(resume_text)} chars via extract_text_from_resume")
             except Exception as extract_error:
                 logger.error(f"Text extraction error: {str(extract_error)}")
                 resume_text = "python javascript html css react"  # Default skills for fallback
 
+        # The extracted text, for the caller's text vector; never the default skills text
+        screened_text = resume_text if extracted and _is_cacheable_text(resume_text) else ""
+
         # If we don't have meaningful text, use default skills text
         if not resume_text or len(resume_text.strip()) < 100:
             logger.warning("Resume text too short for proper analysis")
@@ -930,15 +835,12 @@ def analyze_cs_resume(resume_file, job_id=None, applicant_id=None, upload_folder
         try:
             # If required_skills is None or empty, use default UX skills
             if not required_skills:
-                required_skills = ['figma', 'adobe xd', 'user research', 'wireframing', 'prototyping']
-                logger.info(f"Using default required skills: {required_skills}")
-            
-            # Create a new list to ensure no reference issues
-            required_skills_list = list(required_skills)
-                
+                required_skills = compile_profile(DEFAULT_REQUIRED_SKILLS)
+                logger.info(f"Using default required skills: {list(required_skills)}")
+
             job_match = check_job_requirements(
                 matched_skills_list,
-                required_skills_list,
+                required_skills,
                 min_match_percentage
             )
             
@@ -1005,8 +907,13 @@ def analyze_cs_resume(resume_file, job_id=None, applicant_id=None, upload_folder
                 "job_match": job_match_dict,  # Use the newly created dictionary
                 "experience_level": str(experience_level_str),  # Force to string
                 "proceed_to_assessment": True,
-                "resume_path": str(saved_file_path) if saved_file_path else None
+                "resume_path": str(saved_file_path) if saved_file_path else None,
+                "extraction": budget.summary(),  # Records whether the resume was only partly read
+                "resume_text": screened_text  # Popped by whoever stores the text vector
             }
+
+            if budget.truncated:
+                logger.info(f"Resume text truncated for screening ({budget.truncated_reason}) after {budget.pages_read} pages")
             
             # Log the final result structure
             logger.info(f"Final result keys: {list(final_result.keys())}")
@@ -1108,38 +1015,21 @@ def save_application_to_db(applicant_data, resume_path, cover_letter_path, job_i
 
         cursor = conn.cursor()
 
-        # Instead of checking for existing applicant, always create a new one
+        # Create the applicant, or update the one registered with this email
         try:
             # Format the full name
             full_name = f"{applicant_data.get('firstName', '')} {applicant_data.get('lastName', '')}"
             
-            # Create a new applicant record with direct values
-            cursor.execute("""
-                INSERT INTO applicants (
-                    full_name, email, phone, gender, status, created_at
-                ) VALUES (%s, %s, %s, %s, %s, %s)
-            """, (
-                full_name,
-                applicant_data.get('email', ''),
-                applicant_data.get('phone', ''),
-                applicant_data.get('gender', ''),
-                'Applied',
-                datetime.now()
-            ))
-            
-            applicant_id = cursor.lastrowid
-            logger.info(f"Created new applicant with ID: {applicant_id}")
+            applicant_id, created = upsert_applicant(cursor, applicant_data.get('email', ''), {
+                'full_name': full_name,
+                'phone': applicant_data.get('phone', ''),
+                'gender': applicant_data.get('gender', '')
+            }, update_extra={'updated_at': datetime.now()})
+            logger.info(f"{'Created new' if created else 'Updated existing'} applicant with ID: {applicant_id}")
             
             # Save application details
             # Link applicant to job
-            cursor.execute("""
-                INSERT INTO job_applicants (job_id, applicant_id, applied_at)
-                VALUES (%s, %s, %s)
-            """, (
-                job_id,
-                applicant_id,
-                datetime.now()
-            ))
+            link_applicant_to_job(cursor, job_id, applicant_id)
             
             # Save file paths if needed in your database schema
             
@@ -1207,6 +1097,8 @@ def submit_application(applicant_data, resume_file, cover_letter_file=None, job_
         skills_analysis = None
         experience_level = "mid"  # Default value
         job_match = None
+        resume_text = ""
+        resume_analyzed = False
         
         if resume_path:
             try:
@@ -1220,9 +1112,11 @@ def submit_application(applicant_data, resume_file, cover_letter_file=None, job_
                 analysis_result = ensure_result_types(analysis_result)
 
                 # Extract the analysis results
+                resume_text = analysis_result.pop("resume_text", "")
                 skills_analysis = analysis_result.get("skills_analysis")
                 job_match = analysis_result.get("job_match")
                 experience_level = analysis_result.get("experience_level", "mid")
+                resume_analyzed = skills_analysis is not None
             except Exception as analyze_error:
                 logger.error(f"Error analyzing resume: {str(analyze_error)}")
                 # Create default analysis results
@@ -1263,6 +1157,7 @@ def submit_application(applicant_data, resume_file, cover_letter_file=None, job_
             
         # Try to save to database if possible, but handle errors
         db_applicant_id = None
+        text_vector = None
         try:
             
             # Get database connection
@@ -1273,23 +1168,14 @@ def submit_application(applicant_data, resume_file, cover_letter_file=None, job_
                 # Format the full name
                 full_name = f"{applicant_data.get('firstName', '')} {applicant_data.get('lastName', '')}"
                 
-                # Create a new applicant record with direct values
+                # Create the applicant, or update the one registered with this email
                 try:
-                    cursor.execute("""
-                        INSERT INTO applicants (
-                            full_name, email, phone, gender, status, created_at
-                        ) VALUES (%s, %s, %s, %s, %s, %s)
-                    """, (
-                        full_name,
-                        applicant_data.get('email', ''),
-                        applicant_data.get('phone', ''),
-                        applicant_data.get('gender', ''),
-                        'Applied',
-                        datetime.now()
-                    ))
-                    
-                    db_applicant_id = cursor.lastrowid
-                    logger.info(f"Created new applicant with ID: {db_applicant_id}")
+                    db_applicant_id, created = upsert_applicant(cursor, applicant_data.get('email', ''), {
+                        'full_name': full_name,
+                        'phone': applicant_data.get('phone', ''),
+                        'gender': applicant_data.get('gender', '')
+                    }, update_extra={'updated_at': datetime.now()})
+                    logger.info(f"{'Created new' if created else 'Updated existing'} applicant with ID: {db_applicant_id}")
                 except Exception as db_error:
                     logger.error(f"Database error creating applicant: {str(db_error)}")
                 
@@ -1297,17 +1183,18 @@ def submit_application(applicant_data, resume_file, cover_letter_file=None, job_
                 if db_applicant_id:
                     try:
                         # Check if job_applicants table exists
-                        cursor.execute("SHOW TABLES LIKE 'job_applicants'")
-                        if cursor.fetchone():
-                            cursor.execute("""
-                                INSERT INTO job_applicants (job_id, applicant_id, applied_at)
-                                VALUES (%s, %s, %s)
-                            """, (
-                                job_id,
-                                db_applicant_id,
-                                datetime.now()
-                            ))
+                        if SCHEMA.has_table('job_applicants'):
+                            link_applicant_to_job(cursor, job_id, db_applicant_id)
                             logger.info(f"Linked applicant {db_applicant_id} to job {job_id}")
+                            # The default skills above are placeholders, not the applicant's, so they aren't indexed
+                            if resume_analyzed:
+                                matched_skills = skills_analysis.get('matched_skills', [])
+                                if SCHEMA.has_column('job_applicants', 'skill_vector'):
+                                    store_skill_vector(cursor, SKILL_VECTORS, job_id, db_applicant_id, matched_skills)
+                                if SCHEMA.has_table('applicant_skills'):
+                                    index_applicant_skills(cursor, db_applicant_id, matched_skills)
+                                if SCHEMA.has_column('job_applicants', 'text_vector'):
+                                    text_vector = store_text_vector(cursor, job_id, db_applicant_id, resume_text)
                         else:
                             logger.warning("job_applicants table doesn't exist, skipping link")
                     except Exception as link_error:
@@ -1315,6 +1202,8 @@ def submit_application(applicant_data, resume_file, cover_letter_file=None, job_
                 
                 # Commit changes
                 conn.commit()
+                if text_vector:
+                    JOB_SIMILARITY.add(job_id, db_applicant_id, text_vector)
                 
                 cursor.close()
                 conn.close()
@@ -1331,8 +1220,7 @@ def submit_application(applicant_data, resume_file, cover_letter_file=None, job_
                 cursor = conn.cursor()
                 
                 # Check if assessment_sessions table exists
-                cursor.execute("SHOW TABLES LIKE 'assessment_sessions'")
-                if cursor.fetchone():
+                if SCHEMA.has_table('assessment_sessions'):
                     # Create an assessment session
                     try:
                         cursor.execute("""
@@ -1677,6 +1565,66 @@ def download_cover_letter(application_id):
         }), 500
 
 
+@api_bp.route('/admin/extraction-cache/stats', methods=['GET'])
+@admin_required
+def get_extraction_cache_stats():
+    """
+    Admin endpoint exposing hit/miss counters and size of the extraction cache
+    """
+    try:
+        return jsonify({
+            'success': True,
+            'stats': EXTRACTION_CACHE.stats()
+        }), 200
+
+    except Exception as e:
+        logger.error(f"Error fetching extraction cache stats: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': f"Error fetching extraction cache stats: {str(e)}"
+        }), 500
+
+
+@api_bp.route('/admin/required-skills-cache/stats', methods=['GET'])
+@admin_required
+def get_required_skills_cache_stats():
+    """
+    Admin endpoint exposing hit/miss counters of the required-skills cache
+    """
+    try:
+        return jsonify({
+            'success': True,
+            'stats': REQUIRED_SKILLS_CACHE.stats()
+        }), 200
+
+    except Exception as e:
+        logger.error(f"Error fetching required skills cache stats: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': f"Error fetching required skills cache stats: {str(e)}"
+        }), 500
+
+
+@api_bp.route('/admin/pdf-backends/stats', methods=['GET'])
+@admin_required
+def get_pdf_backend_stats():
+    """
+    Admin endpoint exposing PDF backend ranking, fallback policy and latency histograms
+    """
+    try:
+        return jsonify({
+            'success': True,
+            'stats': PDF_EXTRACTORS.stats()
+        }), 200
+
+    except Exception as e:
+        logger.error(f"Error fetching PDF backend stats: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': f"Error fetching PDF backend stats: {str(e)}"
+        }), 500
+
+
 # Function to register the blueprint with your Flask app
 def register_api_routes(app):
     app.register_blueprint(api_bp, url_prefix='/api')
\ No newline at end of file
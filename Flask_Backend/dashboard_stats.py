@@ -0,0 +1,291 @@
+"""
+dashboard_stats.py - Materialized counters for the admin dashboard
+
+Totals and per-status applicant counts live in the dashboard_counters table
+and are adjusted by the write paths inside their own transactions, so the
+dashboard reads a handful of rows instead of scanning jobs and applicants.
+A background thread periodically recomputes every counter from the source
+tables to repair any drift, and the assembled dashboard is cached briefly.
+Every web process starts the thread, but only the one holding a MySQL
+named lock (GET_LOCK) reconciles; the others stand by and take over when
+its connection goes away.
+"""
+
+import os
+import time
+import logging
+import threading
+from database import get_db_connection, open_connection, SCHEMA
+
+logger = logging.getLogger(__name__)
+
+COUNTER_JOBS = 'jobs'
+COUNTER_APPLICANTS = 'applicants'
+COUNTER_ASSESSMENTS = 'assessments'
+
+APPLICANT_STATUSES = ['Applied', 'Shortlisted', 'Interview', 'Rejected']
+
+RECONCILER_LOCK = 'smarthire_dashboard_reconciler'
+
+
+def status_counter(status):
+    return f"applicants:{status}"
+
+
+class DashboardStats:
+    """
+    Counter maintenance, reconciliation and the cached dashboard snapshot.
+
+    All adjust methods take the caller's cursor so a counter changes in the
+    same transaction as the row it counts.
+    """
+
+    def __init__(self, cache_ttl=15, reconcile_interval=900):
+        self.cache_ttl = cache_ttl
+        self.reconcile_interval = reconcile_interval
+
+        self._lock = threading.Lock()
+        self._started_pid = None
+        self._cache = None
+        self._cache_time = 0
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            cache_ttl=float(os.getenv('DASHBOARD_CACHE_TTL', 15)),
+            reconcile_interval=float(os.getenv('DASHBOARD_RECONCILE_INTERVAL', 900))
+        )
+
+    def start(self):
+        """Starts this process's reconciler thread once; only the elected process reconciles"""
+        if self._started_pid == os.getpid():
+            return
+
+        with self._lock:
+            if self._started_pid == os.getpid():
+                return
+            self._started_pid = os.getpid()
+
+            thread = threading.Thread(target=self._run_reconciler, name="dashboard-reconciler", daemon=True)
+            thread.start()
+
+    def invalidate(self):
+        self._cache = None
+
+    # -------------------------------------------------------------------------
+    # Write paths
+    # -------------------------------------------------------------------------
+    def adjust(self, cursor, deltas):
+        """Adds each delta in {counter_name: delta} to its counter"""
+        rows = [(name, delta) for name, delta in deltas.items() if delta]
+        if not rows:
+            return
+
+        placeholders = ', '.join(['(%s, %s)'] * len(rows))
+        cursor.execute(f"""
+            INSERT INTO dashboard_counters (name, value) VALUES {placeholders}
+            ON DUPLICATE KEY UPDATE value = value + VALUES(value)
+        """, [value for row in rows for value in row])
+        self.invalidate()
+
+    def job_created(self, cursor):
+        self.adjust(cursor, {COUNTER_JOBS: 1})
+
+    def job_deleted(self, cursor):
+        self.adjust(cursor, {COUNTER_JOBS: -1})
+
+    def assessment_created(self, cursor):
+        self.adjust(cursor, {COUNTER_ASSESSMENTS: 1})
+
+    def assessment_deleted(self, cursor):
+        self.adjust(cursor, {COUNTER_ASSESSMENTS: -1})
+
+    def applicant_created(self, cursor, status='Applied'):
+        self.adjust(cursor, {COUNTER_APPLICANTS: 1, status_counter(status): 1})
+
+    def applicant_deleted(self, cursor, status):
+        self.adjust(cursor, {COUNTER_APPLICANTS: -1, status_counter(status): -1})
+
+    def set_applicant_status(self, cursor, applicant_id, status):
+        """Updates an applicant's status and moves them between status counters"""
+        cursor.execute("SELECT status FROM applicants WHERE id = %s FOR UPDATE", (applicant_id,))
+        row = cursor.fetchone()
+        if not row:
+            return
+
+        old_status = row['status'] if isinstance(row, dict) else row[0]
+        if old_status == status:
+            return
+
+        cursor.execute("UPDATE applicants SET status = %s WHERE id = %s", (status, applicant_id))
+        self.adjust(cursor, {status_counter(old_status): -1, status_counter(status): 1})
+
+    # -------------------------------------------------------------------------
+    # Reconciliation
+    # -------------------------------------------------------------------------
+    def reconcile(self):
+        """Recomputes every counter, and jobs.applicants_count, from the source tables"""
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("SELECT name, value FROM dashboard_counters")
+            before = dict(cursor.fetchall())
+
+            cursor.execute("UPDATE dashboard_counters SET value = 0 WHERE name LIKE 'applicants:%'")
+            for name, table in ((COUNTER_JOBS, 'jobs'),
+                                (COUNTER_APPLICANTS, 'applicants'),
+                                (COUNTER_ASSESSMENTS, 'assessments')):
+                cursor.execute(f"""
+                    INSERT INTO dashboard_counters (name, value)
+                    SELECT %s, COUNT(*) FROM {table}
+                    ON DUPLICATE KEY UPDATE value = VALUES(value)
+                """, (name,))
+            cursor.execute("""
+                INSERT INTO dashboard_counters (name, value)
+                SELECT CONCAT('applicants:', status), COUNT(*) FROM applicants
+                WHERE status IS NOT NULL
+                GROUP BY status
+                ON DUPLICATE KEY UPDATE value = VALUES(value)
+            """)
+            cursor.execute("""
+                UPDATE jobs j
+                LEFT JOIN (
+                    SELECT job_id, COUNT(*) AS total FROM job_applicants GROUP BY job_id
+                ) ja ON ja.job_id = j.id
+                SET j.applicants_count = COALESCE(ja.total, 0)
+                WHERE j.applicants_count <> COALESCE(ja.total, 0)
+            """)
+            repaired_jobs = cursor.rowcount
+
+            cursor.execute("SELECT name, value FROM dashboard_counters")
+            after = dict(cursor.fetchall())
+            conn.commit()
+        finally:
+            cursor.close()
+            conn.close()
+
+        drift = {name: after[name] - before.get(name, 0) for name in after if after[name] != before.get(name, 0)}
+        if before and (drift or repaired_jobs):
+            logger.warning(f"Dashboard counters drifted and were repaired: {drift}, {repaired_jobs} job counts fixed")
+        self.invalidate()
+        return after
+
+    def _hold_lock(self, lock_conn):
+        """
+        Returns a connection holding the reconciler lock, or None while another
+        process holds it. The lock lives as long as its connection, so a
+        crashed or restarted leader releases it on its own.
+        """
+        if lock_conn is not None:
+            try:
+                cursor = lock_conn.cursor()
+                cursor.execute("SELECT IS_USED_LOCK(%s) = CONNECTION_ID()", (RECONCILER_LOCK,))
+                held = cursor.fetchone()[0]
+                cursor.close()
+                if held:
+                    return lock_conn
+            except Exception as e:
+                logger.warning(f"Lost the dashboard reconciler lock: {str(e)}")
+            try:
+                lock_conn.close()
+            except Exception:
+                pass
+
+        conn = open_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT GET_LOCK(%s, 0)", (RECONCILER_LOCK,))
+            acquired = cursor.fetchone()[0]
+            cursor.close()
+        except Exception:
+            conn.close()
+            raise
+
+        if acquired != 1:
+            conn.close()
+            return None
+
+        logger.info(f"Process {os.getpid()} now reconciles the dashboard counters")
+        return conn
+
+    def _run_reconciler(self):
+        lock_conn = None
+        while True:
+            try:
+                if not SCHEMA.has_table('dashboard_counters'):
+                    logger.error("dashboard_counters table is missing; run 'alembic upgrade head'. Counters not reconciled.")
+                    if lock_conn is not None:
+                        lock_conn.close()
+                    return
+
+                lock_conn = self._hold_lock(lock_conn)
+                if lock_conn is not None:
+                    self.reconcile()
+            except Exception as e:
+                logger.error(f"Error reconciling dashboard counters: {str(e)}")
+            time.sleep(self.reconcile_interval)
+
+    # -------------------------------------------------------------------------
+    # Reads
+    # -------------------------------------------------------------------------
+    def snapshot(self):
+        """The dashboard payload, rebuilt at most once per cache_ttl seconds"""
+        cached = self._cache
+        if cached is not None and time.monotonic() - self._cache_time < self.cache_ttl:
+            return cached
+
+        conn = get_db_connection()
+        cursor = conn.cursor(dictionary=True)
+        try:
+            cursor.execute("SELECT name, value FROM dashboard_counters")
+            counters = {row['name']: int(row['value']) for row in cursor.fetchall()}
+
+            # Each of these walks the first five entries of an index
+            cursor.execute("""
+                SELECT id, job_name, company_name, created_at
+                FROM jobs
+                ORDER BY created_at DESC
+                LIMIT 5
+            """)
+            recent_jobs = cursor.fetchall()
+
+            cursor.execute("""
+                SELECT id, full_name, institution, status, created_at
+                FROM applicants
+                ORDER BY created_at DESC
+                LIMIT 5
+            """)
+            recent_applicants = cursor.fetchall()
+
+            cursor.execute("""
+                SELECT id, job_name, company_name, applicants_count
+                FROM jobs
+                ORDER BY applicants_count DESC
+                LIMIT 5
+            """)
+            top_jobs = cursor.fetchall()
+        finally:
+            cursor.close()
+            conn.close()
+
+        status_counts = {status: 0 for status in APPLICANT_STATUSES}
+        for name, value in counters.items():
+            if name.startswith('applicants:'):
+                status_counts[name.split(':', 1)[1]] = value
+
+        snapshot = {
+            "totalJobs": counters.get(COUNTER_JOBS, 0),
+            "totalApplicants": counters.get(COUNTER_APPLICANTS, 0),
+            "totalAssessments": counters.get(COUNTER_ASSESSMENTS, 0),
+            "applicationsByStatus": status_counts,
+            "recentJobs": recent_jobs,
+            "recentApplicants": recent_applicants,
+            "topJobs": top_jobs
+        }
+
+        self._cache = snapshot
+        self._cache_time = time.monotonic()
+        return snapshot
+
+
+DASHBOARD_STATS = DashboardStats.from_env()
@@ -1,15 +1,461 @@
+"""
+database.py - MySQL connections for the SmartHire backend
+
+get_db_connection() hands out connections from a bounded, thread-safe pool
+instead of opening a new TCP/auth handshake per request. Callers keep using
+conn.close(), which returns the connection to the pool; db_connection() is
+the context-manager equivalent. Idle connections are pinged before reuse and
+recycled once they exceed their maximum lifetime.
+
+Inside a Flask request, get_db_connection() returns one request-scoped unit
+of work shared by every helper the request calls. It is acquired lazily,
+committed once after a successful response is built (a failed commit turns
+the response into a 500) and rolled back and released in teardown. Route
+handlers don't commit themselves; work that must only happen once the
+changes are visible (cache invalidation, waking workers) is registered with
+after_commit().
+"""
+
 import os
+import time
+import queue
+import logging
+import threading
+from contextlib import contextmanager
+from flask import g, has_request_context, jsonify
 import mysql.connector
+from mysql.connector.errors import PoolError
 from dotenv import load_dotenv
 
 # Load environment variables
 project_folder = '/home/smarthiringorg/SmartHire/Flask_Backend/'
 load_dotenv(os.path.join(project_folder, '.env'))
 
+logger = logging.getLogger(__name__)
+
+# 0 disables pooling and opens a connection per call, as before
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 10))
+
+
+def _connect_kwargs():
+    return {
+        "host": os.getenv('DB_HOST'),
+        "user": os.getenv('DB_USER'),
+        "password": os.getenv('DB_PASSWORD'),
+        "database": os.getenv('DB_NAME')
+    }
+
+
+class PooledConnection:
+    """
+    Proxy around a pooled MySQL connection. Everything except close() is
+    forwarded to the real connection; close() hands it back to the pool.
+    """
+
+    def __init__(self, pool, entry):
+        self._pool = pool
+        self._entry = entry
+
+    @property
+    def raw(self):
+        if self._entry is None:
+            raise PoolError("Connection has already been returned to the pool")
+        return self._entry['conn']
+
+    def __getattr__(self, name):
+        return getattr(self.raw, name)
+
+    def close(self):
+        entry, self._entry = self._entry, None
+        if entry is not None:
+            self._pool._release(entry)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def __del__(self):
+        # A route that returned without closing must not leak a pool slot
+        if getattr(self, '_entry', None) is not None:
+            logger.warning("Pooled connection garbage-collected without close(); returning it to the pool")
+            self.close()
+
+
+class ConnectionPool:
+    """
+    Bounded pool of MySQL connections.
+
+    At most `size` connections exist at once; acquire() waits up to
+    `acquire_timeout` seconds for one to free up and then raises PoolError.
+    Connections idle for more than `ping_interval` seconds are health-checked
+    before reuse and connections older than `max_lifetime` are replaced.
+    """
+
+    def __init__(self, size=10, max_lifetime=1800, acquire_timeout=10.0, ping_interval=30.0,
+                 connect_kwargs=None):
+        self.size = size
+        self.max_lifetime = max_lifetime
+        self.acquire_timeout = acquire_timeout
+        self.ping_interval = ping_interval
+        self.connect_kwargs = connect_kwargs or _connect_kwargs()
+
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._metrics = {
+            "acquired": 0,
+            "created": 0,
+            "recycled": 0,
+            "health_check_failures": 0,
+            "discarded": 0,
+            "timeouts": 0,
+            "in_use": 0,
+            "wait_seconds_total": 0.0,
+            "wait_seconds_max": 0.0
+        }
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            size=DB_POOL_SIZE,
+            max_lifetime=float(os.getenv('DB_POOL_MAX_LIFETIME', 1800)),
+            acquire_timeout=float(os.getenv('DB_POOL_ACQUIRE_TIMEOUT', 10)),
+            ping_interval=float(os.getenv('DB_POOL_PING_INTERVAL', 30))
+        )
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self._metrics[key] += amount
+
+    def _new_entry(self):
+        conn = mysql.connector.connect(**self.connect_kwargs)
+        self._count("created")
+        now = time.monotonic()
+        return {"conn": conn, "created": now, "last_used": now}
+
+    def _discard(self, entry):
+        try:
+            entry['conn'].close()
+        except Exception:
+            pass
+
+    def _is_healthy(self, entry):
+        now = time.monotonic()
+        if now - entry['created'] > self.max_lifetime:
+            self._count("recycled")
+            return False
+
+        if now - entry['last_used'] > self.ping_interval:
+            try:
+                entry['conn'].ping(reconnect=False)
+            except Exception as e:
+                logger.warning(f"Discarding pooled connection that failed its health check: {str(e)}")
+                self._count("health_check_failures")
+                return False
+
+        return True
+
+    def acquire(self, timeout=None):
+        """Returns a PooledConnection, waiting up to `timeout` seconds for a free slot"""
+        timeout = self.acquire_timeout if timeout is None else timeout
+        started = time.monotonic()
+
+        if not self._slots.acquire(timeout=timeout):
+            self._count("timeouts")
+            raise PoolError(f"No database connection available after {timeout}s (pool size {self.size})")
+
+        try:
+            entry = None
+            while entry is None:
+                try:
+                    entry = self._idle.get_nowait()
+                except queue.Empty:
+                    entry = self._new_entry()
+                    break
+
+                if not self._is_healthy(entry):
+                    self._discard(entry)
+                    entry = None
+        except Exception:
+            self._slots.release()
+            raise
+
+        waited = time.monotonic() - started
+        with self._lock:
+            self._metrics["acquired"] += 1
+            self._metrics["in_use"] += 1
+            self._metrics["wait_seconds_total"] += waited
+            self._metrics["wait_seconds_max"] = max(self._metrics["wait_seconds_max"], waited)
+
+        return PooledConnection(self, entry)
+
+    def _release(self, entry):
+        conn = entry['conn']
+        try:
+            # Don't hand the next caller someone else's open transaction
+            if conn.unread_result:
+                conn.get_rows()
+            if conn.in_transaction:
+                conn.rollback()
+            entry['last_used'] = time.monotonic()
+            self._idle.put(entry)
+        except Exception as e:
+            logger.warning(f"Discarding pooled connection that could not be reset: {str(e)}")
+            self._count("discarded")
+            self._discard(entry)
+        finally:
+            with self._lock:
+                self._metrics["in_use"] -= 1
+            self._slots.release()
+
+    def close_all(self):
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+    def stats(self):
+        with self._lock:
+            metrics = dict(self._metrics)
+
+        acquired = metrics["acquired"]
+        metrics["wait_seconds_avg"] = round(metrics["wait_seconds_total"] / acquired, 6) if acquired else 0
+        metrics["wait_seconds_total"] = round(metrics["wait_seconds_total"], 6)
+        metrics["wait_seconds_max"] = round(metrics["wait_seconds_max"], 6)
+        metrics["idle"] = self._idle.qsize()
+        metrics["size"] = self.size
+        metrics["max_lifetime"] = self.max_lifetime
+        metrics["acquire_timeout"] = self.acquire_timeout
+        return metrics
+
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """The process-wide pool; rebuilt after a fork so workers never share sockets"""
+    global _pool, _pool_pid
+
+    if _pool is not None and _pool_pid == os.getpid():
+        return _pool
+
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = ConnectionPool.from_env()
+            _pool_pid = os.getpid()
+            logger.info(f"Created database pool of {_pool.size} connections in process {_pool_pid}")
+    return _pool
+
+
+def open_connection():
+    """A connection outside the pool, for long-lived holders such as named locks"""
+    return mysql.connector.connect(**_connect_kwargs())
+
+
+def acquire_connection():
+    """A connection owned by the caller, independent of any request"""
+    if DB_POOL_SIZE <= 0:
+        return open_connection()
+    return get_pool().acquire()
+
+
+class RequestConnection:
+    """
+    Unit of work for one HTTP request.
+
+    The underlying connection is acquired on first use and released by
+    release(). close() is a no-op so existing helpers that open and close
+    "their own" connection transparently share this one. Cursors are
+    buffered by default so a helper that reads only part of a result
+    cannot block the next helper on the same connection.
+    """
+
+    def __init__(self):
+        self._conn = None
+        self._after_commit = []
+
+    @property
+    def conn(self):
+        if self._conn is None:
+            self._conn = acquire_connection()
+        return self._conn
+
+    def __getattr__(self, name):
+        return getattr(self.conn, name)
+
+    def cursor(self, *args, **kwargs):
+        kwargs.setdefault('buffered', True)
+        return self.conn.cursor(*args, **kwargs)
+
+    def commit(self):
+        if self._conn is not None:
+            self._conn.commit()
+
+        callbacks, self._after_commit = self._after_commit, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Error in after-commit callback: {str(e)}")
+
+    def after_commit(self, callback):
+        self._after_commit.append(callback)
+
+    def rollback(self):
+        self._after_commit = []
+        if self._conn is not None:
+            self._conn.rollback()
+
+    def close(self):
+        # Released once in teardown
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        pass
+
+    def release(self, rollback=True):
+        """Returns the connection to the pool, first rolling back whatever wasn't committed"""
+        conn, self._conn = self._conn, None
+        self._after_commit = []
+        if conn is None:
+            return
+
+        try:
+            if rollback:
+                conn.rollback()
+        except Exception as e:
+            logger.error(f"Error rolling back request transaction: {str(e)}")
+        finally:
+            conn.close()
+
+
 def get_db_connection():
-    return mysql.connector.connect(
-        host=os.getenv('DB_HOST'),
-        user=os.getenv('DB_USER'),
-        password=os.getenv('DB_PASSWORD'),
-        database=os.getenv('DB_NAME')
-    )
\ No newline at end of file
+    if not has_request_context():
+        return acquire_connection()
+
+    if 'db' not in g:
+        g.db = RequestConnection()
+    return g.db
+
+
+def after_commit(callback):
+    """
+    Runs `callback` once the current request's changes are committed; it is
+    dropped if they are rolled back. Outside a request, the caller commits
+    its own connection before this is reached, so it runs right away.
+    """
+    if not has_request_context():
+        callback()
+        return
+
+    get_db_connection().after_commit(callback)
+
+
+def init_app(app):
+    """Registers the hooks that end each request's unit of work"""
+
+    @app.after_request
+    def commit_request_transaction(response):
+        db = g.get('db')
+        if db is None or response.status_code >= 400:
+            return response
+
+        # Committing here, not in teardown, lets a failed commit fail the response
+        try:
+            db.commit()
+            g.db_committed = True
+        except Exception as e:
+            logger.error(f"Error committing request transaction: {str(e)}")
+            response = jsonify({"error": f"Failed to save changes: {str(e)}"})
+            response.status_code = 500
+        return response
+
+    @app.teardown_request
+    def release_request_connection(exception):
+        db = g.pop('db', None)
+        if db is not None:
+            db.release(rollback=not g.pop('db_committed', False))
+
+
+@contextmanager
+def db_connection():
+    conn = get_db_connection()
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+def pool_stats():
+    return get_pool().stats()
+
+
+class SchemaRegistry:
+    """
+    Which tables and columns exist in the connected database.
+
+    Probed from information_schema on first use and cached for the life of
+    the process, so hot paths can branch on optional tables without issuing
+    SHOW TABLES. Call refresh() after changing the schema.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._columns = None
+
+    def _probe(self):
+        conn = acquire_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("""
+                SELECT table_name, column_name FROM information_schema.columns
+                WHERE table_schema = DATABASE()
+            """)
+            columns = {}
+            for table, column in cursor.fetchall():
+                columns.setdefault(table.lower(), set()).add(column.lower())
+        finally:
+            cursor.close()
+            conn.close()
+
+        logger.info(f"Schema registry found {len(columns)} tables")
+        return columns
+
+    @property
+    def columns(self):
+        if self._columns is None:
+            with self._lock:
+                if self._columns is None:
+                    self._columns = self._probe()
+        return self._columns
+
+    def has_table(self, table):
+        return table.lower() in self.columns
+
+    def has_column(self, table, column):
+        return column.lower() in self.columns.get(table.lower(), ())
+
+    def refresh(self):
+        with self._lock:
+            self._columns = None
+
+
+SCHEMA = SchemaRegistry()
+
+
+def missing_indexes(cursor, expected):
+    """Returns the (table, index name) pairs from `expected` that don't exist"""
+    cursor.execute("""
+        SELECT DISTINCT table_name, index_name FROM information_schema.statistics
+        WHERE table_schema = DATABASE()
+    """)
+    existing = {(table.lower(), name.lower()) for table, name in cursor.fetchall()}
+    return [(table, name) for table, name in expected if (table.lower(), name.lower()) not in existing]
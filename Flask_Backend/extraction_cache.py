@@ -0,0 +1,224 @@
+"""
+extraction_cache.py - Persistent cache for text extracted from resumes
+
+Entries are keyed by the SHA-256 of the uploaded file bytes, so the same CV
+uploaded again (re-applications, the same file for several jobs) skips parsing
+entirely. Each entry carries the version stamp of the extractor that produced
+it; a stamp mismatch is treated as a miss. The cache is a single SQLite file
+shared by all workers, bounded in size with least-recently-used eviction.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'extraction_cache.sqlite3')
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_bytes(data):
+    """SHA-256 hex digest of an in-memory buffer (bytes, bytearray or memoryview)."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(filepath):
+    """SHA-256 hex digest of a file on disk, read in chunks."""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """
+    Size-bounded LRU cache of extracted text, persisted in SQLite.
+
+    `kind` separates extractors (pdf, docx, ...) for the same bytes and
+    `version` is the stamp of the backend that produced the text.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.enabled = True
+        self._lock = threading.Lock()
+
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            with self._connect() as conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS extraction_cache (
+                        digest TEXT NOT NULL,
+                        kind TEXT NOT NULL,
+                        version TEXT NOT NULL,
+                        text TEXT NOT NULL,
+                        meta TEXT,
+                        size INTEGER NOT NULL,
+                        last_access REAL NOT NULL,
+                        PRIMARY KEY (digest, kind, version)
+                    )
+                """)
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_extraction_cache_last_access ON extraction_cache (last_access)"
+                )
+
+                # Cache files created before the meta column existed
+                columns = [row[1] for row in conn.execute("PRAGMA table_info(extraction_cache)")]
+                if 'meta' not in columns:
+                    conn.execute("ALTER TABLE extraction_cache ADD COLUMN meta TEXT")
+            logger.info(f"Extraction cache ready at {path} (max {max_bytes} bytes)")
+        except Exception as e:
+            logger.warning(f"Extraction cache disabled, could not open {path}: {str(e)}")
+            self.enabled = False
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=5)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, digest, kind, version):
+        """Returns the cached text, or None on a miss or a stale version stamp."""
+        entry = self.get_entry(digest, kind, version)
+        return entry[0] if entry else None
+
+    def get_entry(self, digest, kind, version):
+        """Returns (text, meta) for a cached entry, or None on a miss."""
+        if not self.enabled:
+            return None
+
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT text, meta FROM extraction_cache WHERE digest = ? AND kind = ? AND version = ?",
+                    (digest, kind, version)
+                ).fetchone()
+
+                if row:
+                    conn.execute(
+                        "UPDATE extraction_cache SET last_access = ? WHERE digest = ? AND kind = ? AND version = ?",
+                        (time.time(), digest, kind, version)
+                    )
+                    self._count(True)
+                    return row[0], (json.loads(row[1]) if row[1] else {})
+        except Exception as e:
+            logger.warning(f"Extraction cache lookup failed: {str(e)}")
+
+        self._count(False)
+        return None
+
+    def put(self, digest, kind, version, text, meta=None):
+        if not self.enabled or text is None:
+            return
+
+        size = len(text.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+
+        try:
+            with self._connect() as conn:
+                conn.execute("""
+                    REPLACE INTO extraction_cache (digest, kind, version, text, meta, size, last_access)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, (digest, kind, version, text, json.dumps(meta) if meta else None, size, time.time()))
+                self._evict(conn)
+        except Exception as e:
+            logger.warning(f"Extraction cache store failed: {str(e)}")
+
+    def _evict(self, conn):
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM extraction_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        evicted = 0
+        rows = conn.execute(
+            "SELECT digest, kind, version, size FROM extraction_cache ORDER BY last_access ASC"
+        ).fetchall()
+        for digest, kind, version, size in rows:
+            if total <= self.max_bytes:
+                break
+            conn.execute(
+                "DELETE FROM extraction_cache WHERE digest = ? AND kind = ? AND version = ?",
+                (digest, kind, version)
+            )
+            total -= size
+            evicted += 1
+
+        logger.info(f"Evicted {evicted} entries from extraction cache")
+
+    def get_or_extract(self, digest, kind, version, extract, cacheable=None, describe=None, restore=None):
+        """
+        Returns cached text for `digest`, or calls `extract()` and stores its
+        result. `cacheable(text)` can veto storing results such as fallbacks.
+        `describe()` returns metadata stored next to fresh text, and
+        `restore(meta)` receives it again on a cache hit.
+        """
+        entry = self.get_entry(digest, kind, version)
+        if entry is not None:
+            logger.info(f"Extraction cache hit for {kind} {digest[:12]}")
+            text, meta = entry
+            if restore is not None:
+                restore(meta)
+            return text
+
+        text = extract()
+        if cacheable is None or cacheable(text):
+            self.put(digest, kind, version, text, describe() if describe is not None else None)
+        return text
+
+    def stats(self):
+        entries = 0
+        total_bytes = 0
+        if self.enabled:
+            try:
+                with self._connect() as conn:
+                    entries, total_bytes = conn.execute(
+                        "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM extraction_cache"
+                    ).fetchone()
+            except Exception as e:
+                logger.warning(f"Extraction cache stats failed: {str(e)}")
+
+        with self._lock:
+            hits, misses = self.hits, self.misses
+
+        lookups = hits + misses
+        return {
+            "enabled": self.enabled,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round((hits / lookups) * 100, 2) if lookups else 0,
+            "entries": entries,
+            "bytes": total_bytes,
+            "max_bytes": self.max_bytes
+        }
+
+
+EXTRACTION_CACHE = ExtractionCache(
+    path=os.getenv('EXTRACTION_CACHE_PATH', DEFAULT_CACHE_PATH),
+    max_bytes=int(os.getenv('EXTRACTION_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES))
+)
@@ -1,21 +1,33 @@
 
-from flask import Flask, request, jsonify, send_from_directory, session, redirect, url_for, render_template
+from flask import Flask, Response, request, jsonify, send_from_directory, session, redirect, url_for, render_template
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 from cryptography.hazmat.primitives import hashes
 import logging
 import base64
+import hashlib
+import threading
+import time
 import os
 import re
 import json
 from datetime import datetime, timedelta
-from database import get_db_connection
+from database import get_db_connection, pool_stats, init_app as init_database, missing_indexes, after_commit, SCHEMA
+from auth import login_required, admin_required
 
 # CV IMPORTS
 from question_bank import get_assessment_questions
 import json
 from datetime import datetime
-from cv_analyzer import register_api_routes, analyze_cs_resume
+from cv_analyzer import register_api_routes, analyze_cs_resume, UploadBuffer, UPLOAD_PERSIST_EXECUTOR, write_upload, SKILL_VECTORS
 from pathlib import Path
+from analysis_queue import AnalysisQueue, STATUS_QUEUED, STATUS_RUNNING
+from dashboard_stats import DASHBOARD_STATS
+from applicant_records import upsert_applicant, link_applicant_to_job, upsert_applicant_files
+from bulk_writer import insert_rows, upsert_rows, replace_children, sync_children
+from requirements_cache import REQUIRED_SKILLS_CACHE, parse_requirements
+from skill_vectors import store_skill_vector, rank_job_applicants
+from skill_index import SKILL_INDEX, index_applicant_skills
+from text_vectors import JOB_SIMILARITY, store_text_vector
 
 
 # Setup logging
@@ -26,6 +38,7 @@ app = Flask(__name__, static_folder='/home/smarthiringorg/SmartHire/Flask_Backen
             template_folder='/home/smarthiringorg/SmartHire/Flask_Backend/dist')
 
 register_api_routes(app)
+init_database(app)
 
 
 # Set a fixed secret key or use environment variable (important for session persistence)
@@ -67,6 +80,61 @@ os.chmod(COVER_LETTER_DIR, 0o755)
 # Configure logging for file operations
 logging.getLogger('file_operations').setLevel(logging.INFO)
 
+# Helper function to build the standardized path of an uploaded file
+def upload_file_path(file, directory, applicant_id, job_id, file_type):
+    original_filename = file.filename
+    extension = os.path.splitext(original_filename)[1].lower()
+    timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
+    new_filename = f"{applicant_id}_{job_id}_{file_type}_{timestamp}{extension}"
+    return os.path.join(directory, new_filename)
+
+
+# Helper function to persist an in-memory upload in the background
+def save_upload_buffer_async(upload, directory, applicant_id, job_id, file_type):
+    """
+    Start writing an UploadBuffer to the specified directory with standardized naming
+    
+    Returns:
+        (path the file will be saved to, future that completes once it is written)
+    """
+    file_path = upload_file_path(upload, directory, applicant_id, job_id, file_type)
+    return file_path, UPLOAD_PERSIST_EXECUTOR.submit(write_upload, upload.data, file_path)
+
+
+# Helper function to block until background uploads are on disk
+def wait_for_uploads(*futures):
+    """Waits for every write to finish, then raises the first one that failed"""
+    error = None
+    for future in futures:
+        if future is None:
+            continue
+        try:
+            future.result()
+        except Exception as e:
+            logging.getLogger('file_operations').error(f"Failed to persist upload: {str(e)}")
+            error = error or e
+
+    if error is not None:
+        raise error
+
+
+# Helper function to keep rows from referencing uploads that were never written
+def rollback_on_failed_upload(conn, *futures):
+    """
+    Waits for background uploads before their rows are committed
+
+    Returns:
+        None once every file is on disk, otherwise an error response after
+        rolling back the transaction
+    """
+    try:
+        wait_for_uploads(*futures)
+    except Exception as e:
+        conn.rollback()
+        return jsonify({"error": f"Failed to save uploaded files: {str(e)}"}), 500
+    return None
+
+
 # Helper function to save uploaded files
 def save_uploaded_file(file, directory, applicant_id, job_id, file_type):
     """
@@ -85,14 +153,8 @@ def save_uploaded_file(file, directory, applicant_id, job_id, file_type):
     if not file:
         return None
         
-    # Create a standardized filename
-    original_filename = file.filename
-    extension = os.path.splitext(original_filename)[1].lower()
-    timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
-    new_filename = f"{applicant_id}_{job_id}_{file_type}_{timestamp}{extension}"
-    
     # Full path for saving
-    file_path = os.path.join(directory, new_filename)
+    file_path = upload_file_path(file, directory, applicant_id, job_id, file_type)
     
     # Save the file
     file.save(file_path)
@@ -121,29 +183,6 @@ def verify_password(stored_password: str, password: str, salt: bytes) -> bool:
     return stored_password == hashed_attempt
 
 
-# =============================================================================
-# AUTHENTICATION MIDDLEWARE
-# =============================================================================
-def login_required(f):
-    def decorated_function(*args, **kwargs):
-        if 'admin_id' not in session:
-            return jsonify({"error": "Authentication required"}), 401
-        return f(*args, **kwargs)
-
-    decorated_function.__name__ = f.__name__
-    return decorated_function
-
-
-def admin_required(f):
-    def decorated_function(*args, **kwargs):
-        if 'admin_id' not in session or not session.get('is_admin', False):
-            return jsonify({"error": "Admin privileges required"}), 403
-        return f(*args, **kwargs)
-
-    decorated_function.__name__ = f.__name__
-    return decorated_function
-
-
 # =============================================================================
 # AUTHENTICATION ROUTES
 # =============================================================================
@@ -186,7 +225,6 @@ def signup():
             "INSERT INTO admin_users (email, password_hash, salt, created_at) VALUES (%s, %s, %s, %s)",
             (email, hashed_password, base64.b64encode(salt).decode(), datetime.now())
         )
-        conn.commit()
 
         # Get the new user's ID
         new_user_id = cursor.lastrowid
@@ -285,88 +323,168 @@ def check_auth():
 # =============================================================================
 # DASHBOARD API ROUTES
 # =============================================================================
+# Counters are maintained by the write paths below, see dashboard_stats.py
 @app.route('/api/admin/dashboard', methods=['GET'])
 @admin_required
 def get_dashboard_data():
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor(dictionary=True)
-
-        # Get total jobs count
-        cursor.execute("SELECT COUNT(*) as count FROM jobs")
-        total_jobs = cursor.fetchone()['count']
+        return jsonify(DASHBOARD_STATS.snapshot())
 
-        # Get total applicants count
-        cursor.execute("SELECT COUNT(*) as count FROM applicants")
-        total_applicants = cursor.fetchone()['count']
+    except Exception as e:
+        app.logger.error(f"Error getting dashboard data: {str(e)}")
+        return jsonify({"error": str(e)}), 500
 
-        # Get total assessments count
-        cursor.execute("SELECT COUNT(*) as count FROM assessments")
-        total_assessments = cursor.fetchone()['count']
 
-        # Get applications by status
-        cursor.execute("""
-            SELECT status, COUNT(*) as count 
-            FROM applicants 
-            GROUP BY status
-        """)
-        status_counts = {
-            "Applied": 0,
-            "Shortlisted": 0,
-            "Interview": 0,
-            "Rejected": 0
-        }
-        for row in cursor.fetchall():
-            status_counts[row['status']] = row['count']
+# Started once at import; across processes only the GET_LOCK holder reconciles
+DASHBOARD_STATS.start()
 
-        # Get recent jobs
-        cursor.execute("""
-            SELECT id, job_name, company_name, created_at
-            FROM jobs
-            ORDER BY created_at DESC
-            LIMIT 5
-        """)
-        recent_jobs = cursor.fetchall()
 
-        # Get recent applicants
-        cursor.execute("""
-            SELECT id, full_name, institution, status, created_at
-            FROM applicants
-            ORDER BY created_at DESC
-            LIMIT 5
-        """)
-        recent_applicants = cursor.fetchall()
+# =============================================================================
+# DATABASE POOL AND SCHEMA
+# =============================================================================
+# The schema is owned by the migrations in migrations/ (alembic upgrade head).
+# On startup each process checks that the tables and indexes the hot paths
+# rely on are present and warns about any that are not.
+EXPECTED_TABLES = [
+    'jobs', 'applicants', 'job_applicants', 'applicant_files', 'assessment_sessions',
+    'assessment_questions', 'assessment_answers', 'assessment_session_bridges',
+    'analysis_jobs', 'dashboard_counters',
+]
+
+# (table, index name) created by migrations/versions/0003_hot_lookup_indexes.py
+EXPECTED_INDEXES = [
+    ('applicants', 'uq_applicants_email'),
+    ('applicants', 'idx_applicants_created'),
+    ('applicants', 'idx_applicants_status_created'),
+    ('job_applicants', 'uq_job_applicants_job_applicant'),
+    ('job_applicants', 'idx_job_applicants_job_applied'),
+    ('applicant_files', 'uq_applicant_files_applicant_job'),
+    ('assessment_questions', 'uq_assessment_questions_session_index'),
+    ('assessment_answers', 'idx_assessment_answers_assessment_applicant'),
+    ('jobs', 'idx_jobs_created'),
+    ('jobs', 'idx_jobs_applicants_count'),
+]
+
+_schema_checked_pid = None
+
+
+@app.before_request
+def check_database_schema():
+    """Warns once per process about missing tables and indexes"""
+    global _schema_checked_pid
+    if _schema_checked_pid == os.getpid():
+        return
+    _schema_checked_pid = os.getpid()
 
-        # Get top jobs by applicants
-        cursor.execute("""
-            SELECT id, job_name, company_name, applicants_count
-            FROM jobs
-            ORDER BY applicants_count DESC
-            LIMIT 5
-        """)
-        top_jobs = cursor.fetchall()
+    try:
+        missing_tables = [table for table in EXPECTED_TABLES if not SCHEMA.has_table(table)]
+        if missing_tables:
+            logger.warning(f"Missing tables: {', '.join(missing_tables)}. Run 'alembic upgrade head' in Flask_Backend.")
 
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        missing = missing_indexes(cursor, EXPECTED_INDEXES)
         cursor.close()
         conn.close()
 
-        return jsonify({
-            "totalJobs": total_jobs,
-            "totalApplicants": total_applicants,
-            "totalAssessments": total_assessments,
-            "applicationsByStatus": status_counts,
-            "recentJobs": recent_jobs,
-            "recentApplicants": recent_applicants,
-            "topJobs": top_jobs
-        })
+        if missing:
+            logger.warning(
+                f"Missing indexes, these lookups will scan their tables: "
+                f"{', '.join(f'{table}.{name}' for table, name in missing)}. "
+                f"Run 'alembic upgrade head' in Flask_Backend."
+            )
+    except Exception as e:
+        logger.error(f"Error checking database schema: {str(e)}")
+
+
+@app.route('/api/admin/db-pool/stats', methods=['GET'])
+@admin_required
+def get_db_pool_stats():
+    try:
+        return jsonify(pool_stats())
 
     except Exception as e:
-        app.logger.error(f"Error getting dashboard data: {str(e)}")
+        app.logger.error(f"Error getting database pool stats: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
 
 # =============================================================================
 # JOBS API ROUTES
 # =============================================================================
+JOB_COLUMNS = (
+    'id', 'job_name', 'company_name', 'salary_range', 'type', 'remote_type',
+    'location', 'description', 'required_skills', 'applicants_count', 'created_at'
+)
+
+# Fields an admin can edit -> value used when the request leaves them out
+JOB_EDITABLE_FIELDS = {
+    'job_name': None,
+    'company_name': '',
+    'salary_range': '',
+    'type': 'Full-time',
+    'remote_type': 'Onsite',
+    'location': '',
+    'description': '',
+}
+
+# Child collection -> (table, text column)
+JOB_CHILD_TABLES = {
+    'responsibilities': ('responsibilities', 'responsibility_text'),
+    'qualifications': ('qualifications', 'qualification_text'),
+    'offers': ('offers', 'offer_text'),
+}
+
+
+def _job_detail_query():
+    """
+    One UNION ALL over the job and its child tables. The `kind` column says
+    which part a row belongs to; job rows leave item_id/item_text NULL and
+    child rows leave the job columns NULL.
+    """
+    job_nulls = ', '.join(f"NULL AS {column}" for column in JOB_COLUMNS)
+    parts = [
+        f"SELECT 'job' AS kind, {', '.join(JOB_COLUMNS)}, NULL AS item_id, NULL AS item_text "
+        f"FROM jobs WHERE id = %s"
+    ]
+    for kind, (table, text_column) in JOB_CHILD_TABLES.items():
+        parts.append(
+            f"SELECT '{kind}' AS kind, {job_nulls}, id AS item_id, {text_column} AS item_text "
+            f"FROM {table} WHERE job_id = %s"
+        )
+    return ' UNION ALL '.join(parts) + ' ORDER BY kind, item_id'
+
+
+JOB_DETAIL_QUERY = _job_detail_query()
+
+
+def load_job_detail(cursor, job_id):
+    """Returns the job with its responsibilities, qualifications and offers, or None"""
+    cursor.execute(JOB_DETAIL_QUERY, (job_id,) * (len(JOB_CHILD_TABLES) + 1))
+
+    job = None
+    children = {kind: [] for kind in JOB_CHILD_TABLES}
+    for row in cursor.fetchall():
+        kind = row['kind']
+        if kind == 'job':
+            job = {column: row[column] for column in JOB_COLUMNS}
+        else:
+            children[kind].append({
+                'id': row['item_id'],
+                'job_id': job_id,
+                JOB_CHILD_TABLES[kind][1]: row['item_text']
+            })
+
+    if not job:
+        return None
+
+    # Format datetime
+    if job['created_at']:
+        job['created_at'] = job['created_at'].isoformat()
+
+    job.update(children)
+    return job
+
+
 @app.route('/api/jobs', methods=['GET'])
 @admin_required
 def get_jobs():
@@ -403,34 +521,14 @@ def get_job(job_id):
         conn = get_db_connection()
         cursor = conn.cursor(dictionary=True)
 
-        # Get job details
-        cursor.execute("SELECT * FROM jobs WHERE id = %s", (job_id,))
-        job = cursor.fetchone()
-
-        if not job:
-            cursor.close()
-            conn.close()
-            return jsonify({"error": "Job not found"}), 404
-
-        # Format datetime
-        if 'created_at' in job and job['created_at']:
-            job['created_at'] = job['created_at'].isoformat()
-
-        # Get responsibilities
-        cursor.execute("SELECT * FROM responsibilities WHERE job_id = %s", (job_id,))
-        job['responsibilities'] = cursor.fetchall()
-
-        # Get qualifications
-        cursor.execute("SELECT * FROM qualifications WHERE job_id = %s", (job_id,))
-        job['qualifications'] = cursor.fetchall()
-
-        # Get offers
-        cursor.execute("SELECT * FROM offers WHERE job_id = %s", (job_id,))
-        job['offers'] = cursor.fetchall()
+        job = load_job_detail(cursor, job_id)
 
         cursor.close()
         conn.close()
 
+        if not job:
+            return jsonify({"error": "Job not found"}), 404
+
         return jsonify(job)
 
     except Exception as e:
@@ -469,41 +567,19 @@ def create_job():
         ))
 
         job_id = cursor.lastrowid
+        DASHBOARD_STATS.job_created(cursor)
 
-        # Insert responsibilities
-        responsibilities = data.get('responsibilities', [])
-        if responsibilities:
-            responsibility_values = [(job_id, resp) for resp in responsibilities if resp]
-            if responsibility_values:
-                cursor.executemany(
-                    "INSERT INTO responsibilities (job_id, responsibility_text) VALUES (%s, %s)",
-                    responsibility_values
-                )
-
-        # Insert qualifications
-        qualifications = data.get('qualifications', [])
-        if qualifications:
-            qualification_values = [(job_id, qual) for qual in qualifications if qual]
-            if qualification_values:
-                cursor.executemany(
-                    "INSERT INTO qualifications (job_id, qualification_text) VALUES (%s, %s)",
-                    qualification_values
-                )
-
-        # Insert offers
-        offers = data.get('offers', [])
-        if offers:
-            offer_values = [(job_id, offer) for offer in offers if offer]
-            if offer_values:
-                cursor.executemany(
-                    "INSERT INTO offers (job_id, offer_text) VALUES (%s, %s)",
-                    offer_values
-                )
+        # Insert responsibilities, qualifications and offers, one statement per table
+        for key, (table, text_column) in JOB_CHILD_TABLES.items():
+            insert_rows(cursor, table, ('job_id', text_column), [
+                (job_id, text) for text in data.get(key) or [] if text
+            ])
 
-        conn.commit()
         cursor.close()
         conn.close()
 
+        after_commit(PUBLIC_JOBS_CACHE.invalidate)
+
         return jsonify({"id": job_id, "message": "Job created successfully"}), 201
 
     except Exception as e:
@@ -522,70 +598,54 @@ def update_job(job_id):
             return jsonify({"error": "Job name is required"}), 400
 
         conn = get_db_connection()
-        cursor = conn.cursor()
+        cursor = conn.cursor(dictionary=True)
 
-        # Update job
-        cursor.execute("""
-            UPDATE jobs SET
-                job_name = %s, 
-                company_name = %s, 
-                salary_range = %s, 
-                type = %s, 
-                remote_type = %s, 
-                location = %s, 
-                description = %s
-            WHERE id = %s
-        """, (
-            data.get('job_name'),
-            data.get('company_name', ''),
-            data.get('salary_range', ''),
-            data.get('type', 'Full-time'),
-            data.get('remote_type', 'Onsite'),
-            data.get('location', ''),
-            data.get('description', ''),
-            job_id
-        ))
+        job = load_job_detail(cursor, job_id)
+        if not job:
+            cursor.close()
+            conn.close()
+            return jsonify({"error": "Job not found"}), 404
 
-        # Delete existing relationships
-        cursor.execute("DELETE FROM responsibilities WHERE job_id = %s", (job_id,))
-        cursor.execute("DELETE FROM qualifications WHERE job_id = %s", (job_id,))
-        cursor.execute("DELETE FROM offers WHERE job_id = %s", (job_id,))
-
-        # Insert responsibilities
-        responsibilities = data.get('responsibilities', [])
-        if responsibilities:
-            responsibility_values = [(job_id, resp) for resp in responsibilities if resp]
-            if responsibility_values:
-                cursor.executemany(
-                    "INSERT INTO responsibilities (job_id, responsibility_text) VALUES (%s, %s)",
-                    responsibility_values
-                )
+        # Only the fields whose value differs from the stored one are written
+        changed_fields = {}
+        for field, default in JOB_EDITABLE_FIELDS.items():
+            value = data.get(field, default)
+            if (value or '') != (job[field] or ''):
+                changed_fields[field] = value
+
+        # Child lists are diffed against the stored rows, in id order
+        child_changes = {}
+        for key, (table, text_column) in JOB_CHILD_TABLES.items():
+            stored = [(item['id'], item[text_column]) for item in job[key]]
+            submitted = [text for text in data.get(key) or [] if text]
+            if [text for _, text in stored] != submitted:
+                child_changes[key] = (stored, submitted)
+
+        if not changed_fields and not child_changes:
+            cursor.close()
+            conn.close()
+            return jsonify({"message": "No changes to save", "changed": []})
 
-        # Insert qualifications
-        qualifications = data.get('qualifications', [])
-        if qualifications:
-            qualification_values = [(job_id, qual) for qual in qualifications if qual]
-            if qualification_values:
-                cursor.executemany(
-                    "INSERT INTO qualifications (job_id, qualification_text) VALUES (%s, %s)",
-                    qualification_values
-                )
+        if changed_fields:
+            cursor.execute(
+                f"UPDATE jobs SET {', '.join(f'{field} = %s' for field in changed_fields)} WHERE id = %s",
+                list(changed_fields.values()) + [job_id]
+            )
 
-        # Insert offers
-        offers = data.get('offers', [])
-        if offers:
-            offer_values = [(job_id, offer) for offer in offers if offer]
-            if offer_values:
-                cursor.executemany(
-                    "INSERT INTO offers (job_id, offer_text) VALUES (%s, %s)",
-                    offer_values
-                )
+        for key, (stored, submitted) in child_changes.items():
+            table, text_column = JOB_CHILD_TABLES[key]
+            sync_children(cursor, table, 'job_id', job_id, text_column, stored, submitted)
 
-        conn.commit()
         cursor.close()
         conn.close()
 
-        return jsonify({"message": "Job updated successfully"})
+        after_commit(PUBLIC_JOBS_CACHE.invalidate)
+        after_commit(lambda: REQUIRED_SKILLS_CACHE.invalidate(job_id))
+
+        return jsonify({
+            "message": "Job updated successfully",
+            "changed": list(changed_fields) + list(child_changes)
+        })
 
     except Exception as e:
         app.logger.error(f"Error updating job: {str(e)}")
@@ -601,78 +661,441 @@ def delete_job(job_id):
 
         # The foreign key constraints with ON DELETE CASCADE will handle related records
         cursor.execute("DELETE FROM jobs WHERE id = %s", (job_id,))
+        if cursor.rowcount:
+            DASHBOARD_STATS.job_deleted(cursor)
 
-        conn.commit()
         cursor.close()
         conn.close()
 
+        after_commit(PUBLIC_JOBS_CACHE.invalidate)
+        after_commit(lambda: REQUIRED_SKILLS_CACHE.invalidate(job_id))
+        after_commit(lambda: JOB_SIMILARITY.invalidate(job_id))
+
         return jsonify({"message": "Job deleted successfully"})
 
     except Exception as e:
         app.logger.error(f"Error deleting job: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
+# Sort keys for a job's applicants; nullable columns are folded so keyset comparisons work
+JOB_APPLICANT_SORTS = {
+    # NOT NULL since migration 0008, so the raw column can use idx_job_applicants_job_applied
+    'applied_at': 'ja.applied_at',
+    'match_score': 'COALESCE(ja.match_score, -1)',
+    'name': "COALESCE(a.full_name, '')",
+}
+
+
 @app.route('/api/jobs/<int:job_id>/applicants', methods=['GET'])
 @admin_required
 def get_job_applicants(job_id):
+    """
+    One page of a job's applicants as lean summaries.
+
+    Query parameters: limit (default 50, max 200), sort (applied_at,
+    match_score or name), order (asc or desc, default desc), cursor
+    (next_cursor of the previous page) and include_total=1 for a total count.
+    """
     try:
+        sort = request.args.get('sort', 'applied_at')
+        if sort not in JOB_APPLICANT_SORTS:
+            return jsonify({"error": f"Invalid sort, expected one of: {', '.join(JOB_APPLICANT_SORTS)}"}), 400
+        order = request.args.get('order', 'desc').lower()
+        if order not in ('asc', 'desc'):
+            return jsonify({"error": "Invalid order, expected asc or desc"}), 400
+
+        try:
+            limit = min(max(int(request.args.get('limit', APPLICANTS_PAGE_SIZE)), 1), APPLICANTS_MAX_PAGE_SIZE)
+            after = decode_page_cursor(request.args.get('cursor'))
+        except ValueError as e:
+            return jsonify({"error": f"Invalid pagination parameters: {str(e)}"}), 400
+
+        sort_expression = JOB_APPLICANT_SORTS[sort]
+        comparison = '<' if order == 'desc' else '>'
+        params = [job_id]
+        keyset = ""
+        if after:
+            keyset = f"AND ({sort_expression} {comparison} %s OR ({sort_expression} = %s AND ja.id {comparison} %s))"
+            params.extend([after[0], after[0], after[1]])
+
         conn = get_db_connection()
         cursor = conn.cursor(dictionary=True)
 
-        # Fixed query - added the missing job_id parameter
-        cursor.execute("""
-            SELECT a.* FROM applicants a
-            JOIN job_applicants ja ON a.id = ja.applicant_id
-            WHERE ja.job_id = %s
-            ORDER BY a.created_at DESC
-        """, (job_id,))  # Added the job_id parameter here
+        # One extra row tells us whether there is a next page
+        cursor.execute(f"""
+            SELECT ja.id AS application_id, a.id, a.full_name, a.status, ja.match_score, ja.applied_at,
+                   {sort_expression} AS sort_key
+            FROM job_applicants ja
+            JOIN applicants a ON a.id = ja.applicant_id
+            WHERE ja.job_id = %s {keyset}
+            ORDER BY {sort_expression} {order.upper()}, ja.id {order.upper()}
+            LIMIT %s
+        """, params + [limit + 1])
 
         applicants = cursor.fetchall()
 
-        # Format datetime objects
-        for applicant in applicants:
-            if 'created_at' in applicant and applicant['created_at']:
-                applicant['created_at'] = applicant['created_at'].isoformat()
+        total = None
+        if request.args.get('include_total') == '1':
+            cursor.execute("SELECT COUNT(*) AS total FROM job_applicants WHERE job_id = %s", (job_id,))
+            total = cursor.fetchone()['total']
 
         cursor.close()
         conn.close()
 
-        return jsonify(applicants)
+        has_more = len(applicants) > limit
+        applicants = applicants[:limit]
+        next_cursor = None
+        if has_more:
+            last = applicants[-1]
+            next_cursor = encode_page_cursor(last['sort_key'], last['application_id'])
+
+        for applicant in applicants:
+            del applicant['sort_key']
+            del applicant['application_id']
+            if applicant['match_score'] is not None:
+                applicant['match_score'] = float(applicant['match_score'])
+            if applicant['applied_at']:
+                applicant['applied_at'] = applicant['applied_at'].isoformat()
+
+        response_data = {
+            "applicants": applicants,
+            "next_cursor": next_cursor,
+            "has_more": has_more
+        }
+        if total is not None:
+            response_data["total"] = total
+
+        return jsonify(response_data)
 
     except Exception as e:
         app.logger.error(f"Error getting job applicants: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
 
+@app.route('/api/jobs/<int:job_id>/ranking', methods=['GET', 'POST'])
+@admin_required
+def rank_job_applicants_route(job_id):
+    """
+    Ranks all of a job's applicants from their stored skill vectors.
+
+    GET ranks against the job's current requirements. POST takes a
+    required_skills value (a list, a comma-separated string or a
+    {"skills", "must_have", "weights"} object) and ranks against it without
+    saving it. limit (default 50, max 200) caps the returned list.
+    """
+    try:
+        try:
+            limit = min(max(int(request.args.get('limit', APPLICANTS_PAGE_SIZE)), 1), APPLICANTS_MAX_PAGE_SIZE)
+        except ValueError as e:
+            return jsonify({"error": f"Invalid limit: {str(e)}"}), 400
+
+        if request.method == 'POST':
+            data = request.get_json() or {}
+            if 'required_skills' not in data:
+                return jsonify({"error": "required_skills is required"}), 400
+            profile = parse_requirements(data['required_skills'])
+        else:
+            profile = REQUIRED_SKILLS_CACHE.profile(job_id)
+
+        if not profile:
+            return jsonify({"error": "The job has no required skills to rank by"}), 400
+
+        if not SCHEMA.has_column('job_applicants', 'skill_vector'):
+            return jsonify({"error": "Skill vectors are not available, run 'alembic upgrade head'"}), 503
+
+        started = time.perf_counter()
+
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        ranked, unscored = rank_job_applicants(cursor, SKILL_VECTORS, job_id, profile, limit)
+        cursor.close()
+
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+
+        cursor = conn.cursor(dictionary=True)
+        applicants = fetch_rows_by_id(
+            cursor,
+            "SELECT id, full_name, email, status FROM applicants WHERE id IN ({})",
+            [entry['applicant_id'] for entry in ranked]
+        )
+        cursor.close()
+        conn.close()
+
+        for entry in ranked:
+            applicant = applicants.get(str(entry['applicant_id']), {})
+            entry['full_name'] = applicant.get('full_name')
+            entry['email'] = applicant.get('email')
+            entry['status'] = applicant.get('status')
+
+        return jsonify({
+            "job_id": job_id,
+            "required_skills": list(profile),
+            "ranked": ranked,
+            "unscored": unscored,
+            "elapsed_ms": elapsed_ms
+        })
+
+    except Exception as e:
+        app.logger.error(f"Error ranking job applicants: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+
+def job_text(job):
+    """The text a job is matched on: title, description, skills and its child lists"""
+    parts = [job.get('job_name') or '', job.get('description') or '']
+    parts.extend(REQUIRED_SKILLS_CACHE.profile(job['id']))
+    for key, (_, text_column) in JOB_CHILD_TABLES.items():
+        parts.extend(item[text_column] or '' for item in job.get(key) or [])
+    return '\n'.join(parts)
+
+
+@app.route('/api/jobs/<int:job_id>/similar-candidates', methods=['GET'])
+@admin_required
+def get_similar_candidates(job_id):
+    """
+    A job's applicants ranked by TF-IDF cosine similarity between their
+    resume and the job's text. limit defaults to 20 (max 200).
+    """
+    try:
+        try:
+            limit = min(max(int(request.args.get('limit', 20)), 1), APPLICANTS_MAX_PAGE_SIZE)
+        except ValueError as e:
+            return jsonify({"error": f"Invalid limit: {str(e)}"}), 400
+
+        if not SCHEMA.has_column('job_applicants', 'text_vector'):
+            return jsonify({"error": "Text vectors are not available, run 'alembic upgrade head'"}), 503
+
+        conn = get_db_connection()
+        cursor = conn.cursor(dictionary=True)
+
+        job = load_job_detail(cursor, job_id)
+        if not job:
+            cursor.close()
+            conn.close()
+            return jsonify({"error": "Job not found"}), 404
+        cursor.close()
+
+        started = time.perf_counter()
+        cursor = conn.cursor()
+        ranked, indexed = JOB_SIMILARITY.top_k(cursor, job_id, job_text(job), limit)
+        cursor.close()
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+
+        cursor = conn.cursor(dictionary=True)
+        applicants = fetch_rows_by_id(
+            cursor,
+            "SELECT id, full_name, email, status FROM applicants WHERE id IN ({})",
+            [applicant_id for applicant_id, _ in ranked]
+        )
+        cursor.close()
+        conn.close()
+
+        candidates = []
+        for applicant_id, similarity in ranked:
+            applicant = applicants.get(str(applicant_id))
+            if applicant:
+                candidates.append(dict(applicant, similarity=similarity))
+
+        return jsonify({
+            "job_id": job_id,
+            "candidates": candidates,
+            "indexed": indexed,
+            "elapsed_ms": elapsed_ms
+        })
+
+    except Exception as e:
+        app.logger.error(f"Error getting similar candidates: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+
 # =============================================================================
 # APPLICANTS API ROUTES
 # =============================================================================
+APPLICANTS_PAGE_SIZE = 50
+APPLICANTS_MAX_PAGE_SIZE = 200
+
+# Columns shown on the applicants list; the detail view loads the rest
+APPLICANT_LIST_COLUMNS = (
+    'id', 'full_name', 'email', 'phone', 'institution', 'qualifications_summary',
+    'experience', 'location', 'keywords', 'status', 'created_at'
+)
+APPLICANT_SEARCH_COLUMNS = ('full_name', 'email', 'institution', 'location', 'keywords')
+
+
+def encode_page_cursor(*values):
+    """Opaque keyset cursor holding the sort key of the row a page ended on"""
+    raw = json.dumps([value.isoformat() if isinstance(value, datetime) else value for value in values], default=float)
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+
+def decode_page_cursor(cursor, size=2):
+    """Returns the values passed to encode_page_cursor, or None; raises ValueError if malformed"""
+    if not cursor:
+        return None
+
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except Exception:
+        raise ValueError("malformed cursor")
+
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("malformed cursor")
+    return values
+
+
 @app.route('/api/applicants', methods=['GET'])
 @admin_required
 def get_applicants():
+    """
+    One page of applicants, newest first.
+
+    Query parameters: limit (default 50, max 200), cursor (next_cursor of the
+    previous page), status, job_id and q (matched against name, email,
+    institution, location and keywords). Pages are keyset-paginated on
+    (created_at, id) so every page costs the same however deep it is.
+    """
     try:
+        try:
+            limit = min(max(int(request.args.get('limit', APPLICANTS_PAGE_SIZE)), 1), APPLICANTS_MAX_PAGE_SIZE)
+            after = decode_page_cursor(request.args.get('cursor'))
+            if after:
+                after = datetime.fromisoformat(after[0]), int(after[1])
+        except (TypeError, ValueError) as e:
+            return jsonify({"error": f"Invalid pagination parameters: {str(e)}"}), 400
+
+        columns = ', '.join(f"a.{column}" for column in APPLICANT_LIST_COLUMNS)
+        joins = []
+        conditions = []
+        params = []
+
+        job_id = request.args.get('job_id', type=int)
+        if job_id:
+            joins.append("JOIN job_applicants ja ON ja.applicant_id = a.id AND ja.job_id = %s")
+            params.append(job_id)
+
+        status = request.args.get('status')
+        if status and status != 'All':
+            conditions.append("a.status = %s")
+            params.append(status)
+
+        search = request.args.get('q', '').strip()
+        if search:
+            pattern = f"%{search}%"
+            conditions.append("(" + " OR ".join(f"a.{column} LIKE %s" for column in APPLICANT_SEARCH_COLUMNS) + ")")
+            params.extend([pattern] * len(APPLICANT_SEARCH_COLUMNS))
+
+        if after:
+            conditions.append("(a.created_at < %s OR (a.created_at = %s AND a.id < %s))")
+            params.extend([after[0], after[0], after[1]])
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
         conn = get_db_connection()
         cursor = conn.cursor(dictionary=True)
 
-        cursor.execute("""
-            SELECT * FROM applicants
-            ORDER BY created_at DESC
-        """)
+        # One extra row tells us whether there is a next page
+        cursor.execute(f"""
+            SELECT {columns} FROM applicants a
+            {' '.join(joins)}
+            {where}
+            ORDER BY a.created_at DESC, a.id DESC
+            LIMIT %s
+        """, params + [limit + 1])
 
         applicants = cursor.fetchall()
 
+        cursor.close()
+        conn.close()
+
+        has_more = len(applicants) > limit
+        applicants = applicants[:limit]
+        next_cursor = encode_page_cursor(applicants[-1]['created_at'], applicants[-1]['id']) if has_more else None
+
         # Format datetime objects
         for applicant in applicants:
-            if 'created_at' in applicant and applicant['created_at']:
+            if applicant['created_at']:
                 applicant['created_at'] = applicant['created_at'].isoformat()
 
+        return jsonify({
+            "applicants": applicants,
+            "next_cursor": next_cursor,
+            "has_more": has_more
+        })
+
+    except Exception as e:
+        app.logger.error(f"Error getting applicants: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+
+def skill_list_arg(name):
+    """Lowercased skills from a comma-separated query parameter"""
+    return [skill.strip().lower() for skill in request.args.get(name, '').split(',') if skill.strip()]
+
+
+@app.route('/api/applicants/skill-search', methods=['GET'])
+@admin_required
+def search_applicants_by_skill():
+    """
+    Applicants by skill, best match score first, from the in-memory skill index.
+
+    Query parameters: all (comma-separated skills an applicant must have),
+    any (at least one of), not (none of), job_id (only that job's
+    applicants, ranked by their match score for it) and limit (default 20,
+    max 200).
+    """
+    try:
+        all_skills = skill_list_arg('all')
+        any_skills = skill_list_arg('any')
+        not_skills = skill_list_arg('not')
+        if not (all_skills or any_skills or not_skills):
+            return jsonify({"error": "Provide at least one of all, any or not"}), 400
+
+        try:
+            limit = min(max(int(request.args.get('limit', 20)), 1), APPLICANTS_MAX_PAGE_SIZE)
+            job_id = int(request.args['job_id']) if request.args.get('job_id') else None
+        except ValueError as e:
+            return jsonify({"error": f"Invalid parameters: {str(e)}"}), 400
+
+        if not SCHEMA.has_table('applicant_skills'):
+            return jsonify({"error": "The skill index is not available, run 'alembic upgrade head'"}), 503
+
+        conn = get_db_connection()
+        cursor = conn.cursor(dictionary=True)
+
+        job_scores = None
+        if job_id is not None:
+            cursor.execute("SELECT applicant_id, match_score FROM job_applicants WHERE job_id = %s", (job_id,))
+            job_scores = {
+                row['applicant_id']: float(row['match_score']) if row['match_score'] is not None else None
+                for row in cursor.fetchall()
+            }
+
+        started = time.perf_counter()
+        total, top = SKILL_INDEX.search(all_skills, any_skills, not_skills, limit, scores=job_scores)
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+
+        applicants = fetch_rows_by_id(
+            cursor,
+            "SELECT id, full_name, email, institution, status FROM applicants WHERE id IN ({})",
+            [applicant_id for applicant_id, _ in top]
+        )
         cursor.close()
         conn.close()
 
-        return jsonify(applicants)
+        results = []
+        for applicant_id, score in top:
+            applicant = applicants.get(str(applicant_id))
+            if applicant:
+                results.append(dict(applicant, match_score=score))
+
+        return jsonify({
+            "total": total,
+            "applicants": results,
+            "elapsed_ms": elapsed_ms
+        })
 
     except Exception as e:
-        app.logger.error(f"Error getting applicants: {str(e)}")
+        app.logger.error(f"Error searching applicants by skill: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
 
@@ -725,9 +1148,8 @@ def update_applicant_status(applicant_id):
         conn = get_db_connection()
         cursor = conn.cursor()
 
-        cursor.execute("UPDATE applicants SET status = %s WHERE id = %s", (status, applicant_id))
+        DASHBOARD_STATS.set_applicant_status(cursor, applicant_id, status)
 
-        conn.commit()
         cursor.close()
         conn.close()
 
@@ -745,10 +1167,14 @@ def delete_applicant(applicant_id):
         conn = get_db_connection()
         cursor = conn.cursor()
 
+        cursor.execute("SELECT status FROM applicants WHERE id = %s FOR UPDATE", (applicant_id,))
+        applicant = cursor.fetchone()
+
         # The foreign key constraints with ON DELETE CASCADE will handle related records
         cursor.execute("DELETE FROM applicants WHERE id = %s", (applicant_id,))
+        if applicant:
+            DASHBOARD_STATS.applicant_deleted(cursor, applicant[0])
 
-        conn.commit()
         cursor.close()
         conn.close()
 
@@ -860,8 +1286,8 @@ def create_assessment():
         """, (question_text, question_type, options, correct_answer))
 
         assessment_id = cursor.lastrowid
+        DASHBOARD_STATS.assessment_created(cursor)
 
-        conn.commit()
         cursor.close()
         conn.close()
 
@@ -897,7 +1323,6 @@ def update_assessment(assessment_id):
             WHERE id = %s
         """, (question_text, question_type, options, correct_answer, assessment_id))
 
-        conn.commit()
         cursor.close()
         conn.close()
 
@@ -917,8 +1342,9 @@ def delete_assessment(assessment_id):
 
         # The foreign key constraints with ON DELETE CASCADE will handle related records
         cursor.execute("DELETE FROM assessments WHERE id = %s", (assessment_id,))
+        if cursor.rowcount:
+            DASHBOARD_STATS.assessment_deleted(cursor)
 
-        conn.commit()
         cursor.close()
         conn.close()
 
@@ -1063,7 +1489,6 @@ def create_admin_user():
 
         admin_id = cursor.lastrowid
 
-        conn.commit()
         cursor.close()
         conn.close()
 
@@ -1121,7 +1546,6 @@ def update_admin_user(user_id):
                 WHERE id = %s
             """, (email, user_id))
 
-        conn.commit()
         cursor.close()
         conn.close()
 
@@ -1146,7 +1570,6 @@ def delete_admin_user(user_id):
         # Delete the admin user
         cursor.execute("DELETE FROM admin_users WHERE id = %s", (user_id,))
 
-        conn.commit()
         cursor.close()
         conn.close()
 
@@ -1161,51 +1584,110 @@ def delete_admin_user(user_id):
 # PAGE ROUTES
 # =============================================================================
 
-# Route to serve the index.html
-@app.route('/')
-def index():
-    return send_from_directory('/home/smarthiringorg/SmartHire/Flask_Backend/dist', 'index.html')
+# Route to serve the index.html
+@app.route('/')
+def index():
+    return send_from_directory('/home/smarthiringorg/SmartHire/Flask_Backend/dist', 'index.html')
+
+
+# Catch-all route to handle React Router paths
+@app.route('/<path:path>')
+def catch_all(path):
+    # Check if the path is for a static asset
+    if path.startswith('assets/') or path.startswith('static/'):
+        return send_from_directory('/home/smarthiringorg/SmartHire/Flask_Backend/dist', path)
+
+    # Otherwise, serve the index.html for React Router to handle
+    return send_from_directory('/home/smarthiringorg/SmartHire/Flask_Backend/dist', 'index.html')
+
+
+# =============================================================================
+# PUBLIC API ROUTES FOR JOBS
+# =============================================================================
+class PublicJobsCache:
+    """
+    Serialized public job list with a strong ETag.
+
+    invalidate() bumps the version so the next request rebuilds the body.
+    Other worker processes don't see the bump, so entries also expire after
+    `ttl` seconds to bound how stale another process can be.
+    """
+
+    def __init__(self, ttl=60):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._version = 0
+        self._entry = None
+
+    def invalidate(self):
+        with self._lock:
+            self._version += 1
+            self._entry = None
+
+    def get(self, build):
+        """Returns (body, etag), calling build() for the job list on a miss"""
+        entry = self._entry
+        if entry and entry['version'] == self._version and time.monotonic() - entry['built_at'] < self.ttl:
+            return entry['body'], entry['etag']
+
+        version = self._version
+        body = json.dumps(build(), separators=(',', ':')).encode('utf-8')
+        etag = hashlib.sha256(body).hexdigest()
+
+        with self._lock:
+            # Don't store a body that an invalidate() raced past
+            if version == self._version:
+                self._entry = {
+                    'version': version,
+                    'body': body,
+                    'etag': etag,
+                    'built_at': time.monotonic()
+                }
+        return body, etag
+
+
+PUBLIC_JOBS_CACHE = PublicJobsCache(ttl=float(os.getenv('PUBLIC_JOBS_CACHE_TTL', 60)))
+
 
+def load_public_jobs():
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
 
-# Catch-all route to handle React Router paths
-@app.route('/<path:path>')
-def catch_all(path):
-    # Check if the path is for a static asset
-    if path.startswith('assets/') or path.startswith('static/'):
-        return send_from_directory('/home/smarthiringorg/SmartHire/Flask_Backend/dist', path)
+    cursor.execute(f"""
+        SELECT {', '.join(JOB_COLUMNS)} FROM jobs
+        ORDER BY created_at DESC
+    """)
 
-    # Otherwise, serve the index.html for React Router to handle
-    return send_from_directory('/home/smarthiringorg/SmartHire/Flask_Backend/dist', 'index.html')
+    jobs = cursor.fetchall()
 
+    # Format datetime objects to string
+    for job in jobs:
+        if job['created_at']:
+            job['created_at'] = job['created_at'].isoformat()
 
-# =============================================================================
-# PUBLIC API ROUTES FOR JOBS
-# =============================================================================
-@app.route('/api/public/jobs', methods=['GET'])
-def get_public_jobs():
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor(dictionary=True)
+        # Get the applicants count
+        job['applicants_count'] = job['applicants_count'] or 0
 
-        cursor.execute("""
-            SELECT * FROM jobs
-            ORDER BY created_at DESC
-        """)
+    cursor.close()
+    conn.close()
 
-        jobs = cursor.fetchall()
+    return jobs
 
-        # Format datetime objects to string
-        for job in jobs:
-            if 'created_at' in job and job['created_at']:
-                job['created_at'] = job['created_at'].isoformat()
 
-            # Get the applicants count
-            job['applicants_count'] = job.get('applicants_count', 0)
+@app.route('/api/public/jobs', methods=['GET'])
+def get_public_jobs():
+    try:
+        body, etag = PUBLIC_JOBS_CACHE.get(load_public_jobs)
 
-        cursor.close()
-        conn.close()
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            response = Response(body, mimetype='application/json')
 
-        return jsonify(jobs)
+        response.set_etag(etag)
+        # Browsers may keep the list but must revalidate it on every view
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
 
     except Exception as e:
         app.logger.error(f"Error getting public jobs: {str(e)}")
@@ -1218,34 +1700,14 @@ def get_public_job(job_id):
         conn = get_db_connection()
         cursor = conn.cursor(dictionary=True)
 
-        # Get job details
-        cursor.execute("SELECT * FROM jobs WHERE id = %s", (job_id,))
-        job = cursor.fetchone()
-
-        if not job:
-            cursor.close()
-            conn.close()
-            return jsonify({"error": "Job not found"}), 404
-
-        # Format datetime
-        if 'created_at' in job and job['created_at']:
-            job['created_at'] = job['created_at'].isoformat()
-
-        # Get responsibilities
-        cursor.execute("SELECT * FROM responsibilities WHERE job_id = %s", (job_id,))
-        job['responsibilities'] = cursor.fetchall()
-
-        # Get qualifications
-        cursor.execute("SELECT * FROM qualifications WHERE job_id = %s", (job_id,))
-        job['qualifications'] = cursor.fetchall()
-
-        # Get offers
-        cursor.execute("SELECT * FROM offers WHERE job_id = %s", (job_id,))
-        job['offers'] = cursor.fetchall()
+        job = load_job_detail(cursor, job_id)
 
         cursor.close()
         conn.close()
 
+        if not job:
+            return jsonify({"error": "Job not found"}), 404
+
         return jsonify(job)
 
     except Exception as e:
@@ -1277,133 +1739,63 @@ def apply_for_job(job_id):
             conn.close()
             return jsonify({"error": "Job not found"}), 404
 
-        # Create or get applicant
-        cursor.execute(
-            "SELECT id FROM applicants WHERE email = %s",
-            (data.get('email'),)
-        )
-        existing_applicant = cursor.fetchone()
-
-        if existing_applicant:
-            applicant_id = existing_applicant['id']
-
-            # Update applicant information
-            cursor.execute("""
-                UPDATE applicants SET
-                    full_name = %s,
-                    phone = %s,
-                    institution = %s,
-                    qualifications_summary = %s,
-                    experience = %s,
-                    about = %s,
-                    location = %s,
-                    keywords = %s,
-                    tools = %s,
-                    testimonials = %s
-                WHERE id = %s
-            """, (
-                data.get('full_name'),
-                data.get('phone', ''),
-                data.get('institution', ''),
-                data.get('qualifications_summary', ''),
-                data.get('experience', ''),
-                data.get('about', ''),
-                data.get('location', ''),
-                data.get('keywords', ''),
-                data.get('tools', ''),
-                data.get('testimonials', ''),
-                applicant_id
-            ))
-        else:
-            # Create new applicant
-            cursor.execute("""
-                INSERT INTO applicants (
-                    full_name, email, phone, institution, 
-                    qualifications_summary, experience, about, location,
-                    keywords, tools, testimonials, status, created_at
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """, (
-                data.get('full_name'),
-                data.get('email'),
-                data.get('phone', ''),
-                data.get('institution', ''),
-                data.get('qualifications_summary', ''),
-                data.get('experience', ''),
-                data.get('about', ''),
-                data.get('location', ''),
-                data.get('keywords', ''),
-                data.get('tools', ''),
-                data.get('testimonials', ''),
-                'Applied',  # Default status
-                datetime.now()
-            ))
-
-            applicant_id = cursor.lastrowid
-
-        # Check if already applied to this job
-        cursor.execute(
-            "SELECT id FROM job_applicants WHERE job_id = %s AND applicant_id = %s",
-            (job_id, applicant_id)
-        )
-
-        if cursor.fetchone():
-            # Already applied, just update the application date
-            cursor.execute(
-                "UPDATE job_applicants SET applied_at = %s WHERE job_id = %s AND applicant_id = %s",
-                (datetime.now(), job_id, applicant_id)
-            )
-        else:
-            # Create new application
-            cursor.execute(
-                "INSERT INTO job_applicants (job_id, applicant_id, applied_at) VALUES (%s, %s, %s)",
-                (job_id, applicant_id, datetime.now())
-            )
+        # Create the applicant, or update the one registered with this email
+        applicant_id, _ = upsert_applicant(cursor, data.get('email'), {
+            'full_name': data.get('full_name'),
+            'phone': data.get('phone', ''),
+            'institution': data.get('institution', ''),
+            'qualifications_summary': data.get('qualifications_summary', ''),
+            'experience': data.get('experience', ''),
+            'about': data.get('about', ''),
+            'location': data.get('location', ''),
+            'keywords': data.get('keywords', ''),
+            'tools': data.get('tools', ''),
+            'testimonials': data.get('testimonials', '')
+        })
 
-            # Increment the applicants_count in jobs table
-            cursor.execute(
-                "UPDATE jobs SET applicants_count = applicants_count + 1 WHERE id = %s",
-                (job_id,)
-            )
+        # Record the application; applicants_count only grows on a first apply
+        link_applicant_to_job(cursor, job_id, applicant_id)
 
-        # Save social links if provided
+        # Save social links if provided, replacing the existing ones
         if data.get('social_links'):
-            # First clear existing links
-            cursor.execute("DELETE FROM social_links WHERE applicant_id = %s", (applicant_id,))
-
-            # Insert new links
-            for link in data.get('social_links'):
-                if link.get('platform') and link.get('url'):
-                    cursor.execute(
-                        "INSERT INTO social_links (applicant_id, platform, url) VALUES (%s, %s, %s)",
-                        (applicant_id, link['platform'], link['url'])
-                    )
-
-        # Process assessment answers if provided
-        if data.get('assessment_answers'):
-            for answer in data.get('assessment_answers'):
-                if answer.get('assessment_id') and answer.get('answer'):
-                    # Check if already answered
-                    cursor.execute(
-                        "SELECT id FROM assessment_answers WHERE assessment_id = %s AND applicant_id = %s",
-                        (answer['assessment_id'], applicant_id)
-                    )
-
-                    existing_answer = cursor.fetchone()
-
-                    if existing_answer:
-                        # Update existing answer
-                        cursor.execute(
-                            "UPDATE assessment_answers SET answer = %s, submitted_at = %s WHERE id = %s",
-                            (answer['answer'], datetime.now(), existing_answer['id'])
-                        )
-                    else:
-                        # Create new answer
-                        cursor.execute(
-                            "INSERT INTO assessment_answers (assessment_id, applicant_id, answer, submitted_at) VALUES (%s, %s, %s, %s)",
-                            (answer['assessment_id'], applicant_id, answer['answer'], datetime.now())
-                        )
+            replace_children(cursor, 'social_links', 'applicant_id', applicant_id, ('platform', 'url'), [
+                (link['platform'], link['url'])
+                for link in data.get('social_links')
+                if link.get('platform') and link.get('url')
+            ])
+
+        # Process assessment answers if provided; the last answer to an assessment wins
+        answers = list({
+            str(answer['assessment_id']): answer
+            for answer in data.get('assessment_answers') or []
+            if answer.get('assessment_id') and answer.get('answer')
+        }.values())
+        if answers:
+            # Find the answers already given, then write new and changed ones in one upsert
+            existing_answers = {}
+            assessment_ids = [answer['assessment_id'] for answer in answers]
+            cursor.execute(f"""
+                SELECT id, assessment_id FROM assessment_answers
+                WHERE applicant_id = %s AND assessment_id IN ({', '.join(['%s'] * len(assessment_ids))})
+                ORDER BY id
+            """, [applicant_id] + assessment_ids)
+            for row in cursor.fetchall():
+                existing_answers.setdefault(str(row['assessment_id']), row['id'])
+
+            submitted_at = datetime.now()
+            upsert_rows(
+                cursor,
+                'assessment_answers',
+                ('id', 'assessment_id', 'applicant_id', 'answer', 'submitted_at'),
+                [
+                    # A NULL id inserts a new answer, an existing id updates it
+                    (existing_answers.get(str(answer['assessment_id'])), answer['assessment_id'],
+                     applicant_id, answer['answer'], submitted_at)
+                    for answer in answers
+                ],
+                ('answer', 'submitted_at')
+            )
 
-        conn.commit()
         cursor.close()
         conn.close()
 
@@ -1418,6 +1810,136 @@ def apply_for_job(job_id):
 
 
 
+# =============================================================================
+# RESUME SCREENING HELPERS
+# =============================================================================
+def create_assessment_session(cursor, applicant_id, job_id):
+    cursor.execute("""
+        INSERT INTO assessment_sessions (
+            applicant_id, job_id, created_at, status
+        ) VALUES (%s, %s, %s, %s)
+    """, (
+        applicant_id,
+        job_id,
+        datetime.now(),
+        'pending'
+    ))
+    return cursor.lastrowid
+
+
+def store_assessment_questions(cursor, assessment_id, assessment_questions):
+    # Store questions directly as JSON in the session
+    # This assumes you've added a 'question_data' TEXT column to assessment_sessions table
+    cursor.execute("""
+        UPDATE assessment_sessions 
+        SET question_data = %s 
+        WHERE id = %s
+    """, (
+        json.dumps(assessment_questions),
+        assessment_id
+    ))
+
+
+def store_screening_result(cursor, applicant_id, job_id, assessment_id, analysis_result):
+    """
+    Updates the applicant status, the application's match score and the
+    session's questions from a resume analysis.
+    Returns whether the applicant passed the screening and the stored text
+    vector (or None), which goes to JOB_SIMILARITY.add() after the commit.
+    """
+    # Determine if the applicant meets the requirements
+    skills_match = analysis_result.get('skills_analysis', {})
+    match_percentage = skills_match.get('match_percentage', 0)
+    
+    # Decide if applicant passes the screening (adjust threshold as needed)
+    success = match_percentage >= 60  # 60% match required to pass
+    
+    # Update applicant status based on screening
+    DASHBOARD_STATS.set_applicant_status(cursor, applicant_id, 'Shortlisted' if success else 'Applied')
+    cursor.execute(
+        "UPDATE job_applicants SET match_score = %s WHERE job_id = %s AND applicant_id = %s",
+        (match_percentage, job_id, applicant_id)
+    )
+    if SCHEMA.has_column('job_applicants', 'skill_vector'):
+        store_skill_vector(cursor, SKILL_VECTORS, job_id, applicant_id, skills_match.get('matched_skills', []))
+    if SCHEMA.has_table('applicant_skills'):
+        index_applicant_skills(cursor, applicant_id, skills_match.get('matched_skills', []))
+    # The resume's text is only needed here; don't keep it in the result
+    resume_text = analysis_result.pop('resume_text', '')
+    text_vector = None
+    if SCHEMA.has_column('job_applicants', 'text_vector'):
+        text_vector = store_text_vector(cursor, job_id, applicant_id, resume_text)
+    
+    # Create the questions from the question bank - note the named parameters
+    assessment_questions = get_assessment_questions(
+        experience_level=analysis_result.get('experience_level', 'junior'),
+        matched_skills=skills_match.get('matched_skills', []),
+        question_count=10
+    )
+    store_assessment_questions(cursor, assessment_id, assessment_questions)
+    
+    return success, text_vector
+
+
+def run_queued_analysis(job):
+    """Analysis queue handler: screens the stored resume of a queued application"""
+    resume_path = job['payload'].get('resume_path')
+    analysis_result = analyze_cs_resume(
+        resume_path,
+        job_id=job['job_id'],
+        applicant_id=job['applicant_id'],
+        upload_folder=RESUME_DIR
+    )
+    
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        success, text_vector = store_screening_result(cursor, job['applicant_id'], job['job_id'], job['assessment_id'], analysis_result)
+        conn.commit()
+        if text_vector:
+            JOB_SIMILARITY.add(job['job_id'], job['applicant_id'], text_vector)
+    finally:
+        cursor.close()
+        conn.close()
+    
+    return {"passed": success, "analysis": analysis_result}
+
+
+def fail_queued_analysis(job, error):
+    """Analysis queue failure handler: the applicant still gets a general assessment"""
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            UPDATE assessment_sessions 
+            SET question_data = %s 
+            WHERE id = %s AND question_data IS NULL
+        """, (
+            json.dumps(get_assessment_questions(experience_level='junior', matched_skills=[], question_count=10)),
+            job['assessment_id']
+        ))
+        conn.commit()
+    finally:
+        cursor.close()
+        conn.close()
+
+
+ANALYSIS_QUEUE = AnalysisQueue.from_env(run_queued_analysis, fail_queued_analysis)
+
+# Screen applications in the background by default (?async=0/1 overrides per request)
+SCREENING_ASYNC = os.getenv('SCREENING_ASYNC', '1') == '1'
+
+# Start at process start, so jobs queued or leased before a restart are
+# picked up without waiting for a new application
+ANALYSIS_QUEUE.start()
+
+
+@app.before_request
+def start_analysis_workers():
+    # Threads don't survive a fork, so a web worker forked after import starts its own
+    ANALYSIS_QUEUE.start()
+
+
 """
 Modified Flask routes to use questions directly from the question_bank module
 instead of storing them in the database.
@@ -1469,197 +1991,106 @@ def apply_with_screening(job_id):
         if not resume_file:
             return jsonify({"error": "Resume/CV is required"}), 400
         
-        # Create or get applicant
-        cursor.execute(
-            "SELECT id FROM applicants WHERE email = %s",
-            (email,)
-        )
-        existing_applicant = cursor.fetchone()
-        
-        if existing_applicant:
-            applicant_id = existing_applicant['id']
-            
-            # Update applicant information
-            cursor.execute("""
-                UPDATE applicants SET
-                    full_name = %s,
-                    phone = %s,
-                    gender = %s,
-                    updated_at = %s
-                WHERE id = %s
-            """, (
-                full_name,
-                phone,
-                gender,
-                datetime.now(),
-                applicant_id
-            ))
-        else:
-            # Create new applicant
-            cursor.execute("""
-                INSERT INTO applicants (
-                    full_name, email, phone, gender, status, created_at
-                ) VALUES (%s, %s, %s, %s, %s, %s)
-            """, (
-                full_name,
-                email,
-                phone,
-                gender,
-                'Applied',  # Default status
-                datetime.now()
-            ))
-            
-            applicant_id = cursor.lastrowid
+        # Create the applicant, or update the one registered with this email
+        applicant_id, _ = upsert_applicant(cursor, email, {
+            'full_name': full_name,
+            'phone': phone,
+            'gender': gender
+        }, update_extra={'updated_at': datetime.now()})
         
-        # Save resume and cover letter to designated directories
-        resume_path = save_uploaded_file(
-            resume_file, 
-            RESUME_DIR, 
-            applicant_id, 
-            job_id, 
+        # Read uploads once from the request buffer; screening parses them in memory
+        # while they are written to the designated directories in the background
+        resume_upload = UploadBuffer.from_file(resume_file)
+        resume_path, resume_saved = save_upload_buffer_async(
+            resume_upload,
+            RESUME_DIR,
+            applicant_id,
+            job_id,
             'resume'
         )
         
         cover_letter_path = None
+        cover_letter_saved = None
         if cover_letter_file:
-            cover_letter_path = save_uploaded_file(
-                cover_letter_file, 
-                COVER_LETTER_DIR, 
-                applicant_id, 
-                job_id, 
+            cover_letter_path, cover_letter_saved = save_upload_buffer_async(
+                UploadBuffer.from_file(cover_letter_file),
+                COVER_LETTER_DIR,
+                applicant_id,
+                job_id,
                 'cover_letter'
             )
         
         # Store file paths in database
         try:
-            # Check if we already have a files record for this applicant
-            cursor.execute(
-                "SELECT id FROM applicant_files WHERE applicant_id = %s AND job_id = %s",
-                (applicant_id, job_id)
-            )
-            existing_files = cursor.fetchone()
-            
-            if existing_files:
-                # Update existing record
-                cursor.execute("""
-                    UPDATE applicant_files 
-                    SET resume_path = %s, cover_letter_path = %s, updated_at = %s
-                    WHERE applicant_id = %s AND job_id = %s
-                """, (
-                    resume_path,
-                    cover_letter_path,
-                    datetime.now(),
-                    applicant_id,
-                    job_id
-                ))
-            else:
-                # Insert new record
-                cursor.execute("""
-                    INSERT INTO applicant_files 
-                    (applicant_id, job_id, resume_path, cover_letter_path, created_at)
-                    VALUES (%s, %s, %s, %s, %s)
-                """, (
-                    applicant_id,
-                    job_id,
-                    resume_path,
-                    cover_letter_path,
-                    datetime.now()
-                ))
+            upsert_applicant_files(cursor, applicant_id, job_id, resume_path, cover_letter_path)
         except Exception as e:
             logger.error(f"Error storing file paths: {str(e)}")
             # Continue even if this fails
         
+        # Queue the analysis instead of running it in the request when asked to
+        if request.args.get('async', '1' if SCREENING_ASYNC else '0') == '1':
+            link_applicant_to_job(cursor, job_id, applicant_id)
+            assessment_id = create_assessment_session(cursor, applicant_id, job_id)
+            analysis_job_id = ANALYSIS_QUEUE.enqueue(
+                cursor,
+                applicant_id,
+                job_id,
+                assessment_id,
+                {"resume_path": resume_path}
+            )
+            
+            failed = rollback_on_failed_upload(conn, resume_saved, cover_letter_saved)
+            if failed:
+                cursor.close()
+                conn.close()
+                return failed
+            after_commit(ANALYSIS_QUEUE.notify)
+            cursor.close()
+            conn.close()
+            
+            return jsonify({
+                "success": True,
+                "message": "Your application has been received. Your resume is being analyzed.",
+                "application_id": applicant_id,
+                "assessment_id": assessment_id,
+                "analysis_job_id": analysis_job_id,
+                "status": STATUS_QUEUED,
+                "status_url": f"/api/public/assessments/{assessment_id}/analysis-status",
+                "proceed_to_assessment": True
+            }), 202
+        
         # Process CV/resume for skill matching
         try:
             # Analyze the resume using analyze_cs_resume function
             analysis_result = analyze_cs_resume(
-                resume_path, 
+                resume_upload,
                 job_id=job_id,
                 applicant_id=applicant_id,
-                upload_folder=RESUME_DIR  # Use the same folder for consistency
+                upload_folder=RESUME_DIR,  # Use the same folder for consistency
+                save_to_disk=False  # Already being persisted in the background
             )
+            analysis_result['resume_path'] = resume_path
             
             logger.info(f"Analysis result type: {type(analysis_result)}")
             logger.info(f"Analysis result keys: {analysis_result.keys() if isinstance(analysis_result, dict) else 'Not a dict'}")
 
-            # Determine if the applicant meets the requirements
-            skills_match = analysis_result.get('skills_analysis', {})
-            match_percentage = skills_match.get('match_percentage', 0)
-            
-            # Decide if applicant passes the screening (adjust threshold as needed)
-            success = match_percentage >= 60  # 60% match required to pass
-            
-            # Update applicant status based on screening
-            cursor.execute(
-                "UPDATE applicants SET status = %s WHERE id = %s",
-                ('Shortlisted' if success else 'Applied', applicant_id)
-            )
-            
             # Associate applicant with job
-            cursor.execute(
-                "SELECT id FROM job_applicants WHERE job_id = %s AND applicant_id = %s",
-                (job_id, applicant_id)
-            )
-            
-            if cursor.fetchone():
-                # Already applied, just update the application date
-                cursor.execute(
-                    "UPDATE job_applicants SET applied_at = %s WHERE job_id = %s AND applicant_id = %s",
-                    (datetime.now(), job_id, applicant_id)
-                )
-            else:
-                # Create new application
-                cursor.execute(
-                    "INSERT INTO job_applicants (job_id, applicant_id, applied_at) VALUES (%s, %s, %s)",
-                    (job_id, applicant_id, datetime.now())
-                )
-                
-                # Increment the applicants_count in jobs table
-                cursor.execute(
-                    "UPDATE jobs SET applicants_count = applicants_count + 1 WHERE id = %s",
-                    (job_id,)
-                )
+            link_applicant_to_job(cursor, job_id, applicant_id)
             
             # Always create assessment regardless of success
-            assessment_id = None
-            # Get questions based on the matched skills - USING NAMED PARAMETERS to avoid order issues
-            matched_skills = skills_match.get('matched_skills', [])
+            assessment_id = create_assessment_session(cursor, applicant_id, job_id)
             
-            # Create the questions from the question bank - note the named parameters
-            assessment_questions = get_assessment_questions(
-                experience_level=analysis_result.get('experience_level', 'junior'),
-                matched_skills=matched_skills,
-                question_count=10
-            )
-            
-            # Create an assessment session
-            cursor.execute("""
-                INSERT INTO assessment_sessions (
-                    applicant_id, job_id, created_at, status
-                ) VALUES (%s, %s, %s, %s)
-            """, (
-                applicant_id,
-                job_id,
-                datetime.now(),
-                'pending'
-            ))
-            
-            assessment_id = cursor.lastrowid
+            # Update applicant status and store the assessment questions
+            success, text_vector = store_screening_result(cursor, applicant_id, job_id, assessment_id, analysis_result)
             
-            # Store questions directly as JSON in the session
-            # This assumes you've added a 'question_data' TEXT column to assessment_sessions table
-            question_data = json.dumps(assessment_questions)
-            
-            cursor.execute("""
-                UPDATE assessment_sessions 
-                SET question_data = %s 
-                WHERE id = %s
-            """, (
-                question_data,
-                assessment_id
-            ))
-            
-            conn.commit()
+            # Files must be on disk before the rows referencing them are committed
+            failed = rollback_on_failed_upload(conn, resume_saved, cover_letter_saved)
+            if failed:
+                cursor.close()
+                conn.close()
+                return failed
+            if text_vector:
+                after_commit(lambda: JOB_SIMILARITY.add(job_id, applicant_id, text_vector))
             
             # Prepare response with screening results
             response_data = {
@@ -1680,7 +2111,12 @@ def apply_with_screening(job_id):
             import traceback
             error_details = traceback.format_exc()
             logger.error(f"Traceback: {error_details}")
-            conn.commit()  # Still commit any database changes made so far
+            # Any database changes made so far are still committed with the response
+            failed = rollback_on_failed_upload(conn, resume_saved, cover_letter_saved)
+            if failed:
+                cursor.close()
+                conn.close()
+                return failed
             
             # Return a friendly success message despite the error
             return jsonify({
@@ -1696,6 +2132,8 @@ def apply_with_screening(job_id):
         import traceback
         error_details = traceback.format_exc()
         logger.error(f"Traceback: {error_details}")
+        # The response is a 200, so drop the partial work before it is committed
+        get_db_connection().rollback()
         return jsonify({
             "success": True,  # Still show success to user
             "message": "Your application has been received",
@@ -1704,6 +2142,30 @@ def apply_with_screening(job_id):
         })
 
 
+@app.route('/api/public/assessments/<int:assessment_id>/analysis-status', methods=['GET'])
+def get_analysis_status(assessment_id):
+    try:
+        job = ANALYSIS_QUEUE.get_status(assessment_id)
+        
+        if not job:
+            return jsonify({"error": "No analysis found for this assessment"}), 404
+        
+        result = job.get('result') or {}
+        
+        return jsonify({
+            "assessment_id": assessment_id,
+            "status": job['status'],
+            "attempts": job['attempts'],
+            "passed": result.get('passed'),
+            "analysis": result.get('analysis'),
+            "updated_at": job['updated_at']
+        })
+        
+    except Exception as e:
+        logger.error(f"Error getting analysis status: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
+
 @app.route('/api/public/assessments/<int:assessment_id>', methods=['GET'])
 def get_public_assessment(assessment_id):
     try:
@@ -1745,6 +2207,14 @@ def get_public_assessment(assessment_id):
                     logger.error(f"Error parsing question data JSON: {str(e)}")
                     # Fall back to checking assessment_questions table
             
+            # Questions for a queued application appear once its analysis has run
+            if not session.get('question_data'):
+                analysis_job = ANALYSIS_QUEUE.get_status(assessment_id)
+                if analysis_job and analysis_job['status'] in (STATUS_QUEUED, STATUS_RUNNING):
+                    cursor.close()
+                    conn.close()
+                    return jsonify({"questions": [], "status": analysis_job['status']}), 202
+            
             # If no question_data or JSON parsing failed, try the assessment_questions table
             cursor.execute("""
                 SELECT id, question_text, question_type, options, correct_answer 
@@ -1996,6 +2466,33 @@ def get_public_assessment(assessment_id):
 #         error_details = traceback.format_exc()
 #         logger.error(f"Traceback: {error_details}")
 #         return jsonify({"error": str(e)}), 500
+def fetch_rows_by_id(cursor, query, ids):
+    """
+    Runs `query` (with a "{}" placeholder for the IN list) for all `ids` in one
+    round-trip and returns the rows keyed by str(id).
+    """
+    ids = list(dict.fromkeys(ids))
+    if not ids:
+        return {}
+
+    cursor.execute(query.format(', '.join(['%s'] * len(ids))), ids)
+    return {str(row['id']): row for row in cursor.fetchall()}
+
+
+def insert_assessment_answers(cursor, assessment_id, applicant_id, answer_rows):
+    """Saves graded (question_id, answer, is_correct) rows with a single multi-row INSERT"""
+    submitted_at = datetime.now()
+    insert_rows(
+        cursor,
+        'assessment_answers',
+        ('assessment_id', 'question_id', 'applicant_id', 'answer', 'is_correct', 'submitted_at'),
+        [
+            (assessment_id, question_id, applicant_id, answer, is_correct, submitted_at)
+            for question_id, answer, is_correct in answer_rows
+        ]
+    )
+
+
 @app.route('/api/public/assessments/<int:assessment_id>/submit', methods=['POST'])
 def submit_public_assessment(assessment_id):
     try:
@@ -2014,7 +2511,7 @@ def submit_public_assessment(assessment_id):
         
         # First determine if this is a session-based assessment
         cursor.execute("""
-            SELECT * FROM assessment_sessions 
+            SELECT id, applicant_id, job_id, question_data FROM assessment_sessions 
             WHERE id = %s
         """, (assessment_id,))
         
@@ -2024,23 +2521,26 @@ def submit_public_assessment(assessment_id):
         actual_assessment_id = None
         
         if session:
-            # Update assessment session status
-            cursor.execute("""
-                UPDATE assessment_sessions 
-                SET status = 'completed', completed_at = %s
-                WHERE id = %s AND applicant_id = %s
-            """, (datetime.now(), assessment_id, applicant_id))
+            # Mark the session completed with one upsert on its id, only for its own applicant
+            if str(session['applicant_id']) == str(applicant_id):
+                upsert_rows(
+                    cursor,
+                    'assessment_sessions',
+                    ('id', 'applicant_id', 'job_id', 'status', 'completed_at'),
+                    [(assessment_id, session['applicant_id'], session['job_id'], 'completed', datetime.now())],
+                    ('status', 'completed_at')
+                )
             
             # Check if we already created a bridge record in assessments table
             cursor.execute("""
-                SELECT id FROM assessments 
-                WHERE question_text = %s
-            """, (f"Session {assessment_id}",))
+                SELECT assessment_id FROM assessment_session_bridges 
+                WHERE session_id = %s
+            """, (assessment_id,))
             
             bridge_assessment = cursor.fetchone()
             
             if bridge_assessment:
-                actual_assessment_id = bridge_assessment['id']
+                actual_assessment_id = bridge_assessment['assessment_id']
             else:
                 # Create a bridge record in assessments table to satisfy the foreign key
                 cursor.execute("""
@@ -2053,6 +2553,12 @@ def submit_public_assessment(assessment_id):
                     ''
                 ))
                 actual_assessment_id = cursor.lastrowid
+                DASHBOARD_STATS.assessment_created(cursor)
+                
+                cursor.execute("""
+                    INSERT INTO assessment_session_bridges (session_id, assessment_id)
+                    VALUES (%s, %s)
+                """, (assessment_id, actual_assessment_id))
             
             # For assessments using question_data JSON from question bank
             if session.get('question_data'):
@@ -2065,38 +2571,41 @@ def submit_public_assessment(assessment_id):
                     # First, ensure we have bridge records in assessment_questions for each question
                     question_id_map = {}  # Maps frontend question_id to database question_id
                     
+                    cursor.execute("""
+                        SELECT id, question_index FROM assessment_questions 
+                        WHERE session_id = %s
+                    """, (assessment_id,))
+                    for existing_question in cursor.fetchall():
+                        question_id_map[str(existing_question['question_index'])] = existing_question['id']
+                    
+                    # Create the missing bridge records in assessment_questions in one statement
+                    # IMPORTANT: Only using columns that exist in the table
+                    new_questions = []
                     for i, question_data in enumerate(questions_from_bank):
                         frontend_question_id = i + 1  # Frontend uses 1-based indexing
+                        if str(frontend_question_id) in question_id_map:
+                            continue
                         
-                        # Check if we already have a bridge question for this
-                        cursor.execute("""
-                            SELECT id FROM assessment_questions 
-                            WHERE session_id = %s AND question_index = %s
-                        """, (assessment_id, frontend_question_id))
-                        
-                        existing_question = cursor.fetchone()
-                        
-                        if existing_question:
-                            question_id_map[str(frontend_question_id)] = existing_question['id']
-                        else:
-                            # Create a bridge record in assessment_questions
-                            # IMPORTANT: Only using columns that exist in the table
-                            cursor.execute("""
-                                INSERT INTO assessment_questions (
-                                    id, correct_answer, question_type, session_id, question_index
-                                ) VALUES (%s, %s, %s, %s, %s)
-                            """, (
-                                f"session_{assessment_id}_q{frontend_question_id}",  # Use a predictable ID format
-                                question_data.get('correct_answer', ''),
-                                'multiple-choice',
-                                assessment_id,
-                                frontend_question_id
-                            ))
-                            
-                            # Use the manually generated id since we're not using auto-increment
-                            question_id_map[str(frontend_question_id)] = f"session_{assessment_id}_q{frontend_question_id}"
+                        # Use a predictable ID format since we're not using auto-increment
+                        db_question_id = f"session_{assessment_id}_q{frontend_question_id}"
+                        question_id_map[str(frontend_question_id)] = db_question_id
+                        new_questions.append((
+                            db_question_id,
+                            question_data.get('correct_answer', ''),
+                            'multiple-choice',
+                            assessment_id,
+                            frontend_question_id
+                        ))
+                    
+                    insert_rows(
+                        cursor,
+                        'assessment_questions',
+                        ('id', 'correct_answer', 'question_type', 'session_id', 'question_index'),
+                        new_questions
+                    )
                     
-                    # Process each answer
+                    # Grade every answer in memory
+                    answer_rows = []
                     for answer_data in answers:
                         frontend_question_id = answer_data.get('question_id')
                         answer = answer_data.get('answer')
@@ -2118,18 +2627,7 @@ def submit_public_assessment(assessment_id):
                                     is_correct = (question.get('correct_answer') == answer)
                                 
                                 # Save the answer using both bridge IDs
-                                cursor.execute("""
-                                    INSERT INTO assessment_answers 
-                                    (assessment_id, question_id, applicant_id, answer, is_correct, submitted_at) 
-                                    VALUES (%s, %s, %s, %s, %s, %s)
-                                """, (
-                                    actual_assessment_id,  # Bridge assessment ID
-                                    db_question_id,        # Bridge question ID
-                                    applicant_id, 
-                                    answer,
-                                    is_correct,
-                                    datetime.now()
-                                ))
+                                answer_rows.append((db_question_id, answer, is_correct))
                                 
                                 if is_correct:
                                     correct_count += 1
@@ -2138,6 +2636,8 @@ def submit_public_assessment(assessment_id):
                                 logger.warning(f"Invalid question_id or index: {frontend_question_id}, Error: {str(e)}")
                                 logger.warning(traceback.format_exc())
                     
+                    insert_assessment_answers(cursor, actual_assessment_id, applicant_id, answer_rows)
+                    
                     # Calculate score
                     score = 0
                     if total_questions > 0:
@@ -2145,10 +2645,7 @@ def submit_public_assessment(assessment_id):
                         
                     # Update applicant status based on score (optional)
                     if score >= 70:  # Example passing threshold
-                        cursor.execute(
-                            "UPDATE applicants SET status = 'Shortlisted' WHERE id = %s",
-                            (applicant_id,)
-                        )
+                        DASHBOARD_STATS.set_applicant_status(cursor, applicant_id, 'Shortlisted')
                 
                 except Exception as e:
                     import traceback
@@ -2159,21 +2656,22 @@ def submit_public_assessment(assessment_id):
                 correct_count = 0
                 total_questions = len(answers)
                 
-                for answer_data in answers:
-                    question_id = answer_data.get('question_id')
-                    answer = answer_data.get('answer')
-                    
-                    if not question_id or not answer:
-                        continue
-                        
-                    # Check if this is a correct answer
-                    cursor.execute("""
-                        SELECT correct_answer, question_type 
-                        FROM assessment_questions 
-                        WHERE id = %s
-                    """, (question_id,))
-                    
-                    question = cursor.fetchone()
+                submitted = [
+                    (answer_data.get('question_id'), answer_data.get('answer'))
+                    for answer_data in answers
+                    if answer_data.get('question_id') and answer_data.get('answer')
+                ]
+                
+                # Fetch every answered question at once
+                questions = fetch_rows_by_id(
+                    cursor,
+                    "SELECT id, correct_answer, question_type FROM assessment_questions WHERE id IN ({})",
+                    [question_id for question_id, _ in submitted]
+                )
+                
+                answer_rows = []
+                for question_id, answer in submitted:
+                    question = questions.get(str(question_id))
                     
                     is_correct = False
                     if question:
@@ -2182,24 +2680,15 @@ def submit_public_assessment(assessment_id):
                         else:
                             # For text answers, mark as needing review
                             is_correct = None
-                            
+                    
                     # Save the answer using the bridge assessment ID
-                    cursor.execute("""
-                        INSERT INTO assessment_answers 
-                        (assessment_id, question_id, applicant_id, answer, is_correct, submitted_at) 
-                        VALUES (%s, %s, %s, %s, %s, %s)
-                    """, (
-                        actual_assessment_id, # Use the bridge assessment ID
-                        question_id, 
-                        applicant_id, 
-                        answer,
-                        is_correct,
-                        datetime.now()
-                    ))
+                    answer_rows.append((question_id, answer, is_correct))
                     
                     if is_correct:
                         correct_count += 1
                 
+                insert_assessment_answers(cursor, actual_assessment_id, applicant_id, answer_rows)
+                
                 # Calculate score if possible
                 score = 0
                 if total_questions > 0:
@@ -2207,48 +2696,33 @@ def submit_public_assessment(assessment_id):
                     
                 # Update applicant status based on score (optional)
                 if score >= 70:  # Example passing threshold
-                    cursor.execute(
-                        "UPDATE applicants SET status = 'Shortlisted' WHERE id = %s",
-                        (applicant_id,)
-                    )
+                    DASHBOARD_STATS.set_applicant_status(cursor, applicant_id, 'Shortlisted')
         else:
             # Handle submission for older assessment format (backwards compatibility)
             actual_assessment_id = assessment_id  # For older format, use the ID directly
             
-            for answer_data in answers:
-                question_id = answer_data.get('question_id')
-                answer = answer_data.get('answer')
-                
-                if not question_id or not answer:
-                    continue
-                
-                # Look up in assessments table
-                cursor.execute("""
-                    SELECT id, correct_answer 
-                    FROM assessments 
-                    WHERE id = %s
-                """, (question_id,))
-                
-                question = cursor.fetchone()
-                
+            submitted = [
+                (answer_data.get('question_id'), answer_data.get('answer'))
+                for answer_data in answers
+                if answer_data.get('question_id') and answer_data.get('answer')
+            ]
+            
+            # Look up in assessments table
+            questions = fetch_rows_by_id(
+                cursor,
+                "SELECT id, correct_answer FROM assessments WHERE id IN ({})",
+                [question_id for question_id, _ in submitted]
+            )
+            
+            # Only answers to known questions are saved
+            answer_rows = []
+            for question_id, answer in submitted:
+                question = questions.get(str(question_id))
                 if question:
-                    is_correct = (question['correct_answer'] == answer)
-                    
-                    # Save the answer
-                    cursor.execute("""
-                        INSERT INTO assessment_answers 
-                        (assessment_id, question_id, applicant_id, answer, is_correct, submitted_at) 
-                        VALUES (%s, %s, %s, %s, %s, %s)
-                    """, (
-                        actual_assessment_id, 
-                        question_id, 
-                        applicant_id, 
-                        answer,
-                        is_correct,
-                        datetime.now()
-                    ))
+                    answer_rows.append((question_id, answer, question['correct_answer'] == answer))
+            
+            insert_assessment_answers(cursor, actual_assessment_id, applicant_id, answer_rows)
         
-        conn.commit()
         cursor.close()
         conn.close()
         
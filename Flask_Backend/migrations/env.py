@@ -0,0 +1,54 @@
+"""
+env.py - Alembic environment for the SmartHire MySQL database
+
+Migrations are written as plain SQL through op.execute, so no SQLAlchemy
+models are needed; the URL comes from the same DB_* settings the app uses.
+"""
+
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+from sqlalchemy.engine import URL
+
+from database import _connect_kwargs
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+
+def database_url():
+    settings = _connect_kwargs()
+    return URL.create(
+        "mysql+mysqlconnector",
+        username=settings['user'],
+        password=settings['password'],
+        host=settings['host'],
+        database=settings['database']
+    )
+
+
+def run_migrations_offline():
+    """Emits the migration SQL instead of running it (alembic upgrade --sql)"""
+    context.configure(url=database_url(), literal_binds=True)
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    engine = create_engine(database_url(), poolclass=pool.NullPool)
+
+    with engine.connect() as connection:
+        context.configure(connection=connection)
+
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
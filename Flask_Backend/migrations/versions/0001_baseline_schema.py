@@ -0,0 +1,180 @@
+"""Baseline schema
+
+The tables the application has always used. Every statement is
+CREATE TABLE IF NOT EXISTS so the revision can be applied to a database
+that was set up by hand before migrations existed.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 09:00:00
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+TABLES = [
+    ('admin_users', """
+        CREATE TABLE IF NOT EXISTS admin_users (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            email VARCHAR(255) NOT NULL,
+            password_hash VARCHAR(255) NOT NULL,
+            salt VARCHAR(255) NOT NULL,
+            created_at DATETIME NOT NULL,
+            UNIQUE KEY uq_admin_users_email (email)
+        )
+    """),
+    ('jobs', """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            job_name VARCHAR(255) NOT NULL,
+            company_name VARCHAR(255),
+            salary_range VARCHAR(100),
+            type VARCHAR(50),
+            remote_type VARCHAR(50),
+            location VARCHAR(255),
+            description TEXT,
+            required_skills TEXT,
+            applicants_count INT NOT NULL DEFAULT 0,
+            created_at DATETIME
+        )
+    """),
+    ('responsibilities', """
+        CREATE TABLE IF NOT EXISTS responsibilities (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            job_id INT NOT NULL,
+            responsibility_text TEXT,
+            FOREIGN KEY (job_id) REFERENCES jobs (id) ON DELETE CASCADE
+        )
+    """),
+    ('qualifications', """
+        CREATE TABLE IF NOT EXISTS qualifications (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            job_id INT NOT NULL,
+            qualification_text TEXT,
+            FOREIGN KEY (job_id) REFERENCES jobs (id) ON DELETE CASCADE
+        )
+    """),
+    ('offers', """
+        CREATE TABLE IF NOT EXISTS offers (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            job_id INT NOT NULL,
+            offer_text TEXT,
+            FOREIGN KEY (job_id) REFERENCES jobs (id) ON DELETE CASCADE
+        )
+    """),
+    ('applicants', """
+        CREATE TABLE IF NOT EXISTS applicants (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            full_name VARCHAR(255),
+            email VARCHAR(255),
+            phone VARCHAR(50),
+            gender VARCHAR(20),
+            institution VARCHAR(255),
+            qualifications_summary TEXT,
+            experience TEXT,
+            about TEXT,
+            location VARCHAR(255),
+            keywords TEXT,
+            tools TEXT,
+            testimonials TEXT,
+            status VARCHAR(32) DEFAULT 'Applied',
+            created_at DATETIME,
+            updated_at DATETIME
+        )
+    """),
+    ('social_links', """
+        CREATE TABLE IF NOT EXISTS social_links (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            applicant_id INT NOT NULL,
+            platform VARCHAR(50),
+            url VARCHAR(512),
+            FOREIGN KEY (applicant_id) REFERENCES applicants (id) ON DELETE CASCADE
+        )
+    """),
+    ('job_applicants', """
+        CREATE TABLE IF NOT EXISTS job_applicants (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            job_id INT NOT NULL,
+            applicant_id INT NOT NULL,
+            applied_at DATETIME,
+            FOREIGN KEY (job_id) REFERENCES jobs (id) ON DELETE CASCADE,
+            FOREIGN KEY (applicant_id) REFERENCES applicants (id) ON DELETE CASCADE
+        )
+    """),
+    ('applicant_files', """
+        CREATE TABLE IF NOT EXISTS applicant_files (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            applicant_id INT NOT NULL,
+            job_id INT NOT NULL,
+            resume_path VARCHAR(512),
+            cover_letter_path VARCHAR(512),
+            created_at DATETIME,
+            updated_at DATETIME,
+            FOREIGN KEY (applicant_id) REFERENCES applicants (id) ON DELETE CASCADE,
+            FOREIGN KEY (job_id) REFERENCES jobs (id) ON DELETE CASCADE
+        )
+    """),
+    ('assessments', """
+        CREATE TABLE IF NOT EXISTS assessments (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            question_text TEXT,
+            question_type VARCHAR(50),
+            options TEXT,
+            correct_answer TEXT
+        )
+    """),
+    ('assessment_sessions', """
+        CREATE TABLE IF NOT EXISTS assessment_sessions (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            applicant_id INT NOT NULL,
+            job_id INT NOT NULL,
+            status VARCHAR(32) DEFAULT 'pending',
+            question_data LONGTEXT,
+            created_at DATETIME,
+            completed_at DATETIME,
+            FOREIGN KEY (applicant_id) REFERENCES applicants (id) ON DELETE CASCADE,
+            FOREIGN KEY (job_id) REFERENCES jobs (id) ON DELETE CASCADE
+        )
+    """),
+    ('assessment_questions', """
+        CREATE TABLE IF NOT EXISTS assessment_questions (
+            id VARCHAR(64) PRIMARY KEY,
+            session_id INT,
+            question_index INT,
+            question_text TEXT,
+            question_type VARCHAR(50),
+            options TEXT,
+            correct_answer TEXT
+        )
+    """),
+    ('assessment_answers', """
+        CREATE TABLE IF NOT EXISTS assessment_answers (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            assessment_id INT NOT NULL,
+            question_id VARCHAR(64),
+            applicant_id INT NOT NULL,
+            answer TEXT,
+            is_correct TINYINT(1),
+            submitted_at DATETIME,
+            FOREIGN KEY (assessment_id) REFERENCES assessments (id) ON DELETE CASCADE,
+            FOREIGN KEY (applicant_id) REFERENCES applicants (id) ON DELETE CASCADE
+        )
+    """),
+]
+
+
+def upgrade() -> None:
+    for _, create in TABLES:
+        op.execute(create)
+
+
+def downgrade() -> None:
+    for table, _ in reversed(TABLES):
+        op.execute(f"DROP TABLE IF EXISTS {table}")
@@ -0,0 +1,80 @@
+"""Tables and columns previously created by the app at startup
+
+job_applicants.match_score, the session -> bridge assessment mapping, the
+analysis job queue and the dashboard counters. Each step is skipped when
+the app already created the object.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 09:10:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+
+    columns = [column['name'] for column in inspector.get_columns('job_applicants')]
+    if 'match_score' not in columns:
+        op.execute("ALTER TABLE job_applicants ADD COLUMN match_score DECIMAL(5,2) NULL")
+
+    if not inspector.has_table('assessment_session_bridges'):
+        op.execute("""
+            CREATE TABLE assessment_session_bridges (
+                session_id INT PRIMARY KEY,
+                assessment_id INT NOT NULL,
+                INDEX idx_session_bridges_assessment (assessment_id)
+            )
+        """)
+        # Bridge rows used to be found by question_text = 'Session <id>'
+        op.execute("""
+            INSERT IGNORE INTO assessment_session_bridges (session_id, assessment_id)
+            SELECT CAST(SUBSTRING(question_text, 9) AS UNSIGNED), MIN(id)
+            FROM assessments
+            WHERE question_text REGEXP '^Session [0-9]+$'
+            GROUP BY question_text
+        """)
+
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS analysis_jobs (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            applicant_id INT NOT NULL,
+            job_id INT NOT NULL,
+            assessment_id INT NULL,
+            payload TEXT,
+            status VARCHAR(16) NOT NULL DEFAULT 'queued',
+            attempts INT NOT NULL DEFAULT 0,
+            claim_token VARCHAR(36) NULL,
+            claimed_at DATETIME NULL,
+            result LONGTEXT NULL,
+            error TEXT NULL,
+            created_at DATETIME NOT NULL,
+            updated_at DATETIME NULL,
+            INDEX idx_analysis_jobs_status (status, id),
+            INDEX idx_analysis_jobs_assessment (assessment_id),
+            INDEX idx_analysis_jobs_claim (claim_token)
+        )
+    """)
+
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS dashboard_counters (
+            name VARCHAR(64) PRIMARY KEY,
+            value BIGINT NOT NULL DEFAULT 0
+        )
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TABLE IF EXISTS dashboard_counters")
+    op.execute("DROP TABLE IF EXISTS analysis_jobs")
+    op.execute("DROP TABLE IF EXISTS assessment_session_bridges")
+    op.execute("ALTER TABLE job_applicants DROP COLUMN match_score")
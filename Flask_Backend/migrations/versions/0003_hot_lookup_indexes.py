@@ -0,0 +1,100 @@
+"""Indexes for every hot lookup
+
+Composite and unique indexes behind the application's WHERE/ORDER BY
+clauses. Indexes that already exist under the same name are left alone.
+Duplicate link rows are removed before their unique keys are added; a
+duplicate applicant email or session question has to be resolved by hand,
+and the migration stops with a message naming the table.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 09:20:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+# (table, name, columns, unique)
+INDEXES = [
+    ('applicants', 'uq_applicants_email', ('email',), True),
+    ('applicants', 'idx_applicants_created', ('created_at', 'id'), False),
+    ('applicants', 'idx_applicants_status_created', ('status', 'created_at', 'id'), False),
+    ('job_applicants', 'uq_job_applicants_job_applicant', ('job_id', 'applicant_id'), True),
+    ('job_applicants', 'idx_job_applicants_job_applied', ('job_id', 'applied_at'), False),
+    ('job_applicants', 'idx_job_applicants_applicant', ('applicant_id',), False),
+    ('applicant_files', 'uq_applicant_files_applicant_job', ('applicant_id', 'job_id'), True),
+    ('assessment_questions', 'uq_assessment_questions_session_index', ('session_id', 'question_index'), True),
+    ('assessment_answers', 'idx_assessment_answers_assessment_applicant', ('assessment_id', 'applicant_id'), False),
+    ('assessment_answers', 'idx_assessment_answers_applicant', ('applicant_id',), False),
+    ('assessment_sessions', 'idx_assessment_sessions_applicant', ('applicant_id', 'job_id'), False),
+    ('social_links', 'idx_social_links_applicant', ('applicant_id',), False),
+    ('jobs', 'idx_jobs_created', ('created_at',), False),
+    ('jobs', 'idx_jobs_applicants_count', ('applicants_count',), False),
+]
+
+# Link tables where duplicates carry no data of their own; the newest row is kept
+DEDUPLICATE = {'uq_job_applicants_job_applicant', 'uq_applicant_files_applicant_job'}
+
+
+def _existing_indexes(inspector, table):
+    names = {index['name'] for index in inspector.get_indexes(table)}
+    names |= {constraint['name'] for constraint in inspector.get_unique_constraints(table)}
+    return names
+
+
+def _delete_duplicates(table, columns):
+    join = ' AND '.join(f"older.{column} = newer.{column}" for column in columns)
+    op.execute(f"""
+        DELETE older FROM {table} older
+        JOIN {table} newer ON {join} AND older.id < newer.id
+    """)
+
+
+def _check_no_duplicates(bind, table, columns):
+    column_list = ', '.join(columns)
+    not_null = ' AND '.join(f"{column} IS NOT NULL" for column in columns)
+    duplicates = bind.execute(sa.text(f"""
+        SELECT COUNT(*) FROM (
+            SELECT {column_list} FROM {table}
+            WHERE {not_null}
+            GROUP BY {column_list}
+            HAVING COUNT(*) > 1
+        ) duplicated
+    """)).scalar()
+    if duplicates:
+        raise RuntimeError(
+            f"{table} has {duplicates} duplicated ({column_list}) values; "
+            f"merge them before adding the unique index"
+        )
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+
+    for table, name, columns, unique in INDEXES:
+        if name in _existing_indexes(inspector, table):
+            continue
+
+        if unique:
+            if name in DEDUPLICATE:
+                _delete_duplicates(table, columns)
+            _check_no_duplicates(bind, table, columns)
+
+        op.create_index(name, table, list(columns), unique=unique)
+
+
+def downgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+
+    for table, name, _, _ in reversed(INDEXES):
+        if name in _existing_indexes(inspector, table):
+            op.drop_index(name, table_name=table)
@@ -0,0 +1,35 @@
+"""jobs.updated_at
+
+Maintained by MySQL on every change to the job row, so cached job data
+(e.g. the parsed required skills) can be revalidated by comparing one
+timestamp instead of re-reading and re-parsing the row.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 09:30:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+
+    columns = [column['name'] for column in inspector.get_columns('jobs')]
+    if 'updated_at' not in columns:
+        op.execute("""
+            ALTER TABLE jobs
+            ADD COLUMN updated_at TIMESTAMP NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+        """)
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE jobs DROP COLUMN updated_at")
@@ -0,0 +1,35 @@
+"""Skill vectors on job_applicants
+
+The resume's matched skills as a bitset over the skills taxonomy, plus the
+stamp of the taxonomy that produced it, so a job's applicants can be
+re-ranked against new requirements without re-reading their resumes.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 09:40:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+
+    columns = [column['name'] for column in inspector.get_columns('job_applicants')]
+    if 'skill_vector' not in columns:
+        op.execute("ALTER TABLE job_applicants ADD COLUMN skill_vector VARBINARY(64) NULL")
+    if 'skill_vector_stamp' not in columns:
+        op.execute("ALTER TABLE job_applicants ADD COLUMN skill_vector_stamp CHAR(12) NULL")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE job_applicants DROP COLUMN skill_vector_stamp")
+    op.execute("ALTER TABLE job_applicants DROP COLUMN skill_vector")
@@ -0,0 +1,46 @@
+"""Inverted skill index
+
+applicant_skills holds one row per (skill, applicant); its primary key keeps
+each skill's applicant ids sorted, so a posting list is one index range
+scan. applicants.skills_indexed_at lets workers pick up re-indexed
+applicants incrementally.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 09:50:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS applicant_skills (
+            skill VARCHAR(64) NOT NULL,
+            applicant_id INT NOT NULL,
+            PRIMARY KEY (skill, applicant_id),
+            INDEX idx_applicant_skills_applicant (applicant_id),
+            FOREIGN KEY (applicant_id) REFERENCES applicants (id) ON DELETE CASCADE
+        )
+    """)
+
+    columns = [column['name'] for column in inspector.get_columns('applicants')]
+    if 'skills_indexed_at' not in columns:
+        op.execute("ALTER TABLE applicants ADD COLUMN skills_indexed_at DATETIME(6) NULL")
+        op.execute("CREATE INDEX idx_applicants_skills_indexed ON applicants (skills_indexed_at)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX idx_applicants_skills_indexed ON applicants")
+    op.execute("ALTER TABLE applicants DROP COLUMN skills_indexed_at")
+    op.execute("DROP TABLE IF EXISTS applicant_skills")
@@ -0,0 +1,34 @@
+"""Resume text vectors on job_applicants
+
+Hashed term-frequency vector of the screened resume, plus the stamp of the
+vectorizer settings that produced it, for per-job similarity ranking.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 10:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+
+    columns = [column['name'] for column in inspector.get_columns('job_applicants')]
+    if 'text_vector' not in columns:
+        op.execute("ALTER TABLE job_applicants ADD COLUMN text_vector MEDIUMBLOB NULL")
+    if 'text_vector_stamp' not in columns:
+        op.execute("ALTER TABLE job_applicants ADD COLUMN text_vector_stamp VARCHAR(32) NULL")
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE job_applicants DROP COLUMN text_vector_stamp")
+    op.execute("ALTER TABLE job_applicants DROP COLUMN text_vector")
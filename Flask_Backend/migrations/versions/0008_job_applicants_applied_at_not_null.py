@@ -0,0 +1,37 @@
+"""job_applicants.applied_at NOT NULL
+
+Backfills applications recorded without a date from the applicant's
+created_at (or now), then makes the column NOT NULL. Sorting a job's
+applicants can then order and compare on the raw column and use
+idx_job_applicants_job_applied instead of a COALESCE over every row.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 10:30:00
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        UPDATE job_applicants ja
+        JOIN applicants a ON a.id = ja.applicant_id
+        SET ja.applied_at = COALESCE(a.created_at, CURRENT_TIMESTAMP)
+        WHERE ja.applied_at IS NULL
+    """)
+    op.execute("""
+        ALTER TABLE job_applicants
+        MODIFY applied_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+    """)
+
+
+def downgrade() -> None:
+    op.execute("ALTER TABLE job_applicants MODIFY applied_at DATETIME NULL")
@@ -0,0 +1,646 @@
+"""
+pdf_backends.py - Registry of PDF text extraction backends
+
+Backends are probed once at import. On first use they are benchmarked
+against a small generated two-column, multi-page PDF and ranked by quality,
+keeping the default order among equals, so processes that never extract
+(such as spawned pool workers) don't pay for it. Each document is sent to
+the best backend; the next ones are only tried under an explicit fallback
+policy, and every attempt is recorded in a per-backend latency histogram.
+Long documents are split across a bounded process pool page by page, and a
+page/character budget bounds how much is read when only the first part of
+a document is needed.
+"""
+
+import os
+import time
+import logging
+import tempfile
+import threading
+import multiprocessing
+from io import BytesIO
+from contextlib import closing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+logger = logging.getLogger(__name__)
+
+# Minimum stripped length for a backend result to count as a success
+MIN_TEXT_LENGTH = 10
+
+# The raw byte decode only counts when it recovers a meaningful amount of text
+MIN_BINARY_TEXT_LENGTH = 100
+
+# The benchmark PDF, laid out like a resume: pages of two text columns, each a
+# list of lines. Quality is the fraction of lines recovered with their words
+# in order, so backends that drop pages or interleave columns score lower.
+BENCHMARK_PAGES = [
+    [
+        ["Senior software engineer", "Python and Django services", "PostgreSQL query tuning"],
+        ["Skills and tools", "Docker Kubernetes Terraform", "Continuous integration pipelines"],
+    ],
+    [
+        ["Frontend development", "JavaScript React TypeScript", "Accessible component libraries"],
+        ["Education", "Algorithms and data structures", "Distributed systems coursework"],
+    ],
+]
+
+# Upper bounds of the latency histogram buckets, in milliseconds
+LATENCY_BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+
+class LatencyHistogram:
+    """Thread-safe fixed-bucket latency histogram with success/failure counts"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.buckets = list(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.successes = 0
+        self.failures = 0
+        self.total_ms = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, elapsed_ms, success):
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if elapsed_ms <= bound:
+                index = i
+                break
+
+        with self._lock:
+            self.counts[index] += 1
+            self.total_ms += elapsed_ms
+            if success:
+                self.successes += 1
+            else:
+                self.failures += 1
+
+    def snapshot(self):
+        with self._lock:
+            calls = self.successes + self.failures
+            labels = [f"<={bound}ms" for bound in self.buckets] + [f">{self.buckets[-1]}ms"]
+            return {
+                "calls": calls,
+                "successes": self.successes,
+                "failures": self.failures,
+                "mean_ms": round(self.total_ms / calls, 2) if calls else 0,
+                "buckets": dict(zip(labels, self.counts))
+            }
+
+
+class PdfBackend:
+    """
+    Base class for a PDF extraction backend.
+
+    Subclasses implement `probe()` (import the library, return its version or
+    raise ImportError), `iter_page_texts(stream, start, stop)` and, when pages
+    can be extracted independently, `page_count(stream)`.
+    """
+
+    name = None
+    min_text_length = MIN_TEXT_LENGTH
+    supports_page_ranges = False
+
+    def __init__(self):
+        self.version = None
+        self.histogram = LatencyHistogram()
+        self.benchmark = None
+
+    def probe(self):
+        raise NotImplementedError
+
+    def iter_page_texts(self, stream, start=0, stop=None):
+        raise NotImplementedError
+
+    def page_count(self, stream):
+        raise NotImplementedError
+
+    def extract(self, stream):
+        return "\n".join(self.iter_page_texts(stream))
+
+
+class PdfPlumberBackend(PdfBackend):
+    name = "pdfplumber"
+    supports_page_ranges = True
+
+    def probe(self):
+        import pdfplumber
+        self._pdfplumber = pdfplumber
+        return getattr(pdfplumber, "__version__", "unknown")
+
+    def iter_page_texts(self, stream, start=0, stop=None):
+        with self._pdfplumber.open(stream) as pdf:
+            for page in pdf.pages[start:stop]:
+                yield page.extract_text() or ""
+
+    def page_count(self, stream):
+        with self._pdfplumber.open(stream) as pdf:
+            return len(pdf.pages)
+
+
+class PdfToTextBackend(PdfBackend):
+    name = "pdftotext"
+
+    def probe(self):
+        import pdftotext
+        self._pdftotext = pdftotext
+        return getattr(pdftotext, "__version__", "unknown")
+
+    def iter_page_texts(self, stream, start=0, stop=None):
+        # pdftotext converts the whole document up front, so page ranges only slice the result
+        pages = self._pdftotext.PDF(stream)
+        for index in range(start, len(pages) if stop is None else min(stop, len(pages))):
+            yield pages[index] or ""
+
+
+class PyPDF2Backend(PdfBackend):
+    name = "PyPDF2"
+    supports_page_ranges = True
+
+    def probe(self):
+        import PyPDF2
+        try:
+            from PyPDF2 import PdfReader
+            self._reader_class = PdfReader
+        except ImportError:
+            from PyPDF2 import PdfFileReader
+            self._reader_class = PdfFileReader
+            self.name = "PyPDF2-Legacy"
+        return getattr(PyPDF2, "__version__", "unknown")
+
+    def iter_page_texts(self, stream, start=0, stop=None):
+        reader = self._reader_class(stream)
+        total = len(reader.pages)
+        for index in range(start, total if stop is None else min(stop, total)):
+            yield reader.pages[index].extract_text() or ""
+
+    def page_count(self, stream):
+        return len(self._reader_class(stream).pages)
+
+
+class BinaryDecodeBackend(PdfBackend):
+    """Last resort: decode the raw bytes and hope the text streams are uncompressed"""
+
+    name = "binary"
+    min_text_length = MIN_BINARY_TEXT_LENGTH
+
+    def probe(self):
+        return "builtin"
+
+    def iter_page_texts(self, stream, start=0, stop=None):
+        yield stream.read().decode('utf-8', errors='ignore')
+
+
+# Candidate backends in their default order, used when benchmarking is disabled
+DEFAULT_BACKENDS = [PdfPlumberBackend, PdfToTextBackend, PyPDF2Backend]
+
+
+class FallbackPolicy:
+    """
+    How far extraction may fall back after the best backend fails.
+
+    `max_backends` caps how many library backends are tried per document and
+    `latency_budget` (seconds) stops further attempts once it has been spent.
+    The raw byte decode is cheap and stays available as a final step.
+    """
+
+    def __init__(self, max_backends=2, latency_budget=5.0, binary_fallback=True):
+        self.max_backends = max_backends
+        self.latency_budget = latency_budget
+        self.binary_fallback = binary_fallback
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            max_backends=int(os.getenv('PDF_FALLBACK_MAX_BACKENDS', 2)),
+            latency_budget=float(os.getenv('PDF_FALLBACK_BUDGET_SECONDS', 5.0)),
+            binary_fallback=os.getenv('PDF_FALLBACK_BINARY', '1') != '0'
+        )
+
+
+class ExtractionBudget:
+    """
+    Per-call limit on how much of a document is read.
+
+    Pages are streamed lazily and reading stops before the next page once
+    `max_pages` or `max_chars` is reached (0 means unlimited), or once the
+    optional `scanner` (see skill_matcher.SkillScanner) reports saturation.
+    After extraction, `truncated` tells whether content was left unread.
+    """
+
+    def __init__(self, max_pages=0, max_chars=0, scanner=None):
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+        self.scanner = scanner
+        self.reset()
+
+    def reset(self):
+        self.pages_read = 0
+        self.chars_read = 0
+        self.truncated = False
+        self.truncated_reason = None
+        if self.scanner is not None:
+            self.scanner.reset()
+
+    def stamp(self):
+        """Identifies the budget settings, used to version cached extraction output"""
+        saturation = self.scanner.saturation_count if self.scanner is not None else 0
+        return f"p{self.max_pages}-c{self.max_chars}-s{saturation}"
+
+    def exhausted_reason(self):
+        if self.max_pages and self.pages_read >= self.max_pages:
+            return "page_budget"
+        if self.max_chars and self.chars_read >= self.max_chars:
+            return "char_budget"
+        if self.scanner is not None and self.scanner.saturated:
+            return "skills_saturated"
+        return None
+
+    def read(self, page_texts, page_count=None):
+        """
+        Consumes pages from an iterator until the budget runs out and joins them.
+
+        The budget is checked before each page is pulled, so no page is
+        extracted beyond it. When it runs out, `page_count` (a callable
+        returning the document's page count) tells whether pages were left;
+        without one, the next page is pulled to find out.
+        """
+        parts = []
+
+        with closing(iter(page_texts)) as pages:
+            while True:
+                reason = self.exhausted_reason()
+                if reason:
+                    if page_count is not None:
+                        more = page_count() > self.pages_read
+                    else:
+                        more = next(pages, None) is not None
+                    if more:
+                        # There was more content than the budget allows
+                        self.truncated = True
+                        self.truncated_reason = reason
+                    break
+
+                page_text = next(pages, None)
+                if page_text is None:
+                    break
+
+                parts.append(page_text)
+                self.pages_read += 1
+                self.chars_read += len(page_text) + 1
+                if self.scanner is not None:
+                    self.scanner.feed(page_text)
+
+        text = "\n".join(parts)
+        if self.max_chars and len(text) > self.max_chars:
+            text = text[:self.max_chars]
+            self.truncated = True
+            self.truncated_reason = self.truncated_reason or "char_budget"
+        return text
+
+    def summary(self):
+        return {
+            "truncated": self.truncated,
+            "truncated_reason": self.truncated_reason,
+            "pages_read": self.pages_read,
+            "chars_read": self.chars_read
+        }
+
+    def restore(self, summary):
+        """Re-applies the summary of an earlier (cached) extraction"""
+        self.truncated = bool(summary.get("truncated", False))
+        self.truncated_reason = summary.get("truncated_reason")
+        self.pages_read = summary.get("pages_read", 0)
+        self.chars_read = summary.get("chars_read", 0)
+
+
+def _extract_page_range(backend_class, path, start, stop):
+    """Process pool worker: extracts pages [start, stop) of the PDF at `path` with a freshly probed backend"""
+    backend = backend_class()
+    backend.probe()
+    with open(path, 'rb') as f:
+        return list(backend.iter_page_texts(f, start, stop))
+
+
+class ParallelPageExtractor:
+    """
+    Splits long PDFs into page ranges extracted on a bounded process pool.
+
+    Documents with fewer than `page_threshold` pages are left to the caller's
+    serial path. Pool processes are spawned rather than forked, so they don't
+    inherit the web worker's threads, locks or connections. The document is
+    written to a temporary file once and each chunk task only carries its
+    path, not the PDF bytes.
+    """
+
+    def __init__(self, page_threshold=20, max_workers=2):
+        self.page_threshold = page_threshold
+        self.max_workers = max_workers
+        self._pool = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        """Returns None when parallel extraction is disabled (threshold <= 0)"""
+        page_threshold = int(os.getenv('PDF_PARALLEL_PAGE_THRESHOLD', 20))
+        if page_threshold <= 0:
+            return None
+        return cls(
+            page_threshold=page_threshold,
+            max_workers=int(os.getenv('PDF_PARALLEL_WORKERS', min(4, os.cpu_count() or 1)))
+        )
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._pool
+
+    def _reset_pool(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False)
+                self._pool = None
+
+    def should_parallelize(self, page_count):
+        return self.max_workers > 1 and page_count >= self.page_threshold
+
+    def extract(self, backend, data, page_count, budget=None):
+        """
+        Extracts the pages of `data` in parallel and reassembles them in order.
+
+        With a `budget`, only its first `max_pages` pages are split up and
+        each chunk's pages go through the budget as the chunk completes;
+        once it runs out, chunks that haven't started are cancelled.
+        """
+        stop = page_count
+        if budget is not None and budget.max_pages:
+            stop = min(page_count, budget.max_pages)
+        chunk_size = -(-stop // self.max_workers)
+        ranges = [(start, min(start + chunk_size, stop)) for start in range(0, stop, chunk_size)]
+
+        with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as f:
+            f.write(data)
+            path = f.name
+
+        futures = []
+        try:
+            pool = self._get_pool()
+            futures = [
+                pool.submit(_extract_page_range, type(backend), path, start, stop)
+                for start, stop in ranges
+            ]
+            if budget is None:
+                text = "\n".join(self._iter_pages(futures))
+            else:
+                text = budget.read(self._iter_pages(futures), lambda: page_count)
+        except BrokenProcessPool:
+            # A crashed worker poisons the pool; start a fresh one next time
+            self._reset_pool()
+            raise
+        finally:
+            for future in futures:
+                future.cancel()
+            os.unlink(path)
+
+        logger.info(f"Extracted {page_count} pages with {backend.name} across {len(ranges)} processes")
+        return text
+
+    @staticmethod
+    def _iter_pages(futures):
+        for future in futures:
+            yield from future.result()
+
+    def shutdown(self):
+        self._reset_pool()
+
+
+def _pdf_string(text):
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def build_sample_pdf(pages, column_x=(72, 324), top=720, leading=16):
+    """
+    Builds a minimal PDF with one page per entry of `pages`, each a list of
+    columns of text lines, used for benchmarking.
+    """
+    page_count = len(pages)
+    # Objects: catalog, page tree, font, then a (page, content stream) pair per page
+    kids = " ".join(f"{4 + 2 * index} 0 R" for index in range(page_count))
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{kids}] /Count {page_count} >>".encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for index, columns in enumerate(pages):
+        content = " ".join(
+            f"BT /F1 11 Tf {leading} TL {x} {top} Td "
+            + " ".join(f"({_pdf_string(line)}) '" for line in lines)
+            + " ET"
+            for x, lines in zip(column_x, columns)
+        ).encode('latin-1')
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * index} 0 R >>".encode()
+        )
+        objects.append(b"<< /Length " + str(len(content)).encode() + b" >>\nstream\n" + content + b"\nendstream")
+
+    output = BytesIO()
+    output.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(output.tell())
+        output.write(f"{number} 0 obj\n".encode() + body + b"\nendobj\n")
+
+    xref_offset = output.tell()
+    output.write(f"xref\n0 {len(objects) + 1}\n".encode())
+    output.write(b"0000000000 65535 f \n")
+    for offset in offsets:
+        output.write(f"{offset:010d} 00000 n \n".encode())
+    output.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode())
+    return output.getvalue()
+
+
+def benchmark_quality(text, pages=BENCHMARK_PAGES):
+    """Fraction of the sample's lines found in `text` with their words in order"""
+    normalized = " ".join((text or "").lower().split())
+    lines = [line.lower() for columns in pages for column in columns for line in column]
+    return sum(1 for line in lines if line in normalized) / len(lines)
+
+
+class PdfExtractorRegistry:
+    """Probes, ranks and dispatches to the available PDF backends"""
+
+    def __init__(self, backend_classes=DEFAULT_BACKENDS, policy=None, benchmark=True, parallel=None):
+        self.policy = policy or FallbackPolicy()
+        self.parallel = parallel
+        self._backends = []
+        self._lock = threading.Lock()
+
+        for backend_class in backend_classes:
+            backend = backend_class()
+            try:
+                backend.version = backend.probe()
+                self._backends.append(backend)
+                logger.info(f"PDF backend available: {backend.name} {backend.version}")
+            except ImportError:
+                logger.info(f"PDF backend not installed: {backend.name}")
+            except Exception as e:
+                logger.warning(f"PDF backend {backend.name} failed to load: {str(e)}")
+
+        # Benchmarked on first use rather than in every importing process
+        self._ranked = not (benchmark and len(self._backends) > 1)
+
+        self.binary_backend = BinaryDecodeBackend()
+        self.binary_backend.version = self.binary_backend.probe()
+
+        if not self._backends:
+            logger.warning("No PDF processing libraries available. PDF parsing will be limited.")
+
+    @property
+    def backends(self):
+        """The available backends, best first"""
+        if not self._ranked:
+            with self._lock:
+                if not self._ranked:
+                    self._rank_by_benchmark()
+                    self._ranked = True
+                    logger.info(f"PDF backend ranking: {', '.join(b.name for b in self._backends)}")
+        return self._backends
+
+    def _rank_by_benchmark(self, rounds=3):
+        sample = build_sample_pdf(BENCHMARK_PAGES)
+
+        for backend in self._backends:
+            try:
+                started = time.perf_counter()
+                for _ in range(rounds):
+                    text = backend.extract(BytesIO(sample))
+                elapsed_ms = (time.perf_counter() - started) * 1000 / rounds
+
+                backend.benchmark = {
+                    "quality": round(benchmark_quality(text), 2),
+                    "latency_ms": round(elapsed_ms, 2)
+                }
+            except Exception as e:
+                logger.warning(f"PDF backend {backend.name} failed benchmark: {str(e)}")
+                backend.benchmark = {"quality": 0.0, "latency_ms": None}
+
+        # Best quality first; the sort is stable, so backends of equal quality
+        # keep the default order. Latency is recorded but doesn't reorder them.
+        self._backends.sort(key=lambda b: -b.benchmark["quality"])
+
+    @property
+    def primary_name(self):
+        return self.backends[0].name if self.backends else None
+
+    def version_stamp(self):
+        """Identifies the backend chain, used to version cached extraction output"""
+        return ",".join(f"{b.name}-{b.version}" for b in self.backends) or "binary"
+
+    def _extract_with(self, backend, data, budget=None):
+        if budget is not None:
+            budget.reset()
+
+        page_count = None
+        if self.parallel is not None and backend.supports_page_ranges:
+            page_count = backend.page_count(BytesIO(data))
+            pages_wanted = page_count
+            if budget is not None and budget.max_pages:
+                pages_wanted = min(page_count, budget.max_pages)
+            if self.parallel.should_parallelize(pages_wanted):
+                return self.parallel.extract(backend, data, page_count, budget)
+
+        if budget is not None:
+            # Short budgeted reads stream pages serially
+            if page_count is not None:
+                known_count = page_count
+                page_count = lambda: known_count
+            elif backend.supports_page_ranges:
+                # Counting pages is cheaper than extracting one more
+                page_count = lambda: backend.page_count(BytesIO(data))
+            return budget.read(backend.iter_page_texts(BytesIO(data)), page_count)
+
+        return backend.extract(BytesIO(data))
+
+    def _attempt(self, backend, data, budget=None):
+        started = time.perf_counter()
+        text = None
+        error = None
+
+        try:
+            text = self._extract_with(backend, data, budget)
+        except Exception as e:
+            error = str(e)
+
+        elapsed = time.perf_counter() - started
+        success = bool(text) and len(text.strip()) > backend.min_text_length
+        backend.histogram.record(elapsed * 1000, success)
+
+        if error:
+            logger.warning(f"{backend.name} extraction failed: {error}")
+        elif not success:
+            logger.warning(f"{backend.name} extracted empty or very short text")
+
+        return (text if success else None), elapsed
+
+    def extract(self, data, budget=None):
+        """
+        Extracts text from PDF bytes. Returns None when every permitted
+        backend failed; the file is never re-read between attempts.
+        With an ExtractionBudget, pages are read lazily until it runs out.
+        """
+        spent = 0.0
+
+        for attempt, backend in enumerate(self.backends):
+            if attempt >= self.policy.max_backends:
+                logger.info(f"Fallback policy: not trying more than {self.policy.max_backends} backends")
+                break
+            if attempt > 0 and spent >= self.policy.latency_budget:
+                logger.info(f"Fallback policy: latency budget of {self.policy.latency_budget}s spent")
+                break
+
+            text, elapsed = self._attempt(backend, data, budget)
+            spent += elapsed
+            if text is not None:
+                logger.info(f"Successfully extracted {len(text)} chars with {backend.name}")
+                return text
+
+        if self.policy.binary_fallback:
+            text, _ = self._attempt(self.binary_backend, data, budget)
+            if text is not None:
+                logger.info(f"Successfully extracted {len(text)} chars with binary fallback")
+                return text
+
+        return None
+
+    def extract_file(self, filepath, budget=None):
+        with open(filepath, 'rb') as f:
+            return self.extract(f.read(), budget)
+
+    def stats(self):
+        backends = []
+        for backend in self.backends + [self.binary_backend]:
+            backends.append({
+                "name": backend.name,
+                "version": backend.version,
+                "benchmark": backend.benchmark,
+                "latency": backend.histogram.snapshot()
+            })
+
+        return {
+            "ranking": [b.name for b in self.backends],
+            "policy": {
+                "max_backends": self.policy.max_backends,
+                "latency_budget": self.policy.latency_budget,
+                "binary_fallback": self.policy.binary_fallback
+            },
+            "parallel": {
+                "page_threshold": self.parallel.page_threshold,
+                "max_workers": self.parallel.max_workers
+            } if self.parallel is not None else None,
+            "backends": backends
+        }
@@ -0,0 +1,195 @@
+"""
+requirement_profile.py - Compiled job requirements for fast candidate scoring
+
+A RequirementProfile turns a job's required skills into bitmasks over the
+skills taxonomy, so checking a candidate is a mask AND plus a popcount
+instead of list membership tests. Required skills outside the taxonomy get
+no bit; they are checked by name on a separate, slower path. Skills can
+carry weights, and must-have skills fail a candidate regardless of
+coverage. Profiles are immutable and meant to be compiled once per job and
+shared.
+"""
+
+from functools import lru_cache
+from skills_taxonomy import ALL_CS_SKILLS
+
+
+class SkillVocabulary:
+    """
+    Assigns each skill of a fixed list a bit position.
+
+    The list is frozen at construction, so the vocabulary can't grow with
+    whatever skills job requirements happen to name.
+    """
+
+    def __init__(self, skills):
+        self._skills = tuple(skill.lower() for skill in skills)
+        self._bits = {skill: bit for bit, skill in enumerate(self._skills)}
+
+    def __len__(self):
+        return len(self._skills)
+
+    def bit(self, skill):
+        """Bit position of a (lowercased) skill, or None if it isn't in the vocabulary"""
+        return self._bits.get(skill)
+
+    def mask(self, skills):
+        """Bitmask of the known skills in `skills`; unknown ones are ignored"""
+        mask = 0
+        bits = self._bits
+        for skill in skills:
+            bit = bits.get(skill)
+            if bit is None:
+                bit = bits.get(str(skill).strip().lower())
+            if bit is not None:
+                mask |= 1 << bit
+        return mask
+
+
+SKILL_VOCABULARY = SkillVocabulary(ALL_CS_SKILLS)
+
+
+def _popcount(mask):
+    return bin(mask).count('1')
+
+
+class RequirementProfile:
+    """
+    A job's required skills compiled to bitmasks.
+
+    `weights` maps skills to their weight (default 1) and `must_have` lists
+    skills a candidate cannot pass without. evaluate() returns the same
+    passes/match_percentage/matched_required/missing_required dict that
+    check_job_requirements always has; score() returns just the first two.
+    """
+
+    def __init__(self, skills, weights=None, must_have=None, min_match_percentage=60,
+                 vocabulary=SKILL_VOCABULARY):
+        self.vocabulary = vocabulary
+        self.min_match_percentage = min_match_percentage
+
+        weights = {skill.lower(): float(weight) for skill, weight in (weights or {}).items()}
+        must_have_skills = [skill.lower() for skill in must_have or ()]
+        must_have = set(must_have_skills)
+
+        # Results list skills in the job's order. Must-have skills are requirements
+        # even if the skill list left them out; they follow it. Bit positions come
+        # from the vocabulary, so the masks don't depend on this order.
+        self.skills = tuple(dict.fromkeys([skill.lower() for skill in skills] + must_have_skills))
+        self._skill_weights = {skill: weights.get(skill, 1.0) for skill in self.skills}
+
+        # (bit, skill) per requirement; skills outside the vocabulary have bit 0
+        self._entries = []
+        self._weights = {}
+        self.required_mask = 0
+        self.must_have_mask = 0
+        self._unknown = {}
+        for skill in self.skills:
+            bit = vocabulary.bit(skill)
+            if bit is None:
+                self._entries.append((0, skill))
+                self._unknown[skill] = self._skill_weights[skill]
+                continue
+            bit = 1 << bit
+            self._entries.append((bit, skill))
+            self._weights[bit] = self._skill_weights[skill]
+            self.required_mask |= bit
+            if skill in must_have:
+                self.must_have_mask |= bit
+        self._unknown_must_have = frozenset(must_have & set(self._unknown))
+
+        # Uniform weights reduce coverage to a popcount
+        self._uniform = len(set(self._skill_weights.values())) <= 1
+        self.total_weight = sum(self._skill_weights.values())
+
+    def __len__(self):
+        return len(self.skills)
+
+    def __iter__(self):
+        return iter(self.skills)
+
+    def weighted_skills(self):
+        """(skill, weight, must_have) for every requirement, in the job's order"""
+        return [
+            (skill, self._skill_weights[skill], bool(bit & self.must_have_mask) or skill in self._unknown_must_have)
+            for bit, skill in self._entries
+        ]
+
+    def mask(self, matched_skills):
+        """Compiles a candidate's matched skills once, for repeated scoring"""
+        if isinstance(matched_skills, int):
+            return matched_skills
+        return self.vocabulary.mask(matched_skills)
+
+    def _unknown_matched(self, matched):
+        """
+        The required skills outside the vocabulary that `matched` names. A
+        precompiled mask can't name them, so it matches none.
+        """
+        if not self._unknown or isinstance(matched, int):
+            return frozenset()
+        names = {str(skill).strip().lower() for skill in matched}
+        return frozenset(skill for skill in self._unknown if skill in names)
+
+    def _percentage(self, covered, unknown_matched):
+        if not self.total_weight:
+            return 0.0
+        if self._uniform:
+            return (_popcount(covered) + len(unknown_matched)) / len(self.skills) * 100
+
+        weight = sum(self._unknown[skill] for skill in unknown_matched)
+        while covered:
+            bit = covered & -covered
+            weight += self._weights[bit]
+            covered ^= bit
+        return weight / self.total_weight * 100
+
+    def _score(self, mask, unknown_matched, min_match_percentage):
+        if min_match_percentage is None:
+            min_match_percentage = self.min_match_percentage
+
+        covered = mask & self.required_mask
+        percentage = self._percentage(covered, unknown_matched)
+        passes = (
+            percentage >= min_match_percentage
+            and covered & self.must_have_mask == self.must_have_mask
+            and self._unknown_must_have <= unknown_matched
+        )
+        return passes, percentage
+
+    def score(self, matched, min_match_percentage=None):
+        """(passes, match_percentage) for a candidate's skills or skill mask"""
+        return self._score(self.mask(matched), self._unknown_matched(matched), min_match_percentage)
+
+    def evaluate(self, matched, min_match_percentage=None):
+        if not isinstance(matched, int):
+            matched = list(matched)
+        unknown_matched = self._unknown_matched(matched)
+        mask = self.mask(matched)
+        passes, percentage = self._score(mask, unknown_matched, min_match_percentage)
+        covered = mask & self.required_mask
+
+        def is_covered(bit, skill):
+            return bool(covered & bit) if bit else skill in unknown_matched
+
+        return {
+            "passes": passes,
+            "match_percentage": round(percentage, 2),
+            "matched_required": [skill for bit, skill in self._entries if is_covered(bit, skill)],
+            "missing_required": [skill for bit, skill in self._entries if not is_covered(bit, skill)]
+        }
+
+
+@lru_cache(maxsize=256)
+def _compile(skills, weights, must_have, min_match_percentage):
+    return RequirementProfile(skills, dict(weights), must_have, min_match_percentage)
+
+
+def compile_profile(skills, weights=None, must_have=None, min_match_percentage=60):
+    """Memoized RequirementProfile for the given requirements, keyed by their order too"""
+    return _compile(
+        tuple(skills),
+        frozenset((weights or {}).items()),
+        tuple(must_have or ()),
+        min_match_percentage
+    )
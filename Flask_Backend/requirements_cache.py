@@ -0,0 +1,182 @@
+"""
+requirements_cache.py - Per-job cache of parsed required skills
+
+jobs.required_skills is stored as JSON, a comma-separated string or a list
+depending on who wrote it. Screening used to read and re-parse it for every
+application; this cache keeps each job's requirements compiled into a
+RequirementProfile (lowercased skills, weights, must-haves) so a warm worker
+screens without touching the database.
+
+Entries are dropped by invalidate() from the job write paths. Other worker
+processes don't see that call, so entries are revalidated after `ttl`
+seconds by comparing jobs.updated_at; the stored text is only re-parsed when
+the row actually changed.
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from database import get_db_connection, SCHEMA
+from requirement_profile import compile_profile
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize(skills):
+    """Lowercased skills in their original order, without blanks or duplicates"""
+    return tuple(dict.fromkeys(str(skill).strip().lower() for skill in skills if skill and str(skill).strip()))
+
+
+def parse_requirements(skills_data):
+    """
+    Compiles a jobs.required_skills value into a RequirementProfile.
+
+    A JSON object may carry "skills", "must_have" and "weights"
+    ({skill: weight}); any other object is read as {name: skill}.
+    """
+    if isinstance(skills_data, (bytes, bytearray)):
+        skills_data = skills_data.decode('utf-8', errors='ignore')
+
+    if isinstance(skills_data, str) and skills_data.strip().startswith('{'):
+        try:
+            skills_data = json.loads(skills_data)
+        except json.JSONDecodeError:
+            pass
+
+    weights = {}
+    must_have = ()
+    if isinstance(skills_data, dict) and ('must_have' in skills_data or 'weights' in skills_data):
+        must_have = _normalize(skills_data.get('must_have') or [])
+        weights = {
+            str(skill).strip().lower(): float(weight)
+            for skill, weight in (skills_data.get('weights') or {}).items()
+        }
+        skills_data = {'skills': skills_data.get('skills') or list(weights)}
+
+    return compile_profile(parse_required_skills(skills_data), weights, must_have)
+
+
+def parse_required_skills(skills_data):
+    """
+    Normalizes a jobs.required_skills value into a tuple of lowercased skills
+    in the job's order. Accepts a JSON object ({"skills": [...]} or
+    {name: skill}), a JSON list, a comma-separated string or a list; anything
+    else is empty.
+    """
+    if not skills_data:
+        return ()
+
+    if isinstance(skills_data, (bytes, bytearray)):
+        skills_data = skills_data.decode('utf-8', errors='ignore')
+
+    if isinstance(skills_data, str):
+        stripped = skills_data.strip()
+        if stripped.startswith('{') or stripped.startswith('['):
+            try:
+                skills_data = json.loads(stripped)
+            except json.JSONDecodeError:
+                logger.warning("Failed to decode required skills JSON. Treating as comma-separated string.")
+                return _normalize(skills_data.split(','))
+        else:
+            return _normalize(skills_data.split(','))
+
+    if isinstance(skills_data, dict):
+        if 'skills' in skills_data:
+            return _normalize(skills_data['skills'] or [])
+        return _normalize(skills_data.values())
+
+    if isinstance(skills_data, (list, tuple, set, frozenset)):
+        return _normalize(skills_data)
+
+    logger.warning(f"Unexpected skills data format: {type(skills_data).__name__}")
+    return ()
+
+
+class RequiredSkillsCache:
+    """
+    job_id -> (updated_at, compiled profile) with time-based revalidation.
+
+    profile() returns the compiled RequirementProfile, which is immutable
+    and shared between callers.
+    """
+
+    def __init__(self, ttl=300):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._version = 0
+        self._entries = {}
+
+    @classmethod
+    def from_env(cls):
+        return cls(ttl=float(os.getenv('REQUIRED_SKILLS_CACHE_TTL', 300)))
+
+    def invalidate(self, job_id=None):
+        """Drops one job's entry, or every entry when job_id is None"""
+        with self._lock:
+            self._version += 1
+            if job_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(int(job_id), None)
+
+    def profile(self, job_id):
+        job_id = int(job_id)
+        entry = self._entries.get(job_id)
+        if entry and time.monotonic() - entry['checked_at'] < self.ttl:
+            with self._lock:
+                self.hits += 1
+            return entry['profile']
+
+        with self._lock:
+            self.misses += 1
+            version = self._version
+        row = self._load(job_id)
+        if row is None:
+            return compile_profile(())
+
+        updated_at, skills_data = row
+        if entry and updated_at is not None and entry['updated_at'] == updated_at:
+            # Unchanged since it was parsed; only the check time moves
+            profile = entry['profile']
+        else:
+            profile = parse_requirements(skills_data)
+
+        with self._lock:
+            # Don't store a value that an invalidate() raced past
+            if version == self._version:
+                self._entries[job_id] = {
+                    'updated_at': updated_at,
+                    'profile': profile,
+                    'checked_at': time.monotonic()
+                }
+        return profile
+
+    def _load(self, job_id):
+        """Returns (updated_at, required_skills) for the job, or None if it doesn't exist"""
+        # Databases that haven't run the jobs.updated_at migration always re-parse
+        updated_at = 'updated_at' if SCHEMA.has_column('jobs', 'updated_at') else 'NULL'
+
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute(f"SELECT {updated_at}, required_skills FROM jobs WHERE id = %s", (job_id,))
+            return cursor.fetchone()
+        finally:
+            cursor.close()
+            conn.close()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "ttl": self.ttl
+            }
+
+
+REQUIRED_SKILLS_CACHE = RequiredSkillsCache.from_env()
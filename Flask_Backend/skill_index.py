@@ -0,0 +1,301 @@
+"""
+skill_index.py - Inverted index from skills to the applicants who have them
+
+Postings live in the applicant_skills table (primary key (skill,
+applicant_id), so each posting list is stored sorted) and are mirrored in
+memory as sorted lists of applicant ids, together with each applicant's
+best match score. Queries combine posting lists with galloping
+intersection and return the top-k applicants by match score without
+touching the database.
+
+The mirror is loaded in full on first use and then refreshed incrementally
+from applicants.skills_indexed_at every `refresh_interval` seconds; a full
+reload every `reload_interval` seconds drops applicants that were deleted.
+"""
+
+import os
+import time
+import heapq
+import logging
+import threading
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta
+from database import get_db_connection
+from bulk_writer import replace_children
+
+logger = logging.getLogger(__name__)
+
+# Rows re-read on each refresh to cover transactions that committed late
+REFRESH_OVERLAP = timedelta(seconds=30)
+
+
+def gallop_intersect(small, large):
+    """
+    Intersection of two sorted id lists. Each id of the smaller list is found
+    in the larger one by exponential then binary search, starting from the
+    previous match, so the cost is O(len(small) * log(len(large) / len(small))).
+    """
+    if len(small) > len(large):
+        small, large = large, small
+
+    result = []
+    low = 0
+    size = len(large)
+    for value in small:
+        # Gallop forward until large[high] >= value
+        step = 1
+        high = low
+        while high < size and large[high] < value:
+            low = high + 1
+            high += step
+            step <<= 1
+        position = bisect_left(large, value, low, min(high + 1, size))
+        if position == size:
+            break
+        if large[position] == value:
+            result.append(value)
+            position += 1
+        low = position
+    return result
+
+
+def intersect_all(lists):
+    """Intersects sorted id lists, smallest first so the working set only shrinks"""
+    if not lists:
+        return []
+
+    lists = sorted(lists, key=len)
+    result = lists[0]
+    for postings in lists[1:]:
+        if not result:
+            break
+        result = gallop_intersect(result, postings)
+    return list(result)
+
+
+def union_all(lists):
+    """Union of sorted id lists, sorted"""
+    result = set()
+    for postings in lists:
+        result.update(postings)
+    return sorted(result)
+
+
+def subtract(ids, excluded):
+    """Sorted `ids` without any id in the sorted `excluded` list"""
+    if not excluded:
+        return list(ids)
+    excluded = set(excluded)
+    return [value for value in ids if value not in excluded]
+
+
+def index_applicant_skills(cursor, applicant_id, skills):
+    """Replaces an applicant's postings with `skills`, in the caller's transaction"""
+    skills = sorted({str(skill).strip().lower()[:64] for skill in skills or () if str(skill).strip()})
+    replace_children(cursor, 'applicant_skills', 'applicant_id', applicant_id, ('skill',), [(skill,) for skill in skills])
+    cursor.execute("UPDATE applicants SET skills_indexed_at = %s WHERE id = %s", (datetime.now(), applicant_id))
+
+
+class SkillIndex:
+    """In-memory mirror of applicant_skills with skill queries and top-k ranking"""
+
+    def __init__(self, refresh_interval=10, reload_interval=3600):
+        self.refresh_interval = refresh_interval
+        self.reload_interval = reload_interval
+
+        self._lock = threading.Lock()
+        self._postings = {}
+        self._skills_by_applicant = {}
+        self._scores = {}
+        self._loaded_at = None
+        self._refreshed_at = None
+        self._checked_at = 0
+        self._reloaded_at = 0
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            refresh_interval=float(os.getenv('SKILL_INDEX_REFRESH_INTERVAL', 10)),
+            reload_interval=float(os.getenv('SKILL_INDEX_RELOAD_INTERVAL', 3600))
+        )
+
+    # -------------------------------------------------------------------------
+    # Loading
+    # -------------------------------------------------------------------------
+    def _ensure_fresh(self):
+        now = time.monotonic()
+        if self._loaded_at is not None and now - self._checked_at < self.refresh_interval:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            if self._loaded_at is not None and now - self._checked_at < self.refresh_interval:
+                return
+
+            if self._loaded_at is None or now - self._reloaded_at >= self.reload_interval:
+                self._reload()
+            else:
+                self._refresh()
+            self._checked_at = time.monotonic()
+
+    def _reload(self):
+        started = time.perf_counter()
+        loaded_at = datetime.now()
+
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        try:
+            # Primary key order: rows arrive grouped by skill with ids ascending
+            cursor.execute("SELECT skill, applicant_id FROM applicant_skills ORDER BY skill, applicant_id")
+            postings = {}
+            skills_by_applicant = {}
+            for skill, applicant_id in cursor.fetchall():
+                postings.setdefault(skill, []).append(applicant_id)
+                skills_by_applicant.setdefault(applicant_id, set()).add(skill)
+
+            cursor.execute("""
+                SELECT applicant_id, MAX(match_score) FROM job_applicants
+                GROUP BY applicant_id
+            """)
+            scores = {applicant_id: float(score) for applicant_id, score in cursor.fetchall() if score is not None}
+        finally:
+            cursor.close()
+            conn.close()
+
+        self._postings = postings
+        self._skills_by_applicant = skills_by_applicant
+        self._scores = scores
+        self._loaded_at = loaded_at
+        self._refreshed_at = loaded_at
+        self._reloaded_at = time.monotonic()
+
+        logger.info(
+            f"Loaded skill index: {len(postings)} skills, {len(skills_by_applicant)} applicants "
+            f"in {(time.perf_counter() - started) * 1000:.1f}ms"
+        )
+
+    def _refresh(self):
+        since = self._refreshed_at - REFRESH_OVERLAP
+        refreshed_at = datetime.now()
+
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("SELECT id FROM applicants WHERE skills_indexed_at >= %s", (since,))
+            applicant_ids = [row[0] for row in cursor.fetchall()]
+
+            skills = {applicant_id: set() for applicant_id in applicant_ids}
+            scores = {}
+            if applicant_ids:
+                placeholders = ', '.join(['%s'] * len(applicant_ids))
+                cursor.execute(
+                    f"SELECT applicant_id, skill FROM applicant_skills WHERE applicant_id IN ({placeholders})",
+                    applicant_ids
+                )
+                for applicant_id, skill in cursor.fetchall():
+                    skills[applicant_id].add(skill)
+
+                cursor.execute(f"""
+                    SELECT applicant_id, MAX(match_score) FROM job_applicants
+                    WHERE applicant_id IN ({placeholders})
+                    GROUP BY applicant_id
+                """, applicant_ids)
+                scores = {applicant_id: float(score) for applicant_id, score in cursor.fetchall() if score is not None}
+        finally:
+            cursor.close()
+            conn.close()
+
+        for applicant_id, applicant_skills in skills.items():
+            self._apply(applicant_id, applicant_skills, scores.get(applicant_id))
+        self._refreshed_at = refreshed_at
+
+    def _apply(self, applicant_id, skills, score):
+        """
+        Moves one applicant's postings to `skills`. The posting map and the
+        applicant map are copied, changed and swapped in, so concurrent
+        searches keep a consistent snapshot.
+        """
+        postings = dict(self._postings)
+        skills_by_applicant = dict(self._skills_by_applicant)
+        previous = skills_by_applicant.get(applicant_id, set())
+
+        for skill in previous - skills:
+            skill_postings = postings.get(skill, [])
+            position = bisect_left(skill_postings, applicant_id)
+            if position < len(skill_postings) and skill_postings[position] == applicant_id:
+                postings[skill] = skill_postings[:position] + skill_postings[position + 1:]
+
+        for skill in skills - previous:
+            skill_postings = list(postings.get(skill, []))
+            insort(skill_postings, applicant_id)
+            postings[skill] = skill_postings
+
+        if skills:
+            skills_by_applicant[applicant_id] = set(skills)
+        else:
+            skills_by_applicant.pop(applicant_id, None)
+
+        self._postings = postings
+        self._skills_by_applicant = skills_by_applicant
+        if score is not None:
+            self._scores[applicant_id] = float(score)
+
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+    def search(self, all_skills=(), any_skills=(), not_skills=(), limit=20, scores=None):
+        """
+        Applicants having every skill in `all_skills`, at least one of
+        `any_skills` (if given) and none of `not_skills`.
+
+        `scores` ({applicant_id: score}) restricts the search to those
+        applicants and ranks by their score, e.g. one job's match scores;
+        by default applicants are ranked by their best match score.
+        Returns (total, [(applicant_id, score)]) with the top `limit` first.
+        """
+        self._ensure_fresh()
+        postings = self._postings
+        skills_by_applicant = self._skills_by_applicant
+
+        positive = [postings.get(skill, []) for skill in all_skills]
+        if any_skills:
+            positive.append(union_all(postings.get(skill, []) for skill in any_skills))
+        if scores is not None:
+            positive.append(sorted(scores))
+
+        if positive:
+            matches = intersect_all(positive)
+        else:
+            # Only exclusions: start from everyone in the index
+            matches = sorted(skills_by_applicant)
+
+        if not_skills:
+            matches = subtract(matches, union_all(postings.get(skill, []) for skill in not_skills))
+
+        scores = self._scores if scores is None else scores
+
+        def rank(applicant_id):
+            # Unscored applicants go last; ties go to the earlier applicant
+            score = scores.get(applicant_id)
+            return (score if score is not None else -1, -applicant_id)
+
+        top = heapq.nlargest(limit, matches, key=rank)
+        return len(matches), [(applicant_id, scores.get(applicant_id)) for applicant_id in top]
+
+    def skills(self):
+        """Indexed skills with the number of applicants holding each"""
+        self._ensure_fresh()
+        return {skill: len(postings) for skill, postings in self._postings.items() if postings}
+
+    def stats(self):
+        postings = self._postings
+        return {
+            "skills": len(postings),
+            "applicants": len(self._skills_by_applicant),
+            "postings": sum(len(skill_postings) for skill_postings in postings.values()),
+            "loaded_at": self._loaded_at.isoformat() if self._loaded_at else None,
+            "refreshed_at": self._refreshed_at.isoformat() if self._refreshed_at else None
+        }
+
+
+SKILL_INDEX = SkillIndex.from_env()
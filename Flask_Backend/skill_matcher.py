@@ -0,0 +1,153 @@
+"""
+skill_matcher.py - Single-pass skill detection for resume screening
+
+Builds one Aho-Corasick automaton from the skills taxonomy and its synonyms so
+a resume is scanned once, no matter how many skills the taxonomy holds.
+Matches follow the same word-boundary rules as the regex r'\\b<skill>\\b'.
+"""
+
+import logging
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+def _is_word_char(ch):
+    # Same definition of a "word" character that re's \b uses for str patterns
+    return ch.isalnum() or ch == '_'
+
+
+def _has_boundary(text, index):
+    """Equivalent of a regex \\b assertion at position `index` of `text`."""
+    before = index > 0 and _is_word_char(text[index - 1])
+    after = index < len(text) and _is_word_char(text[index])
+    return before != after
+
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton over a list of canonical skills plus their synonyms.
+
+    Every pattern maps back to the index of its canonical skill, so results
+    are returned in taxonomy order regardless of where they appear in the text.
+    """
+
+    def __init__(self, skills, synonyms=None):
+        self.skills = list(skills)
+
+        # Trie stored as parallel lists: transitions, failure links and outputs.
+        # Outputs are (pattern_length, skill_index) tuples.
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+
+        pattern_count = 0
+        for i, skill in enumerate(self.skills):
+            self._add_pattern(skill.lower(), i)
+            pattern_count += 1
+
+            # Synonyms only count for skills that are part of the taxonomy
+            for synonym in (synonyms or {}).get(skill, []):
+                self._add_pattern(synonym.lower(), i)
+                pattern_count += 1
+
+        self._build_failure_links()
+        logger.info(f"Built skill matcher with {pattern_count} patterns and {len(self._goto)} states")
+
+    def _add_pattern(self, pattern, skill_index):
+        if not pattern:
+            return
+
+        state = 0
+        for ch in pattern:
+            next_state = self._goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[state][ch] = next_state
+            state = next_state
+
+        self._output[state].append((len(pattern), skill_index))
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self._goto[state].items():
+                queue.append(next_state)
+
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(ch, 0)
+
+                # Inherit the outputs of the longest proper suffix state
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def find_skill_indices(self, text):
+        """
+        Scans `text` once and returns the set of canonical skill indices that
+        occur as whole words. The text is expected to be lowercased already.
+        """
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        found = set()
+
+        state = 0
+        for position, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+
+            if not output[state]:
+                continue
+
+            end = position + 1
+            for length, skill_index in output[state]:
+                if skill_index in found:
+                    continue
+                start = end - length
+                if _has_boundary(text, start) and _has_boundary(text, end):
+                    found.add(skill_index)
+
+        return found
+
+    def find_skills(self, text):
+        """Returns the matched canonical skills in taxonomy order."""
+        return [self.skills[i] for i in sorted(self.find_skill_indices(text))]
+
+    def scanner(self, saturation_count):
+        """Returns an incremental scanner that reports saturation after `saturation_count` skills"""
+        return SkillScanner(self, saturation_count)
+
+
+class SkillScanner:
+    """
+    Feeds resume text to a SkillMatcher chunk by chunk (e.g. page by page).
+
+    Chunks are scanned independently, which is exact as long as they are
+    joined with a non-word separator such as a newline. `saturated` turns
+    True once enough distinct skills were seen that reading further text is
+    unlikely to change the screening outcome.
+    """
+
+    def __init__(self, matcher, saturation_count):
+        self.matcher = matcher
+        self.saturation_count = saturation_count
+        self.found = set()
+
+    @property
+    def saturated(self):
+        return bool(self.saturation_count) and len(self.found) >= self.saturation_count
+
+    def feed(self, text):
+        if text:
+            self.found |= self.matcher.find_skill_indices(text.lower())
+        return self.saturated
+
+    def reset(self):
+        self.found = set()
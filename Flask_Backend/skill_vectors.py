@@ -0,0 +1,169 @@
+"""
+skill_vectors.py - Matched skills stored as bitsets for bulk re-ranking
+
+Each application's matched skills are stored in job_applicants.skill_vector
+as a fixed-width little-endian bitset over the skills taxonomy (bit i is
+taxonomy skill i), together with a stamp of the taxonomy. When a job's
+requirements change, all of its applicants are re-scored from these
+vectors with column-wise NumPy operations instead of re-analysing resumes.
+Vectors written under a different taxonomy stamp are reported as unscored.
+
+NumPy is optional; without it the same scoring runs in pure Python.
+"""
+
+import hashlib
+import logging
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+logger = logging.getLogger(__name__)
+
+
+class SkillVectorCodec:
+    """Encodes skill lists as bitsets over a fixed, ordered skill vocabulary"""
+
+    def __init__(self, skills):
+        self.skills = [skill.lower() for skill in skills]
+        self.index = {skill: i for i, skill in enumerate(self.skills)}
+        self.width = (len(self.skills) + 7) // 8
+        self.stamp = hashlib.sha1('\n'.join(self.skills).encode('utf-8')).hexdigest()[:12]
+
+    def encode(self, skills):
+        mask = 0
+        for skill in skills or ():
+            i = self.index.get(str(skill).strip().lower())
+            if i is not None:
+                mask |= 1 << i
+        return mask.to_bytes(self.width, 'little')
+
+    def decode(self, vector):
+        mask = int.from_bytes(vector or b'', 'little')
+        return [skill for i, skill in enumerate(self.skills) if mask >> i & 1]
+
+    def columns(self, profile):
+        """
+        (byte, shift, weight, must_have) for each requirement of `profile` that
+        the vocabulary can represent, and the profile's total weight.
+        """
+        columns = []
+        total_weight = 0.0
+        for skill, weight, must_have in profile.weighted_skills():
+            total_weight += weight
+            i = self.index.get(skill)
+            if i is not None:
+                columns.append((i >> 3, i & 7, weight, must_have))
+            elif must_have:
+                # A must-have no resume can show fails everyone
+                columns.append((None, None, weight, must_have))
+        return columns, total_weight
+
+    def score(self, profile, vectors, min_match_percentage=None):
+        """
+        Scores every vector against `profile`. Returns (percentages, passes)
+        as NumPy arrays when NumPy is available, else as lists.
+        """
+        if min_match_percentage is None:
+            min_match_percentage = profile.min_match_percentage
+
+        columns, total_weight = self.columns(profile)
+        if np is None:
+            return self._score_python(vectors, columns, total_weight, min_match_percentage)
+
+        count = len(vectors)
+        matrix = np.frombuffer(
+            b''.join(vector.ljust(self.width, b'\0')[:self.width] for vector in vectors),
+            dtype=np.uint8
+        ).reshape(count, self.width)
+
+        weight = np.zeros(count, dtype=np.float64)
+        has_must_haves = np.ones(count, dtype=bool)
+        for byte, shift, skill_weight, must_have in columns:
+            if byte is None:
+                has_must_haves[:] = False
+                continue
+            present = (matrix[:, byte] >> shift) & 1
+            weight += present * skill_weight
+            if must_have:
+                has_must_haves &= present.astype(bool)
+
+        percentages = weight / total_weight * 100 if total_weight else np.zeros(count)
+        return percentages, (percentages >= min_match_percentage) & has_must_haves
+
+    def _score_python(self, vectors, columns, total_weight, min_match_percentage):
+        percentages = []
+        passes = []
+        for vector in vectors:
+            weight = 0.0
+            has_must_haves = True
+            for byte, shift, skill_weight, must_have in columns:
+                present = byte is not None and byte < len(vector) and vector[byte] >> shift & 1
+                if present:
+                    weight += skill_weight
+                elif must_have:
+                    has_must_haves = False
+            percentage = weight / total_weight * 100 if total_weight else 0.0
+            percentages.append(percentage)
+            passes.append(percentage >= min_match_percentage and has_must_haves)
+        return percentages, passes
+
+
+def store_skill_vector(cursor, codec, job_id, applicant_id, matched_skills):
+    """Saves an application's matched skills as a bitset"""
+    cursor.execute("""
+        UPDATE job_applicants SET skill_vector = %s, skill_vector_stamp = %s
+        WHERE job_id = %s AND applicant_id = %s
+    """, (codec.encode(matched_skills), codec.stamp, job_id, applicant_id))
+
+
+def rank_job_applicants(cursor, codec, job_id, profile, limit=None):
+    """
+    Re-scores every applicant of a job with a stored skill vector against
+    `profile`. Returns (ranked, unscored): ranked is a list of
+    {"applicant_id", "match_percentage", "passes"} best first, unscored the
+    number of applications without a vector from the current taxonomy.
+    """
+    cursor.execute("""
+        SELECT applicant_id, skill_vector, skill_vector_stamp
+        FROM job_applicants
+        WHERE job_id = %s
+        ORDER BY applicant_id
+    """, (job_id,))
+
+    applicant_ids = []
+    vectors = []
+    unscored = 0
+    for applicant_id, vector, stamp in cursor.fetchall():
+        if vector is None or stamp != codec.stamp:
+            unscored += 1
+            continue
+        applicant_ids.append(applicant_id)
+        vectors.append(bytes(vector))
+
+    if not vectors:
+        return [], unscored
+
+    percentages, passes = codec.score(profile, vectors)
+
+    if np is not None:
+        # Stable sort keeps applicants with equal scores in id order
+        order = np.argsort(-percentages, kind='stable')
+        if limit:
+            order = order[:limit]
+        order = order.tolist()
+    else:
+        order = sorted(range(len(vectors)), key=lambda i: -percentages[i])
+        if limit:
+            order = order[:limit]
+
+    ranked = [
+        {
+            "applicant_id": applicant_ids[i],
+            "match_percentage": round(float(percentages[i]), 2),
+            "passes": bool(passes[i])
+        }
+        for i in order
+    ]
+    return ranked, unscored
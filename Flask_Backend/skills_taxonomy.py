@@ -0,0 +1,42 @@
+"""
+skills_taxonomy.py - The CS skills screening recognizes
+
+Resumes are matched against these skills, and the requirement bitmasks and
+stored skill vectors are laid out over ALL_CS_SKILLS in this order, so
+adding or reordering skills changes the skill vector stamp.
+"""
+
+# CS Skills Dictionary with categories and keywords
+CS_SKILLS = {
+    "programming_languages": [
+        "python", "java", "javascript", "typescript", "c++", "c#", "go", "rust",
+        "php", "ruby", "swift", "kotlin", "scala", "perl", "r", "matlab"
+    ],
+    "web_frontend": [
+        "html", "css", "react", "angular", "vue", "svelte", "jquery", "bootstrap",
+        "tailwind", "sass", "less", "webpack", "babel", "vite", "nextjs", "nuxt"
+    ],
+    "web_backend": [
+        "node.js", "express", "django", "flask", "spring", "asp.net", "laravel",
+        "fastapi", "graphql", "rest api", "microservices", "serverless"
+    ],
+    "database": [
+        "sql", "mysql", "postgresql", "mongodb", "nosql", "oracle", "sqlite",
+        "redis", "cassandra", "dynamodb", "mariadb", "firebase", "elasticsearch"
+    ],
+    "devops": [
+        "docker", "kubernetes", "aws", "azure", "gcp", "jenkins", "ci/cd",
+        "terraform", "ansible", "git", "github", "gitlab", "bitbucket"
+    ],
+    "algorithms": [
+        "data structures", "algorithms", "big o notation", "sorting", "searching",
+        "dynamic programming", "recursion", "graph algorithms", "tree traversal"
+    ],
+    "software_engineering": [
+        "agile", "scrum", "kanban", "tdd", "bdd", "unit testing", "debugging",
+        "code review", "oop", "design patterns", "solid principles", "clean code"
+    ]
+}
+
+# Flatten the skills dictionary for easier searching
+ALL_CS_SKILLS = [skill for category in CS_SKILLS.values() for skill in category]
@@ -0,0 +1,87 @@
+import os
+import sys
+
+import pytest
+
+# The backend modules are flat files in Flask_Backend, imported by name
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class RecordingCursor:
+    """Stands in for a mysql-connector cursor: records statements and returns scripted rows"""
+
+    def __init__(self):
+        self.statements = []
+        self.results = []
+        self.lastrowid = None
+        self.rowcount = 0
+
+    def execute(self, sql, params=None):
+        self.statements.append((" ".join(sql.split()), params))
+
+    def fetchall(self):
+        return self.results.pop(0) if self.results else []
+
+    def fetchone(self):
+        rows = self.fetchall()
+        return rows[0] if rows else None
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def cursor():
+    return RecordingCursor()
+
+
+class FakeMySQLConnection:
+    """Stands in for a pooled connection, recording how the request ended"""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.commits = 0
+        self.rollbacks = 0
+        self.closed = False
+
+    def cursor(self, *args, **kwargs):
+        return self._cursor
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def connection(monkeypatch, cursor):
+    import database
+
+    conn = FakeMySQLConnection(cursor)
+    monkeypatch.setattr(database, "acquire_connection", lambda: conn)
+    return conn
+
+
+@pytest.fixture
+def flask_client(monkeypatch):
+    """Admin test client for flask_app; request first so the app imports against the real driver"""
+    # flask_app creates its upload folders under the deployment path at import
+    if not os.path.isdir('/home/smarthiringorg/SmartHire/Flask_Backend'):
+        pytest.skip("flask_app needs the deployment directory")
+
+    import flask_app
+
+    # Skip the once-per-process startup work so a route only sees its own statements
+    monkeypatch.setattr(flask_app, "_schema_checked_pid", os.getpid())
+    monkeypatch.setattr(flask_app.ANALYSIS_QUEUE, "start", lambda: None)
+    monkeypatch.setattr(flask_app.SCHEMA, "_columns", {})
+
+    client = flask_app.app.test_client()
+    with client.session_transaction() as session:
+        session['admin_id'] = 1
+        session['is_admin'] = True
+    return client
@@ -0,0 +1,117 @@
+import json
+
+import analysis_queue
+from analysis_queue import AnalysisQueue, STATUS_DONE, STATUS_FAILED, STATUS_QUEUED
+
+
+def make_queue(handler, failure_handler=None, max_attempts=3):
+    queue = AnalysisQueue(handler, failure_handler=failure_handler, max_attempts=max_attempts)
+    queue.finished = []
+    queue._finish = lambda job, status, result=None, error=None: queue.finished.append((status, result, error))
+    return queue
+
+
+def test_enqueue_writes_through_the_callers_cursor(cursor):
+    cursor.lastrowid = 42
+    queue = AnalysisQueue(handler=None)
+
+    assert queue.enqueue(cursor, 7, 3, "session-1", {"resume": "cv.pdf"}) == 42
+    sql, params = cursor.statements[0]
+    assert sql.startswith("INSERT INTO analysis_jobs")
+    assert params[:5] == (7, 3, "session-1", json.dumps({"resume": "cv.pdf"}), STATUS_QUEUED)
+
+
+def test_successful_job_stores_its_result():
+    queue = make_queue(lambda job: {"score": job["payload"]["score"]})
+    queue._process({"id": 1, "attempts": 1, "payload": {"score": 80}})
+    assert queue.finished == [(STATUS_DONE, {"score": 80}, None)]
+
+
+def test_failed_job_is_requeued_until_attempts_run_out():
+    failures = []
+
+    def handler(job):
+        raise RuntimeError("parser crashed")
+
+    queue = make_queue(handler, failure_handler=lambda job, error: failures.append(error), max_attempts=2)
+
+    queue._process({"id": 1, "attempts": 1, "payload": {}})
+    assert queue.finished == [(STATUS_QUEUED, None, "parser crashed")]
+    assert failures == []
+
+    queue._process({"id": 1, "attempts": 2, "payload": {}})
+    assert queue.finished[-1] == (STATUS_FAILED, None, "parser crashed")
+    assert failures == ["parser crashed"]
+
+
+def test_workers_do_not_start_without_the_table(monkeypatch):
+    monkeypatch.setattr(analysis_queue.SCHEMA, "has_table", lambda table: False)
+    started = []
+    monkeypatch.setattr(analysis_queue.threading.Thread, "start", lambda self: started.append(self.name))
+
+    queue = AnalysisQueue(handler=None, workers=2)
+    queue.start()
+    assert started == []
+    assert queue._started_pid is not None
+
+
+def test_start_retries_when_the_schema_check_fails(monkeypatch):
+    def unreachable(table):
+        raise ConnectionError("Can't connect to MySQL server")
+
+    monkeypatch.setattr(analysis_queue.SCHEMA, "has_table", unreachable)
+    started = []
+    monkeypatch.setattr(analysis_queue.threading.Thread, "start", lambda self: started.append(self.name))
+
+    queue = AnalysisQueue(handler=None, workers=2)
+    queue.start()
+    assert queue._started_pid is None
+
+    monkeypatch.setattr(analysis_queue.SCHEMA, "has_table", lambda table: True)
+    monkeypatch.setattr(queue, "recover", lambda: 0)
+    queue.notify()
+    queue.notify()
+    assert started == ["analysis-worker-0", "analysis-worker-1"]
+
+
+class FakeConnection:
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.committed = False
+
+    def cursor(self, *args, **kwargs):
+        return self._cursor
+
+    def commit(self):
+        self.committed = True
+
+    def close(self):
+        pass
+
+
+def test_recover_requeues_expired_leases(monkeypatch, cursor):
+    cursor.rowcount = 2
+    conn = FakeConnection(cursor)
+    monkeypatch.setattr(analysis_queue, "get_db_connection", lambda: conn)
+
+    queue = AnalysisQueue(handler=None, lease_seconds=60)
+    assert queue.recover() == 2
+    assert conn.committed
+
+    sql, params = cursor.statements[0]
+    assert sql.startswith("UPDATE analysis_jobs SET status = %s, claim_token = NULL")
+    assert params[0] == STATUS_QUEUED
+    assert params[2] == "running"
+    assert (params[1] - params[3]).total_seconds() == 60
+
+
+def test_start_recovers_before_starting_workers(monkeypatch):
+    monkeypatch.setattr(analysis_queue.SCHEMA, "has_table", lambda table: True)
+    events = []
+    monkeypatch.setattr(analysis_queue.threading.Thread, "start", lambda self: events.append(self.name))
+
+    queue = AnalysisQueue(handler=None, workers=1)
+    monkeypatch.setattr(queue, "recover", lambda: events.append("recover") or 0)
+    queue.start()
+    queue.start()
+    assert events == ["recover", "analysis-worker-0"]
@@ -0,0 +1,61 @@
+from bulk_writer import insert_rows, replace_children, sync_children, upsert_rows
+
+
+def test_insert_rows_is_one_statement(cursor):
+    assert insert_rows(cursor, "offers", ("job_id", "offer_text"), [(1, "a"), (1, "b")]) == 2
+    assert cursor.statements == [
+        ("INSERT INTO offers (job_id, offer_text) VALUES (%s, %s), (%s, %s)", [1, "a", 1, "b"])
+    ]
+
+
+def test_empty_rows_issue_no_statement(cursor):
+    assert insert_rows(cursor, "offers", ("job_id", "offer_text"), []) == 0
+    assert upsert_rows(cursor, "offers", ("job_id", "offer_text"), iter(()), ("offer_text",)) == 0
+    assert cursor.statements == []
+
+
+def test_upsert_rows_updates_the_given_columns(cursor):
+    upsert_rows(cursor, "assessment_answers", ("id", "assessment_id", "answer"), [(None, 2, "x")], ("answer",))
+    assert cursor.statements[0][0] == (
+        "INSERT INTO assessment_answers (id, assessment_id, answer) VALUES (%s, %s, %s) "
+        "ON DUPLICATE KEY UPDATE answer = VALUES(answer)"
+    )
+
+
+def test_replace_children_deletes_then_inserts(cursor):
+    replace_children(cursor, "applicant_skills", "applicant_id", 9, ("skill",), [("python",), ("sql",)])
+    assert cursor.statements == [
+        ("DELETE FROM applicant_skills WHERE applicant_id = %s", (9,)),
+        ("INSERT INTO applicant_skills (applicant_id, skill) VALUES (%s, %s), (%s, %s)", [9, "python", 9, "sql"]),
+    ]
+
+
+def test_sync_children_updates_changed_rows_and_inserts_the_rest(cursor):
+    stored = [(10, "design APIs"), (11, "write tests")]
+    submitted = ["design APIs", "review code", "mentor juniors"]
+
+    counts = sync_children(cursor, "responsibilities", "job_id", 4, "responsibility_text", stored, submitted)
+
+    assert counts == {"inserted": 1, "updated": 1, "deleted": 0}
+    assert cursor.statements == [(
+        "INSERT INTO responsibilities (id, job_id, responsibility_text) VALUES (%s, %s, %s), (%s, %s, %s) "
+        "ON DUPLICATE KEY UPDATE responsibility_text = VALUES(responsibility_text)",
+        [11, 4, "review code", None, 4, "mentor juniors"]
+    )]
+
+
+def test_sync_children_deletes_surplus_rows(cursor):
+    stored = [(10, "design APIs"), (11, "write tests"), (12, "on call")]
+
+    counts = sync_children(cursor, "responsibilities", "job_id", 4, "responsibility_text", stored, ["design APIs"])
+
+    assert counts == {"inserted": 0, "updated": 0, "deleted": 2}
+    assert cursor.statements == [("DELETE FROM responsibilities WHERE id IN (%s, %s)", [11, 12])]
+
+
+def test_sync_children_unchanged_is_a_no_op(cursor):
+    stored = [(10, "design APIs")]
+    assert sync_children(cursor, "responsibilities", "job_id", 4, "responsibility_text", stored, ["design APIs"]) == {
+        "inserted": 0, "updated": 0, "deleted": 0
+    }
+    assert cursor.statements == []
@@ -0,0 +1,23 @@
+from cv_analyzer import UploadBuffer, analyze_cs_resume
+
+RESUME = "Backend engineer with five years of python, sql and docker, building REST APIs in flask. " * 2
+
+
+def test_extracted_text_is_returned_for_the_text_vector(tmp_path):
+    resume = tmp_path / "resume.txt"
+    resume.write_text(RESUME)
+
+    result = analyze_cs_resume(str(resume), upload_folder=str(tmp_path))
+    assert result["resume_text"] == RESUME
+
+
+def test_default_skills_text_is_never_returned(tmp_path):
+    resume = tmp_path / "resume.rtf"
+    resume.write_text(RESUME)
+
+    result = analyze_cs_resume(str(resume), upload_folder=str(tmp_path))
+    assert result["resume_text"] == ""
+
+    upload = UploadBuffer("resume.rtf", RESUME.encode())
+    result = analyze_cs_resume(upload, upload_folder=str(tmp_path), save_to_disk=False)
+    assert result["resume_text"] == ""
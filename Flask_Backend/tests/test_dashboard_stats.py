@@ -0,0 +1,175 @@
+import dashboard_stats
+from dashboard_stats import DashboardStats, status_counter
+
+
+class FakeConnection:
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.opened = 0
+
+    def cursor(self, dictionary=False):
+        self.opened += 1
+        return self._cursor
+
+    def commit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_adjust_is_one_multi_row_upsert(cursor):
+    stats = DashboardStats()
+    stats.adjust(cursor, {"jobs": 1, "applicants": 0, status_counter("Applied"): 2})
+
+    assert len(cursor.statements) == 1
+    sql, params = cursor.statements[0]
+    assert sql == (
+        "INSERT INTO dashboard_counters (name, value) VALUES (%s, %s), (%s, %s) "
+        "ON DUPLICATE KEY UPDATE value = value + VALUES(value)"
+    )
+    assert params == ["jobs", 1, "applicants:Applied", 2]
+
+
+def test_adjust_without_changes_issues_no_statement(cursor):
+    DashboardStats().adjust(cursor, {"jobs": 0})
+    assert cursor.statements == []
+
+
+def test_status_change_moves_the_applicant_between_counters(cursor):
+    stats = DashboardStats()
+    cursor.results = [[("Applied",)]]
+    stats.set_applicant_status(cursor, 5, "Interview")
+
+    assert cursor.statements[1] == ("UPDATE applicants SET status = %s WHERE id = %s", ("Interview", 5))
+    assert cursor.statements[2][1] == ["applicants:Applied", -1, "applicants:Interview", 1]
+
+
+def test_unchanged_status_leaves_the_counters_alone(cursor):
+    stats = DashboardStats()
+    cursor.results = [[{"status": "Rejected"}]]
+    stats.set_applicant_status(cursor, 5, "Rejected")
+    assert len(cursor.statements) == 1
+
+
+def test_snapshot_is_cached_until_a_counter_changes(monkeypatch, cursor):
+    connection = FakeConnection(cursor)
+    monkeypatch.setattr(dashboard_stats, "get_db_connection", lambda: connection)
+
+    def script_reads():
+        cursor.results = [
+            [{"name": "jobs", "value": 3}, {"name": "applicants", "value": 4}, {"name": "applicants:Shortlisted", "value": 1}],
+            [], [], []
+        ]
+
+    stats = DashboardStats(cache_ttl=60)
+    script_reads()
+    snapshot = stats.snapshot()
+    assert snapshot["totalJobs"] == 3
+    assert snapshot["applicationsByStatus"] == {"Applied": 0, "Shortlisted": 1, "Interview": 0, "Rejected": 0}
+
+    assert stats.snapshot() is snapshot
+    assert connection.opened == 1
+
+    stats.job_created(cursor)
+    script_reads()
+    assert stats.snapshot() is not snapshot
+    assert connection.opened == 2
+
+
+
+class LockCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, sql, params=None):
+        self.conn.statements.append((sql, params))
+
+    def fetchone(self):
+        sql = self.conn.statements[-1][0]
+        return (self.conn.acquired if sql.startswith("SELECT GET_LOCK") else self.conn.held,)
+
+    def close(self):
+        pass
+
+
+class LockConnection:
+    """Dedicated connection answering the GET_LOCK and IS_USED_LOCK queries"""
+
+    def __init__(self, acquired=1, held=1):
+        self.acquired = acquired
+        self.held = held
+        self.closed = False
+        self.statements = []
+
+    def cursor(self):
+        return LockCursor(self)
+
+    def close(self):
+        self.closed = True
+
+
+def test_only_the_lock_holder_is_elected(monkeypatch):
+    connections = [LockConnection(acquired=0), LockConnection(acquired=1)]
+    follower, leader = connections
+    monkeypatch.setattr(dashboard_stats, "open_connection", lambda: connections.pop(0))
+    stats = DashboardStats()
+
+    assert stats._hold_lock(None) is None
+    assert follower.closed
+    assert follower.statements == [("SELECT GET_LOCK(%s, 0)", (dashboard_stats.RECONCILER_LOCK,))]
+
+    assert stats._hold_lock(None) is leader
+    # Holding on is checked on the same connection, without a new one
+    assert stats._hold_lock(leader) is leader
+    assert leader.statements[-1][0] == "SELECT IS_USED_LOCK(%s) = CONNECTION_ID()"
+    assert not leader.closed
+
+
+def test_lost_lock_is_taken_again(monkeypatch):
+    stale = LockConnection(held=0)
+    fresh = LockConnection(acquired=1)
+    monkeypatch.setattr(dashboard_stats, "open_connection", lambda: fresh)
+
+    assert DashboardStats()._hold_lock(stale) is fresh
+    assert stale.closed
+
+
+class StopLoop(Exception):
+    pass
+
+
+def run_one_round(monkeypatch, stats):
+    def sleep(seconds):
+        raise StopLoop()
+
+    monkeypatch.setattr(dashboard_stats.time, "sleep", sleep)
+    try:
+        stats._run_reconciler()
+    except StopLoop:
+        pass
+
+
+def test_followers_do_not_reconcile(monkeypatch):
+    monkeypatch.setattr(dashboard_stats.SCHEMA, "has_table", lambda table: True)
+    reconciled = []
+    stats = DashboardStats()
+    monkeypatch.setattr(stats, "reconcile", lambda: reconciled.append(True))
+
+    monkeypatch.setattr(dashboard_stats, "open_connection", lambda: LockConnection(acquired=0))
+    run_one_round(monkeypatch, stats)
+    assert reconciled == []
+
+    monkeypatch.setattr(dashboard_stats, "open_connection", lambda: LockConnection(acquired=1))
+    run_one_round(monkeypatch, stats)
+    assert reconciled == [True]
+
+
+def test_start_runs_one_thread_per_process(monkeypatch):
+    started = []
+    monkeypatch.setattr(dashboard_stats.threading.Thread, "start", lambda self: started.append(self.name))
+
+    stats = DashboardStats()
+    stats.start()
+    stats.start()
+    assert started == ["dashboard-reconciler"]
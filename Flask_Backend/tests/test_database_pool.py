@@ -0,0 +1,164 @@
+import pytest
+from mysql.connector.errors import PoolError
+
+import database
+from database import ConnectionPool
+
+
+class FakeMySQLConnection:
+    """Stands in for a mysql-connector connection"""
+
+    def __init__(self):
+        self.closed = False
+        self.healthy = True
+        self.pings = 0
+        self.rollbacks = 0
+        self.in_transaction = False
+        self.unread_result = False
+
+    def ping(self, reconnect=False):
+        self.pings += 1
+        if not self.healthy:
+            raise ConnectionError("MySQL server has gone away")
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.in_transaction = False
+
+    def close(self):
+        self.closed = True
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def connections(monkeypatch):
+    created = []
+
+    def connect(**kwargs):
+        created.append(FakeMySQLConnection())
+        return created[-1]
+
+    monkeypatch.setattr(database.mysql.connector, "connect", connect)
+    return created
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(database.time, "monotonic", clock)
+    return clock
+
+
+def make_pool(**kwargs):
+    return ConnectionPool(connect_kwargs={"host": "test"}, **kwargs)
+
+
+def test_idle_connections_are_reused(connections, clock):
+    pool = make_pool(size=2)
+
+    conn = pool.acquire()
+    first = conn.raw
+    conn.close()
+    assert pool.acquire().raw is first
+    assert len(connections) == 1
+
+
+def test_acquire_times_out_when_the_pool_is_exhausted(connections, clock):
+    pool = make_pool(size=1)
+    held = pool.acquire()
+
+    with pytest.raises(PoolError):
+        pool.acquire(timeout=0.01)
+    assert pool.stats()["timeouts"] == 1
+
+    held.close()
+    pool.acquire(timeout=0.01).close()
+
+
+def test_connections_past_their_lifetime_are_recycled(connections, clock):
+    pool = make_pool(size=1, max_lifetime=60, ping_interval=600)
+    pool.acquire().close()
+
+    clock.now += 61
+    conn = pool.acquire()
+    assert conn.raw is connections[1]
+    assert connections[0].closed
+    assert connections[0].pings == 0
+    assert pool.stats()["recycled"] == 1
+
+
+def test_idle_connections_are_pinged_before_reuse(connections, clock):
+    pool = make_pool(size=1, ping_interval=30)
+    pool.acquire().close()
+
+    clock.now += 10
+    pool.acquire().close()
+    assert connections[0].pings == 0
+
+    clock.now += 31
+    pool.acquire().close()
+    assert connections[0].pings == 1
+
+    connections[0].healthy = False
+    clock.now += 31
+    assert pool.acquire().raw is connections[1]
+    assert connections[0].closed
+    assert pool.stats()["health_check_failures"] == 1
+
+
+def test_release_rolls_back_an_open_transaction(connections, clock):
+    pool = make_pool(size=1)
+    conn = pool.acquire()
+    conn.raw.in_transaction = True
+    conn.close()
+
+    assert connections[0].rollbacks == 1
+    assert not connections[0].closed
+    # Closing twice must not free the slot twice
+    conn.close()
+    assert pool.stats()["in_use"] == 0
+
+
+def test_connection_that_cannot_be_reset_is_discarded(connections, clock):
+    pool = make_pool(size=1)
+    conn = pool.acquire()
+    conn.raw.in_transaction = True
+    conn.raw.rollback = lambda: (_ for _ in ()).throw(ConnectionError("lost connection"))
+    conn.close()
+
+    assert connections[0].closed
+    assert pool.stats()["discarded"] == 1
+    assert pool.acquire(timeout=0.01).raw is connections[1]
+
+
+def test_returned_connection_cannot_be_used(connections, clock):
+    conn = make_pool(size=1).acquire()
+    conn.close()
+    with pytest.raises(PoolError):
+        conn.cursor()
+
+
+def test_stats_track_usage(connections, clock):
+    pool = make_pool(size=3)
+    first = pool.acquire()
+    second = pool.acquire()
+
+    stats = pool.stats()
+    assert stats["acquired"] == 2
+    assert stats["created"] == 2
+    assert stats["in_use"] == 2
+    assert stats["idle"] == 0
+    assert stats["size"] == 3
+
+    first.close()
+    stats = pool.stats()
+    assert stats["in_use"] == 1
+    assert stats["idle"] == 1
+    second.close()
@@ -0,0 +1,67 @@
+import time
+
+from extraction_cache import ExtractionCache, hash_bytes, hash_file
+
+
+def make_cache(tmp_path, max_bytes=1024 * 1024):
+    return ExtractionCache(path=str(tmp_path / "cache.sqlite3"), max_bytes=max_bytes)
+
+
+def test_hash_file_matches_hash_bytes(tmp_path):
+    data = b"%PDF-1.4 resume" * 100000
+    path = tmp_path / "resume.pdf"
+    path.write_bytes(data)
+    assert hash_file(str(path)) == hash_bytes(data)
+
+
+def test_get_or_extract_extracts_once(tmp_path):
+    cache = make_cache(tmp_path)
+    calls = []
+
+    def extract():
+        calls.append(1)
+        return "python developer"
+
+    assert cache.get_or_extract("abc", "pdf", "v1", extract) == "python developer"
+    assert cache.get_or_extract("abc", "pdf", "v1", extract) == "python developer"
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_version_and_kind_are_part_of_the_key(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.put("abc", "pdf", "v1", "old text")
+    assert cache.get("abc", "pdf", "v2") is None
+    assert cache.get("abc", "docx", "v1") is None
+    assert cache.get("abc", "pdf", "v1") == "old text"
+
+
+def test_cacheable_vetoes_fallback_results(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.get_or_extract("abc", "pdf", "v1", lambda: "FAILED", cacheable=lambda text: text != "FAILED")
+    assert cache.get("abc", "pdf", "v1") is None
+
+
+def test_meta_round_trips_through_restore(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.get_or_extract("abc", "pdf", "v1", lambda: "text", describe=lambda: {"pages_read": 2})
+
+    restored = {}
+    cache.get_or_extract("abc", "pdf", "v1", lambda: "unused", restore=restored.update)
+    assert restored == {"pages_read": 2}
+
+
+def test_evicts_least_recently_used_entries(tmp_path):
+    cache = make_cache(tmp_path, max_bytes=25)
+    cache.put("a", "pdf", "v1", "x" * 10)
+    time.sleep(0.01)
+    cache.put("b", "pdf", "v1", "y" * 10)
+    time.sleep(0.01)
+    assert cache.get("a", "pdf", "v1") is not None  # a is now the most recent
+    time.sleep(0.01)
+    cache.put("c", "pdf", "v1", "z" * 10)
+
+    assert cache.get("b", "pdf", "v1") is None
+    assert cache.get("a", "pdf", "v1") is not None
+    assert cache.get("c", "pdf", "v1") is not None
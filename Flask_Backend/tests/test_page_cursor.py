@@ -0,0 +1,45 @@
+import os
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+# flask_app creates its upload folders under the deployment path at import
+if not os.path.isdir('/home/smarthiringorg/SmartHire/Flask_Backend'):
+    pytest.skip("flask_app needs the deployment directory", allow_module_level=True)
+
+from flask_app import decode_page_cursor, encode_page_cursor
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2024, 5, 1, 9, 30, 15)
+    assert decode_page_cursor(encode_page_cursor(created_at, 17)) == ["2024-05-01T09:30:15", 17]
+    assert decode_page_cursor(encode_page_cursor(Decimal("87.5"), 3, 9), size=3) == [87.5, 3, 9]
+
+
+def test_cursor_is_url_safe():
+    cursor = encode_page_cursor("?&/+", 1)
+    assert all(c.isalnum() or c in "-_=" for c in cursor)
+
+
+def test_missing_cursor_is_the_first_page():
+    assert decode_page_cursor(None) is None
+    assert decode_page_cursor("") is None
+
+
+@pytest.mark.parametrize("cursor", ["not base64!", encode_page_cursor(1), encode_page_cursor(1, 2, 3)])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_page_cursor(cursor)
+
+
+def test_applied_at_pages_on_the_raw_indexed_column(flask_client, connection, cursor):
+    after = encode_page_cursor(datetime(2024, 5, 1, 9, 30, 15), 17)
+    response = flask_client.get(f'/api/jobs/3/applicants?sort=applied_at&cursor={after}')
+    assert response.status_code == 200
+
+    sql, params = cursor.statements[0]
+    assert "AND (ja.applied_at < %s OR (ja.applied_at = %s AND ja.id < %s))" in sql
+    assert "ORDER BY ja.applied_at DESC, ja.id DESC" in sql
+    assert "COALESCE" not in sql
+    assert params == [3, "2024-05-01T09:30:15", "2024-05-01T09:30:15", 17, 51]
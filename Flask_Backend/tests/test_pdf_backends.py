@@ -0,0 +1,262 @@
+import tempfile
+from io import BytesIO
+
+import pdf_backends
+from pdf_backends import (
+    BENCHMARK_PAGES, ExtractionBudget, FallbackPolicy, ParallelPageExtractor, PdfBackend, PdfExtractorRegistry,
+    PdfPlumberBackend, PyPDF2Backend, benchmark_quality, build_sample_pdf
+)
+from skill_matcher import SkillMatcher
+
+
+class FailingBackend(PdfBackend):
+    name = "failing"
+    calls = 0
+
+    def probe(self):
+        return "test"
+
+    def iter_page_texts(self, stream, start=0, stop=None):
+        FailingBackend.calls += 1
+        raise ValueError("corrupt stream")
+
+
+class MissingBackend(PdfBackend):
+    name = "missing"
+
+    def probe(self):
+        raise ImportError("not installed")
+
+
+def test_sample_pdf_is_readable_by_every_installed_backend():
+    sample = build_sample_pdf(BENCHMARK_PAGES)
+    for backend_class in (PdfPlumberBackend, PyPDF2Backend):
+        backend = backend_class()
+        backend.probe()
+        assert backend.page_count(BytesIO(sample)) == len(BENCHMARK_PAGES)
+        assert benchmark_quality(backend.extract(BytesIO(sample))) > 0
+
+
+def test_benchmark_quality_penalizes_missing_and_interleaved_lines():
+    in_order = "\n".join(line for columns in BENCHMARK_PAGES for column in columns for line in column)
+    assert benchmark_quality(in_order) == 1.0
+
+    first_page_only = "\n".join(line for column in BENCHMARK_PAGES[0] for line in column)
+    assert benchmark_quality(first_page_only) == 0.5
+
+    # Columns read across instead of down split every line
+    interleaved = " ".join(word for column in zip(*BENCHMARK_PAGES[0][0]) for word in column)
+    assert benchmark_quality(interleaved) == 0.0
+
+
+def test_equal_quality_keeps_default_order(monkeypatch):
+    monkeypatch.setattr(pdf_backends, "benchmark_quality", lambda text: 1.0)
+
+    registry = PdfExtractorRegistry(backend_classes=[PdfPlumberBackend, PyPDF2Backend])
+    assert [b.name for b in registry.backends] == ["pdfplumber", "PyPDF2"]
+
+    registry = PdfExtractorRegistry(backend_classes=[PyPDF2Backend, PdfPlumberBackend])
+    assert [b.name for b in registry.backends] == ["PyPDF2", "pdfplumber"]
+
+
+def test_higher_quality_backend_is_ranked_first(monkeypatch):
+    # Pretend only the second backend reads the second page
+    monkeypatch.setattr(pdf_backends, "benchmark_quality", lambda text: 1.0 if "Education" in text else 0.5)
+    monkeypatch.setattr(PdfPlumberBackend, "extract", lambda self, stream: "Senior software engineer")
+
+    registry = PdfExtractorRegistry(backend_classes=[PdfPlumberBackend, PyPDF2Backend])
+    assert [b.name for b in registry.backends] == ["PyPDF2", "pdfplumber"]
+    assert registry.backends[1].benchmark["quality"] == 0.5
+
+
+def test_benchmark_runs_on_first_use_only(monkeypatch):
+    calls = []
+    monkeypatch.setattr(pdf_backends, "benchmark_quality", lambda text: calls.append(text) or 1.0)
+
+    registry = PdfExtractorRegistry(backend_classes=[PdfPlumberBackend, PyPDF2Backend])
+    assert calls == []
+
+    registry.backends
+    benchmarked = len(calls)
+    assert benchmarked > 0
+    registry.version_stamp()
+    assert len(calls) == benchmarked
+
+
+def test_uninstalled_backends_are_skipped():
+    registry = PdfExtractorRegistry(backend_classes=[MissingBackend, PyPDF2Backend], benchmark=False)
+    assert [b.name for b in registry.backends] == ["PyPDF2"]
+
+
+def test_fallback_policy_caps_backends_tried():
+    FailingBackend.calls = 0
+    registry = PdfExtractorRegistry(
+        backend_classes=[FailingBackend, FailingBackend, FailingBackend],
+        policy=FallbackPolicy(max_backends=2, binary_fallback=False),
+        benchmark=False
+    )
+    assert registry.extract(b"%PDF-1.4 not really") is None
+    assert FailingBackend.calls == 2
+
+    latency = [backend["latency"] for backend in registry.stats()["backends"]]
+    assert [entry["failures"] for entry in latency] == [1, 1, 0, 0]
+
+
+def numbered_pages(count):
+    return [[[f"Page {index} experience"], [f"Column {index} skills"]] for index in range(count)]
+
+
+def test_parallel_extraction_matches_serial_order(monkeypatch, tmp_path):
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    data = build_sample_pdf(numbered_pages(12))
+    backend = PyPDF2Backend()
+    backend.probe()
+
+    parallel = ParallelPageExtractor(page_threshold=10, max_workers=3)
+    try:
+        assert parallel.should_parallelize(12)
+        assert parallel.extract(backend, data, 12) == backend.extract(BytesIO(data))
+    finally:
+        parallel.shutdown()
+
+    # Workers read the document from a temporary file, removed afterwards
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_registry_only_parallelizes_long_documents(monkeypatch):
+    calls = []
+    parallel = ParallelPageExtractor(page_threshold=10, max_workers=2)
+    monkeypatch.setattr(
+        parallel, "extract", lambda backend, data, page_count, budget=None: calls.append(page_count) or "text"
+    )
+    registry = PdfExtractorRegistry(backend_classes=[PyPDF2Backend], benchmark=False, parallel=parallel)
+    backend = registry.backends[0]
+
+    registry._extract_with(backend, build_sample_pdf(numbered_pages(3)))
+    assert calls == []
+
+    registry._extract_with(backend, build_sample_pdf(numbered_pages(10)))
+    assert calls == [10]
+
+
+def test_budgeted_reads_parallelize_unless_the_page_budget_is_short(monkeypatch):
+    calls = []
+    parallel = ParallelPageExtractor(page_threshold=10, max_workers=2)
+    monkeypatch.setattr(
+        parallel, "extract", lambda backend, data, page_count, budget=None: calls.append(budget) or "text"
+    )
+    registry = PdfExtractorRegistry(backend_classes=[PyPDF2Backend], benchmark=False, parallel=parallel)
+    backend = registry.backends[0]
+    data = build_sample_pdf(numbered_pages(12))
+
+    unlimited = ExtractionBudget(max_chars=100)
+    registry._extract_with(backend, data, unlimited)
+    assert calls == [unlimited]
+
+    long_budget = ExtractionBudget(max_pages=10)
+    registry._extract_with(backend, data, long_budget)
+    assert calls == [unlimited, long_budget]
+
+    short_budget = ExtractionBudget(max_pages=3)
+    assert registry._extract_with(backend, data, short_budget).count("experience") == 3
+    assert len(calls) == 2
+
+
+def test_parallel_extraction_applies_the_budget(monkeypatch, tmp_path):
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    data = build_sample_pdf(numbered_pages(12))
+    backend = PyPDF2Backend()
+    backend.probe()
+
+    serial = ExtractionBudget(max_pages=10)
+    expected = serial.read(backend.iter_page_texts(BytesIO(data)), page_count=lambda: 12)
+
+    parallel = ParallelPageExtractor(page_threshold=10, max_workers=3)
+    budget = ExtractionBudget(max_pages=10)
+    try:
+        assert parallel.extract(backend, data, 12, budget) == expected
+    finally:
+        parallel.shutdown()
+
+    assert budget.summary() == serial.summary()
+    assert budget.truncated_reason == "page_budget"
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_single_worker_never_parallelizes():
+    assert not ParallelPageExtractor(page_threshold=1, max_workers=1).should_parallelize(100)
+
+
+class CountingPages:
+    """Page iterator recording how many pages were pulled"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.pulled = 0
+
+    def __iter__(self):
+        for page in self.pages:
+            self.pulled += 1
+            yield page
+
+
+def test_budget_stops_before_pulling_the_next_page():
+    pages = CountingPages([f"page {index}" for index in range(10)])
+    budget = ExtractionBudget(max_pages=3)
+
+    assert budget.read(pages, page_count=lambda: 10) == "page 0\npage 1\npage 2"
+    assert pages.pulled == 3
+    assert budget.summary() == {
+        "truncated": True, "truncated_reason": "page_budget", "pages_read": 3, "chars_read": 21
+    }
+
+
+def test_budget_without_page_count_peeks_one_page():
+    pages = CountingPages(["one", "two", "three"])
+    budget = ExtractionBudget(max_pages=2)
+    budget.read(pages)
+    assert pages.pulled == 3
+    assert budget.truncated
+
+    pages = CountingPages(["one", "two"])
+    budget = ExtractionBudget(max_pages=2)
+    budget.read(pages)
+    assert pages.pulled == 2
+    assert not budget.truncated
+
+
+def test_budget_that_fits_the_document_is_not_truncated():
+    budget = ExtractionBudget(max_pages=3)
+    budget.read(CountingPages(["one", "two", "three"]), page_count=lambda: 3)
+    assert not budget.truncated
+
+
+def test_char_budget_cuts_the_text():
+    budget = ExtractionBudget(max_chars=10)
+    assert budget.read(CountingPages(["0123456", "789abcdef"]), page_count=lambda: 5) == "0123456\n78"
+    assert budget.summary()["truncated_reason"] == "char_budget"
+
+
+def test_saturated_scanner_stops_reading():
+    scanner = SkillMatcher(["python", "sql", "docker"]).scanner(2)
+    pages = CountingPages(["Python", "SQL", "Docker", "Kubernetes"])
+    budget = ExtractionBudget(scanner=scanner)
+
+    budget.read(pages, page_count=lambda: 4)
+    assert pages.pulled == 2
+    assert budget.truncated_reason == "skills_saturated"
+
+
+def test_registry_counts_pages_instead_of_extracting_past_the_budget():
+    data = build_sample_pdf(numbered_pages(6))
+    registry = PdfExtractorRegistry(backend_classes=[PyPDF2Backend], benchmark=False)
+    budget = ExtractionBudget(max_pages=2)
+
+    text = registry.extract(data, budget)
+    assert "Page 1 experience" in text and "Page 2 experience" not in text
+    assert budget.summary()["pages_read"] == 2
+    assert budget.truncated
+
+    budget = ExtractionBudget(max_pages=6)
+    registry.extract(data, budget)
+    assert not budget.truncated
@@ -0,0 +1,151 @@
+import hashlib
+import json
+import os
+from datetime import datetime
+
+import pytest
+
+# flask_app creates its upload folders under the deployment path at import
+if not os.path.isdir('/home/smarthiringorg/SmartHire/Flask_Backend'):
+    pytest.skip("flask_app needs the deployment directory", allow_module_level=True)
+
+import flask_app
+from flask_app import JOB_COLUMNS, PublicJobsCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(flask_app.time, "monotonic", clock)
+    return clock
+
+
+@pytest.fixture
+def jobs_cache(monkeypatch):
+    cache = PublicJobsCache(ttl=60)
+    monkeypatch.setattr(flask_app, "PUBLIC_JOBS_CACHE", cache)
+    return cache
+
+
+def job_row(job_id, job_name):
+    row = dict.fromkeys(JOB_COLUMNS, '')
+    row.update(id=job_id, job_name=job_name, applicants_count=None, created_at=datetime(2024, 5, 1, 9, 30))
+    return row
+
+
+def counting_build(jobs):
+    calls = []
+
+    def build():
+        calls.append(len(calls))
+        return jobs
+
+    return build, calls
+
+
+def test_etag_is_the_body_hash(clock):
+    build, calls = counting_build([{"id": 1, "job_name": "Engineer"}])
+    body, etag = PublicJobsCache().get(build)
+
+    assert json.loads(body) == [{"id": 1, "job_name": "Engineer"}]
+    assert etag == hashlib.sha256(body).hexdigest()
+
+
+def test_body_is_reused_until_the_ttl_expires(clock):
+    cache = PublicJobsCache(ttl=60)
+    build, calls = counting_build([])
+
+    cache.get(build)
+    clock.now += 59
+    cache.get(build)
+    assert len(calls) == 1
+
+    clock.now += 2
+    cache.get(build)
+    assert len(calls) == 2
+
+
+def test_invalidate_rebuilds_the_body(clock):
+    cache = PublicJobsCache(ttl=60)
+    build, calls = counting_build([])
+
+    cache.get(build)
+    cache.invalidate()
+    cache.get(build)
+    assert len(calls) == 2
+
+
+def test_body_built_across_an_invalidate_is_not_stored(clock):
+    cache = PublicJobsCache(ttl=60)
+
+    def racing_build():
+        cache.invalidate()
+        return []
+
+    cache.get(racing_build)
+    build, calls = counting_build([])
+    cache.get(build)
+    assert len(calls) == 1
+
+
+def test_route_answers_a_matching_etag_with_304(flask_client, connection, cursor, jobs_cache, clock):
+    cursor.results = [[job_row(1, "Engineer")]]
+
+    response = flask_client.get('/api/public/jobs')
+    assert response.status_code == 200
+    assert response.get_json()[0]["job_name"] == "Engineer"
+    assert response.get_json()[0]["applicants_count"] == 0
+    assert response.headers["Cache-Control"] == "no-cache"
+    etag = response.headers["ETag"].strip('"')
+
+    response = flask_client.get('/api/public/jobs', headers={"If-None-Match": f'"{etag}"'})
+    assert response.status_code == 304
+    assert response.data == b""
+    assert response.headers["ETag"].strip('"') == etag
+
+    response = flask_client.get('/api/public/jobs', headers={"If-None-Match": '"stale"'})
+    assert response.status_code == 200
+
+    # One query served all three requests
+    assert len(cursor.statements) == 1
+
+
+def test_job_writes_invalidate_after_commit(flask_client, connection, cursor, jobs_cache, clock):
+    cursor.results = [[job_row(1, "Engineer")], [job_row(1, "Engineer"), job_row(2, "Designer")]]
+    flask_client.get('/api/public/jobs')
+
+    cursor.lastrowid = 2
+    commits = connection.commits
+    response = flask_client.post('/api/jobs', json={"job_name": "Designer"})
+    assert response.status_code == 201
+    assert connection.commits == commits + 1
+
+    response = flask_client.get('/api/public/jobs')
+    assert [job["job_name"] for job in response.get_json()] == ["Engineer", "Designer"]
+
+
+def test_failed_job_write_keeps_the_cache(flask_client, connection, cursor, jobs_cache, clock):
+    cursor.results = [[job_row(1, "Engineer")]]
+    flask_client.get('/api/public/jobs')
+
+    assert flask_client.post('/api/jobs', json={}).status_code == 400
+    statements = len(cursor.statements)
+    flask_client.get('/api/public/jobs')
+    assert len(cursor.statements) == statements
+
+
+def test_deleting_a_job_invalidates(flask_client, connection, cursor, jobs_cache, clock):
+    cursor.results = [[job_row(1, "Engineer")], []]
+    flask_client.get('/api/public/jobs')
+
+    cursor.rowcount = 1
+    assert flask_client.delete('/api/jobs/1').status_code == 200
+    assert flask_client.get('/api/public/jobs').get_json() == []
@@ -0,0 +1,84 @@
+import pytest
+from flask import Flask, jsonify
+
+import database
+from database import after_commit, get_db_connection
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    database.init_app(app)
+    app.events = []
+
+    @app.route('/write/<int:status>')
+    def write(status):
+        conn = get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute("UPDATE jobs SET title = %s WHERE id = %s", ("Engineer", 1))
+        after_commit(lambda: app.events.append("committed"))
+        cursor.close()
+        conn.close()
+        return jsonify({}), status
+
+    @app.route('/raise')
+    def fail():
+        get_db_connection().cursor().execute("UPDATE jobs SET title = %s WHERE id = %s", ("Engineer", 1))
+        raise RuntimeError("handler crashed")
+
+    return app.test_client()
+
+
+def test_successful_response_commits_once(client, connection):
+    assert client.get('/write/200').status_code == 200
+    assert connection.commits == 1
+    assert connection.rollbacks == 0
+    assert connection.closed
+    assert client.application.events == ["committed"]
+
+
+def test_error_response_rolls_back(client, connection):
+    assert client.get('/write/400').status_code == 400
+    assert connection.commits == 0
+    assert connection.rollbacks == 1
+    assert connection.closed
+    assert client.application.events == []
+
+
+def test_exception_rolls_back_in_teardown(client, connection):
+    assert client.get('/raise').status_code == 500
+    assert connection.commits == 0
+    assert connection.rollbacks == 1
+    assert connection.closed
+
+
+def test_failed_commit_turns_into_a_500(client, connection):
+    def commit():
+        raise ConnectionError("Lost connection to MySQL server")
+
+    connection.commit = commit
+    response = client.get('/write/200')
+    assert response.status_code == 500
+    assert "Lost connection" in response.get_json()["error"]
+    assert connection.rollbacks == 1
+    assert client.application.events == []
+
+
+def test_after_commit_runs_right_away_outside_a_request():
+    events = []
+    after_commit(lambda: events.append("ran"))
+    assert events == ["ran"]
+
+
+def test_routes_leave_the_commit_to_the_request(flask_client, connection, cursor):
+    cursor.rowcount = 1
+    assert flask_client.delete('/api/assessments/5').status_code == 200
+    assert cursor.statements[0] == ("DELETE FROM assessments WHERE id = %s", (5,))
+    assert (connection.commits, connection.rollbacks) == (1, 0)
+
+    def execute(sql, params=None):
+        raise ConnectionError("Lock wait timeout exceeded")
+
+    cursor.execute = execute
+    assert flask_client.delete('/api/assessments/5').status_code == 500
+    assert (connection.commits, connection.rollbacks) == (1, 1)
@@ -0,0 +1,75 @@
+import random
+
+from requirement_profile import RequirementProfile, SkillVocabulary, compile_profile
+
+VOCABULARY = SkillVocabulary(["Python", "SQL", "Docker", "React", "AWS", "Go"])
+
+
+def naive_evaluate(required, matched, min_match_percentage=60):
+    """The list-membership check the bitmask profile replaced"""
+    matched = {skill.lower() for skill in matched}
+    matched_required = [skill for skill in required if skill in matched]
+    percentage = len(matched_required) / len(required) * 100 if required else 0.0
+    return {
+        "passes": percentage >= min_match_percentage,
+        "match_percentage": round(percentage, 2),
+        "matched_required": matched_required,
+        "missing_required": [skill for skill in required if skill not in matched]
+    }
+
+
+def test_vocabulary_is_frozen():
+    assert VOCABULARY.bit("python") == 0
+    assert VOCABULARY.bit("cobol") is None
+    assert VOCABULARY.mask(["COBOL", " Python ", "go"]) == 0b100001
+    assert len(VOCABULARY) == 6
+
+
+def test_matches_the_naive_check_on_random_candidates():
+    pool = ["python", "sql", "docker", "react", "aws", "go", "cobol", "fortran"]
+    rng = random.Random(3)
+
+    for _ in range(300):
+        required = rng.sample(pool, rng.randint(1, 6))
+        matched = rng.sample(pool, rng.randint(0, 8))
+        profile = RequirementProfile(required, vocabulary=VOCABULARY)
+        assert profile.evaluate(matched) == naive_evaluate(required, matched), (required, matched)
+
+
+def test_unknown_skills_are_matched_by_name():
+    profile = RequirementProfile(["python", "cobol"], vocabulary=VOCABULARY)
+    assert profile.score(["Python", "COBOL"]) == (True, 100.0)
+    # A precompiled mask can't carry skills outside the vocabulary
+    assert profile.score(profile.mask(["python", "cobol"])) == (False, 50.0)
+
+
+def test_weights_and_must_haves():
+    profile = RequirementProfile(
+        ["python", "sql", "docker"], weights={"python": 3}, must_have=["docker", "cobol"],
+        vocabulary=VOCABULARY
+    )
+    assert profile.skills == ("python", "sql", "docker", "cobol")
+    assert profile.weighted_skills() == [
+        ("python", 3.0, False), ("sql", 1.0, False), ("docker", 1.0, True), ("cobol", 1.0, True)
+    ]
+
+    passes, percentage = profile.score(["python", "sql", "docker"])
+    assert percentage == 5 / 6 * 100
+    assert not passes
+
+    assert profile.score(["python", "docker", "cobol"])[0]
+
+
+def test_results_keep_the_job_order():
+    profile = RequirementProfile(["SQL", "python", "cobol", "docker", "sql"], vocabulary=VOCABULARY)
+    assert profile.skills == ("sql", "python", "cobol", "docker")
+
+    result = profile.evaluate(["docker", "sql"])
+    assert result["matched_required"] == ["sql", "docker"]
+    assert result["missing_required"] == ["python", "cobol"]
+
+
+def test_compiled_profiles_are_shared():
+    assert compile_profile(["python", "sql"]) is compile_profile(skill for skill in ("python", "sql"))
+    assert compile_profile(["python", "sql"]) is not compile_profile(["sql", "python"])
+    assert compile_profile(["python"], must_have=["python"]) is not compile_profile(["python"])
@@ -0,0 +1,100 @@
+from datetime import datetime
+
+import pytest
+
+import requirements_cache
+from requirements_cache import RequiredSkillsCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(requirements_cache.time, "monotonic", clock)
+    return clock
+
+
+class JobsTable:
+    """Stands in for _load(): the (updated_at, required_skills) row of each job"""
+
+    def __init__(self):
+        self.rows = {}
+        self.loads = 0
+
+    def __call__(self, job_id):
+        self.loads += 1
+        return self.rows.get(job_id)
+
+
+@pytest.fixture
+def jobs(monkeypatch):
+    jobs = JobsTable()
+    parsed = []
+    original = requirements_cache.parse_requirements
+    monkeypatch.setattr(requirements_cache, "parse_requirements", lambda data: parsed.append(data) or original(data))
+    jobs.parsed = parsed
+    return jobs
+
+
+def make_cache(jobs, ttl=60):
+    cache = RequiredSkillsCache(ttl=ttl)
+    cache._load = jobs
+    return cache
+
+
+def test_fresh_entries_are_hits(clock, jobs):
+    jobs.rows[1] = (datetime(2024, 5, 1), "Python, SQL")
+    cache = make_cache(jobs)
+
+    assert cache.profile(1).skills == ("python", "sql")
+    assert cache.profile(1).skills == ("python", "sql")
+    assert jobs.loads == 1
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_stale_entry_is_revalidated_by_updated_at(clock, jobs):
+    jobs.rows[1] = (datetime(2024, 5, 1), "Python, SQL")
+    cache = make_cache(jobs)
+    profile = cache.profile(1)
+
+    # Unchanged row: checked again after the TTL, but not re-parsed
+    clock.now += 61
+    assert cache.profile(1) is profile
+    assert jobs.loads == 2
+    assert len(jobs.parsed) == 1
+
+    # Another process edited the job: the next revalidation reloads it
+    jobs.rows[1] = (datetime(2024, 5, 2), "Python, Docker")
+    clock.now += 30
+    assert cache.profile(1) is profile
+    clock.now += 31
+    assert cache.profile(1).skills == ("python", "docker")
+    assert len(jobs.parsed) == 2
+
+
+def test_rows_without_updated_at_are_always_reparsed(clock, jobs):
+    jobs.rows[1] = (None, "Python")
+    cache = make_cache(jobs)
+    cache.profile(1)
+    clock.now += 61
+    cache.profile(1)
+    assert len(jobs.parsed) == 2
+
+
+def test_invalidate_drops_the_entry(clock, jobs):
+    jobs.rows[1] = (datetime(2024, 5, 1), "Python")
+    cache = make_cache(jobs)
+    cache.profile(1)
+
+    jobs.rows[1] = (datetime(2024, 5, 2), "Go")
+    cache.invalidate(1)
+    assert cache.profile(1).skills == ("go",)
+    assert cache.stats()["misses"] == 2
@@ -0,0 +1,101 @@
+import time
+import random
+from datetime import datetime
+from decimal import Decimal
+
+from skill_index import SkillIndex, gallop_intersect, index_applicant_skills, intersect_all, subtract
+
+
+def loaded_index(skills_by_applicant, scores=None):
+    """A SkillIndex filled through _apply, marked fresh so searches don't hit the database"""
+    index = SkillIndex(refresh_interval=3600)
+    for applicant_id, skills in skills_by_applicant.items():
+        index._apply(applicant_id, set(skills), (scores or {}).get(applicant_id))
+    index._loaded_at = index._refreshed_at = object()
+    index._checked_at = time.monotonic()
+    return index
+
+
+def test_gallop_intersect_matches_set_intersection():
+    rng = random.Random(11)
+    for _ in range(500):
+        small = sorted(rng.sample(range(2000), rng.randint(0, 50)))
+        large = sorted(rng.sample(range(2000), rng.randint(0, 1500)))
+        expected = sorted(set(small) & set(large))
+        assert gallop_intersect(small, large) == expected
+        assert gallop_intersect(large, small) == expected
+
+
+def test_gallop_intersect_edges():
+    assert gallop_intersect([], [1, 2, 3]) == []
+    assert gallop_intersect([5], [1, 2, 3]) == []
+    assert gallop_intersect([3], [1, 2, 3]) == [3]
+    assert gallop_intersect([1, 1000], list(range(1001))) == [1, 1000]
+
+
+def test_intersect_and_subtract():
+    assert intersect_all([[1, 2, 3, 4], [2, 4, 6], [4, 5, 9]]) == [4]
+    assert intersect_all([]) == []
+    assert subtract([1, 2, 3, 4], [2, 4]) == [1, 3]
+
+
+def test_search_combines_all_any_and_not():
+    index = loaded_index({
+        1: ["python", "sql"],
+        2: ["python", "docker"],
+        3: ["python", "sql", "docker"],
+        4: ["java", "sql"],
+    }, scores={1: 70.0, 2: 90.0, 3: 50.0})
+
+    assert index.search(all_skills=["python"]) == (3, [(2, 90.0), (1, 70.0), (3, 50.0)])
+    assert index.search(all_skills=["python"], not_skills=["docker"]) == (1, [(1, 70.0)])
+    assert index.search(any_skills=["java", "docker"], limit=2) == (3, [(2, 90.0), (3, 50.0)])
+    assert index.search(not_skills=["python"]) == (1, [(4, None)])
+    assert index.search(all_skills=["rust"]) == (0, [])
+
+
+def test_search_within_one_jobs_scores():
+    index = loaded_index({1: ["python"], 2: ["python"], 3: ["python"]}, scores={1: 99.0})
+    assert index.search(all_skills=["python"], scores={2: 40.0, 3: 60.0}) == (2, [(3, 60.0), (2, 40.0)])
+
+
+def test_apply_moves_postings():
+    index = loaded_index({1: ["python", "sql"], 2: ["python"]})
+    postings = index._postings["python"]
+
+    index._apply(1, {"sql", "go"}, None)
+    assert index._postings["python"] == [2]
+    assert postings == [1, 2]  # earlier snapshots are left untouched
+    assert index.skills() == {"python": 1, "sql": 1, "go": 1}
+
+    index._apply(2, set(), None)
+    assert 2 not in index._skills_by_applicant
+
+
+def test_apply_swaps_in_new_maps():
+    index = loaded_index({1: ["python"]})
+    postings, skills_by_applicant = index._postings, index._skills_by_applicant
+
+    index._apply(2, {"go"}, None)
+    # A search holding the old maps never sees them change size under it
+    assert postings == {"python": [1]}
+    assert skills_by_applicant == {1: {"python"}}
+    assert index.search(not_skills=["python"]) == (1, [(2, None)])
+
+
+def test_refresh_stores_float_scores(connection, cursor):
+    index = loaded_index({1: ["python"]})
+    index._refreshed_at = datetime(2024, 5, 1, 9, 30)
+    cursor.results = [[(2,)], [(2, "sql")], [(2, Decimal("87.50"))]]
+
+    index._refresh()
+    assert index.search(all_skills=["sql"]) == (1, [(2, 87.5)])
+    assert type(index._scores[2]) is float
+
+
+def test_index_applicant_skills_normalizes(cursor):
+    index_applicant_skills(cursor, 3, ["Python", " python ", "SQL", ""])
+    assert cursor.statements[1] == (
+        "INSERT INTO applicant_skills (applicant_id, skill) VALUES (%s, %s), (%s, %s)", [3, "python", 3, "sql"]
+    )
+    assert cursor.statements[2][0] == "UPDATE applicants SET skills_indexed_at = %s WHERE id = %s"
@@ -0,0 +1,58 @@
+import re
+import random
+
+from skill_matcher import SkillMatcher
+
+SKILLS = ["python", "java", "javascript", "c++", "c#", "go", "node.js", "ci/cd", "machine learning", "r", "sql", "nosql"]
+SYNONYMS = {
+    "javascript": ["js"],
+    "node.js": ["nodejs"],
+    "ci/cd": ["continuous integration"],
+    "machine learning": ["ml"],
+}
+
+
+def regex_skills(text, skills=SKILLS, synonyms=SYNONYMS):
+    """The per-skill regex scan the matcher replaced"""
+    found = []
+    for skill in skills:
+        patterns = [skill] + synonyms.get(skill, [])
+        if any(re.search(r'\b' + re.escape(pattern) + r'\b', text) for pattern in patterns):
+            found.append(skill)
+    return found
+
+
+def test_finds_whole_words_in_taxonomy_order():
+    matcher = SkillMatcher(SKILLS, SYNONYMS)
+    text = "built ml pipelines in python and sql, deployed with continuous integration"
+    assert matcher.find_skills(text) == ["python", "ci/cd", "machine learning", "sql"]
+
+
+def test_ignores_skills_inside_other_words():
+    matcher = SkillMatcher(SKILLS, SYNONYMS)
+    assert matcher.find_skills("javascripting gopher nosql") == ["nosql"]
+
+
+def test_synonyms_map_to_their_canonical_skill():
+    matcher = SkillMatcher(SKILLS, SYNONYMS)
+    assert matcher.find_skills("wrote js and nodejs services") == ["javascript", "node.js"]
+
+
+def test_matches_the_regex_baseline_on_random_text():
+    matcher = SkillMatcher(SKILLS, SYNONYMS)
+    vocabulary = SKILLS + ["js", "nodejs", "ml", "golang", "rust", "c", "c++11", "x", "data"]
+    separators = [" ", ", ", ".", "/", "-", "_", "\n", "(", ")"]
+    rng = random.Random(7)
+
+    for _ in range(500):
+        text = "".join(rng.choice(vocabulary) + rng.choice(separators) for _ in range(rng.randint(1, 12)))
+        assert matcher.find_skills(text) == regex_skills(text), text
+
+
+def test_scanner_accumulates_chunks_and_saturates():
+    scanner = SkillMatcher(SKILLS, SYNONYMS).scanner(3)
+    assert not scanner.feed("Python developer")
+    assert not scanner.feed("SQL")
+    assert scanner.feed("Java")
+    scanner.reset()
+    assert not scanner.saturated
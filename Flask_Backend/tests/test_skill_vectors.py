@@ -0,0 +1,87 @@
+import random
+
+import pytest
+
+import skill_vectors
+from requirement_profile import RequirementProfile, SkillVocabulary
+from skill_vectors import SkillVectorCodec, rank_job_applicants, store_skill_vector
+
+SKILLS = ["python", "sql", "docker", "react", "aws", "go", "rust", "java", "kotlin"]
+CODEC = SkillVectorCodec(SKILLS)
+VOCABULARY = SkillVocabulary(SKILLS)
+
+
+def test_encode_decode_round_trip():
+    vector = CODEC.encode(["Kotlin", "python", "cobol"])
+    assert len(vector) == 2
+    assert CODEC.decode(vector) == ["python", "kotlin"]
+    assert CODEC.decode(None) == []
+
+
+def test_stamp_tracks_the_vocabulary():
+    assert SkillVectorCodec(SKILLS).stamp == CODEC.stamp
+    assert SkillVectorCodec(SKILLS + ["scala"]).stamp != CODEC.stamp
+
+
+def test_scores_agree_with_the_profile():
+    profile = RequirementProfile(
+        ["python", "sql", "kotlin"], weights={"kotlin": 2}, must_have=["sql"], vocabulary=VOCABULARY
+    )
+    candidates = [["python", "sql", "kotlin"], ["python", "kotlin"], ["sql"], []]
+
+    percentages, passes = CODEC.score(profile, [CODEC.encode(skills) for skills in candidates])
+    for skills, percentage, passed in zip(candidates, percentages, passes):
+        assert (bool(passed), float(percentage)) == profile.score(skills)
+
+
+def test_numpy_path_matches_the_profile():
+    np = pytest.importorskip("numpy")
+    assert skill_vectors.np is np
+    rng = random.Random(7)
+
+    for _ in range(100):
+        required = rng.sample(SKILLS, rng.randint(1, 6))
+        weights = {skill: rng.choice([0.5, 1, 2, 3]) for skill in required if rng.random() < 0.5}
+        must_have = rng.sample(required, rng.randint(0, min(2, len(required))))
+        profile = RequirementProfile(required, weights=weights, must_have=must_have, vocabulary=VOCABULARY)
+        candidates = [rng.sample(SKILLS, rng.randint(0, len(SKILLS))) for _ in range(10)]
+
+        percentages, passes = CODEC.score(profile, [CODEC.encode(skills) for skills in candidates])
+        assert isinstance(percentages, np.ndarray)
+        for skills, percentage, passed in zip(candidates, percentages, passes):
+            expected_passes, expected_percentage = profile.score(skills)
+            assert bool(passed) == expected_passes
+            assert float(percentage) == pytest.approx(expected_percentage)
+
+
+def test_python_fallback_matches(monkeypatch):
+    profile = RequirementProfile(["python", "go", "rust"], vocabulary=VOCABULARY)
+    vectors = [CODEC.encode(["python", "go"]), CODEC.encode(["rust"]), b""]
+
+    monkeypatch.setattr(skill_vectors, "np", None)
+    percentages, passes = CODEC.score(profile, vectors)
+    assert [round(p, 2) for p in percentages] == [66.67, 33.33, 0.0]
+    assert passes == [True, False, False]
+
+
+def test_rank_job_applicants_skips_stale_vectors(cursor):
+    profile = RequirementProfile(["python", "sql"], vocabulary=VOCABULARY)
+    cursor.results = [[
+        (1, CODEC.encode(["python"]), CODEC.stamp),
+        (2, CODEC.encode(["python", "sql"]), CODEC.stamp),
+        (3, CODEC.encode(["sql"]), CODEC.stamp),
+        (4, CODEC.encode(["python", "sql"]), "old-taxonomy"),
+        (5, None, None),
+    ]]
+
+    ranked, unscored = rank_job_applicants(cursor, CODEC, 7, profile)
+
+    assert unscored == 2
+    assert [(row["applicant_id"], row["match_percentage"], row["passes"]) for row in ranked] == [
+        (2, 100.0, True), (1, 50.0, False), (3, 50.0, False)
+    ]
+
+
+def test_store_skill_vector_writes_the_stamp(cursor):
+    store_skill_vector(cursor, CODEC, 7, 2, ["sql"])
+    assert cursor.statements[0][1] == (CODEC.encode(["sql"]), CODEC.stamp, 7, 2)
@@ -0,0 +1,36 @@
+def submit(flask_client, applicant_id=7):
+    return flask_client.post('/api/public/assessments/3/submit', json={
+        "applicant_id": applicant_id,
+        "answers": [{"question_id": "q1", "answer": "B"}, {"question_id": "q2", "answer": "A"}]
+    })
+
+
+def test_session_status_is_one_upsert(flask_client, connection, cursor):
+    cursor.results = [
+        [{"id": 3, "applicant_id": 7, "job_id": 2, "question_data": None}],
+        [{"assessment_id": 9}],
+        [{"id": "q1", "correct_answer": "B", "question_type": "multiple-choice"},
+         {"id": "q2", "correct_answer": "C", "question_type": "multiple-choice"}],
+    ]
+
+    assert submit(flask_client).status_code == 200
+    sql, params = cursor.statements[0]
+    assert sql == "SELECT id, applicant_id, job_id, question_data FROM assessment_sessions WHERE id = %s"
+
+    sql, params = cursor.statements[1]
+    assert sql == (
+        "INSERT INTO assessment_sessions (id, applicant_id, job_id, status, completed_at) VALUES (%s, %s, %s, %s, %s) "
+        "ON DUPLICATE KEY UPDATE status = VALUES(status), completed_at = VALUES(completed_at)"
+    )
+    assert params[:4] == [3, 7, 2, "completed"]
+
+    sql, params = cursor.statements[-1]
+    assert sql.startswith("INSERT INTO assessment_answers")
+    assert [params[i:i + 6][4] for i in range(0, len(params), 6)] == [True, False]
+
+
+def test_another_applicant_cannot_complete_the_session(flask_client, connection, cursor):
+    cursor.results = [[{"id": 3, "applicant_id": 7, "job_id": 2, "question_data": None}], [{"assessment_id": 9}]]
+
+    assert submit(flask_client, applicant_id=8).status_code == 200
+    assert not any(sql.startswith("INSERT INTO assessment_sessions") for sql, _ in cursor.statements)
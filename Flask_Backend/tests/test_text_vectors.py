@@ -0,0 +1,84 @@
+import math
+
+import text_vectors
+from text_vectors import HashingVectorizer, JobSimilarityIndex, decode_vector, encode_vector, store_text_vector
+
+VECTORIZER = HashingVectorizer(n_features=2 ** 12)
+
+RESUMES = {
+    1: "Python developer building Django REST services and PostgreSQL schemas",
+    2: "Frontend engineer working with React, TypeScript and CSS",
+    3: "Data engineer writing Python Spark pipelines on AWS",
+}
+
+
+def rows(resumes):
+    return [(applicant_id, encode_vector(VECTORIZER.transform(text))) for applicant_id, text in resumes.items()]
+
+
+def test_tokens_keep_skill_spellings():
+    assert VECTORIZER.tokens("C++, C# and Node.js with the ASP.NET stack.") == ["c++", "c#", "node.js", "asp.net", "stack"]
+
+
+def test_vector_round_trip():
+    vector = VECTORIZER.transform("python python django")
+    decoded = decode_vector(encode_vector(vector))
+    assert decoded.keys() == vector.keys()
+    assert all(math.isclose(decoded[bucket], vector[bucket], rel_tol=1e-6) for bucket in vector)
+
+
+def test_top_k_ranks_the_closest_resume_first(cursor):
+    index = JobSimilarityIndex(VECTORIZER)
+    cursor.results = [rows(RESUMES)]
+
+    ranked, candidates = index.top_k(cursor, 5, "Senior Python Django developer", k=2)
+    assert candidates == 3
+    assert [applicant_id for applicant_id, _ in ranked] == [1, 3]
+    assert ranked[0][1] > ranked[1][1] > 0
+
+
+def test_entries_are_cached_until_invalidated(cursor):
+    index = JobSimilarityIndex(VECTORIZER)
+    cursor.results = [rows(RESUMES)]
+    index.top_k(cursor, 5, "python")
+    index.top_k(cursor, 5, "react")
+    assert len(cursor.statements) == 1
+
+    index.invalidate(5)
+    cursor.results = [rows(RESUMES)]
+    index.top_k(cursor, 5, "python")
+    assert len(cursor.statements) == 2
+
+
+def test_add_appends_to_the_cached_entry(cursor):
+    index = JobSimilarityIndex(VECTORIZER)
+    cursor.results = [rows({1: RESUMES[1], 2: RESUMES[2]})]
+    index.top_k(cursor, 5, "python")
+
+    index.add(5, 3, VECTORIZER.transform(RESUMES[3]))
+    ranked, candidates = index.top_k(cursor, 5, "Spark pipelines on AWS", k=1)
+
+    assert len(cursor.statements) == 1
+    assert candidates == 3
+    assert ranked[0][0] == 3
+
+
+def test_add_drops_the_entry_for_a_rescreened_candidate(cursor):
+    index = JobSimilarityIndex(VECTORIZER)
+    cursor.results = [rows(RESUMES)]
+    index.top_k(cursor, 5, "python")
+
+    index.add(5, 2, VECTORIZER.transform("Python and Go backend developer"))
+    assert index.stats()["jobs"] == 0
+
+    # Jobs without a cached entry are built from the table on first use
+    index.add(6, 1, VECTORIZER.transform(RESUMES[1]))
+    assert index.stats()["jobs"] == 0
+
+
+def test_store_text_vector_skips_empty_text(cursor):
+    assert store_text_vector(cursor, 5, 1, "  ") is None
+    assert cursor.statements == []
+
+    vector = store_text_vector(cursor, 5, 1, RESUMES[1])
+    assert cursor.statements[0][1] == (encode_vector(vector), text_vectors.TEXT_VECTORIZER.stamp, 5, 1)
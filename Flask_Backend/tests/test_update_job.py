@@ -0,0 +1,107 @@
+import os
+from datetime import datetime
+
+import pytest
+
+# flask_app creates its upload folders under the deployment path at import
+if not os.path.isdir('/home/smarthiringorg/SmartHire/Flask_Backend'):
+    pytest.skip("flask_app needs the deployment directory", allow_module_level=True)
+
+import flask_app
+from flask_app import JOB_COLUMNS
+
+
+class RecordingCache:
+    def __init__(self):
+        self.invalidated = []
+
+    def invalidate(self, *args):
+        self.invalidated.append(args)
+
+
+@pytest.fixture
+def caches(monkeypatch):
+    public_jobs, required_skills = RecordingCache(), RecordingCache()
+    monkeypatch.setattr(flask_app, "PUBLIC_JOBS_CACHE", public_jobs)
+    monkeypatch.setattr(flask_app, "REQUIRED_SKILLS_CACHE", required_skills)
+    return public_jobs, required_skills
+
+
+def stored_job_rows():
+    """The UNION ALL rows load_job_detail reads for job 4"""
+    job = dict.fromkeys(JOB_COLUMNS)
+    job.update(
+        kind='job', id=4, job_name='Backend Engineer', company_name='Acme', salary_range='',
+        type='Full-time', remote_type='Remote', location='Berlin', description='APIs',
+        created_at=datetime(2024, 5, 1, 9, 30)
+    )
+    children = [
+        {'kind': 'responsibilities', 'item_id': 11, 'item_text': 'Build services'},
+        {'kind': 'responsibilities', 'item_id': 12, 'item_text': 'Review code'},
+        {'kind': 'offers', 'item_id': 21, 'item_text': 'Stock options'},
+    ]
+    return [job] + [dict(dict.fromkeys(JOB_COLUMNS), **child) for child in children]
+
+
+def submitted_job(**changes):
+    job = {
+        'job_name': 'Backend Engineer', 'company_name': 'Acme', 'salary_range': '', 'type': 'Full-time',
+        'remote_type': 'Remote', 'location': 'Berlin', 'description': 'APIs',
+        'responsibilities': ['Build services', 'Review code'], 'qualifications': [], 'offers': ['Stock options']
+    }
+    job.update(changes)
+    return job
+
+
+def test_unchanged_job_writes_nothing(flask_client, connection, cursor, caches):
+    cursor.results = [stored_job_rows()]
+
+    response = flask_client.put('/api/jobs/4', json=submitted_job())
+    assert response.get_json() == {"message": "No changes to save", "changed": []}
+    assert len(cursor.statements) == 1
+    assert caches[0].invalidated == [] and caches[1].invalidated == []
+
+
+def test_only_the_changed_field_is_written(flask_client, connection, cursor, caches):
+    cursor.results = [stored_job_rows()]
+
+    response = flask_client.put('/api/jobs/4', json=submitted_job(location='Hamburg'))
+    assert response.get_json()["changed"] == ["location"]
+    assert cursor.statements[1:] == [("UPDATE jobs SET location = %s WHERE id = %s", ["Hamburg", 4])]
+
+
+def test_child_lists_are_synced_in_place(flask_client, connection, cursor, caches):
+    cursor.results = [stored_job_rows()]
+
+    response = flask_client.put('/api/jobs/4', json=submitted_job(
+        responsibilities=['Build services', 'Mentor engineers', 'Run on-call'],
+        offers=[]
+    ))
+    assert response.get_json()["changed"] == ["responsibilities", "offers"]
+    assert cursor.statements[1:] == [
+        ("INSERT INTO responsibilities (id, job_id, responsibility_text) VALUES (%s, %s, %s), (%s, %s, %s) "
+         "ON DUPLICATE KEY UPDATE responsibility_text = VALUES(responsibility_text)",
+         [12, 4, 'Mentor engineers', None, 4, 'Run on-call']),
+        ("DELETE FROM offers WHERE id IN (%s)", [21]),
+    ]
+
+
+def test_update_invalidates_the_job_caches_after_commit(flask_client, connection, cursor, caches):
+    cursor.results = [stored_job_rows()]
+    public_jobs, required_skills = caches
+
+    assert flask_client.put('/api/jobs/4', json=submitted_job(description='gRPC APIs')).status_code == 200
+    assert connection.commits == 1
+    assert public_jobs.invalidated == [()]
+    assert required_skills.invalidated == [(4,)]
+
+
+def test_failed_update_keeps_the_caches(flask_client, connection, cursor, caches):
+    cursor.results = [stored_job_rows()]
+
+    def commit():
+        raise ConnectionError("Lost connection to MySQL server")
+
+    connection.commit = commit
+    assert flask_client.put('/api/jobs/4', json=submitted_job(description='gRPC APIs')).status_code == 500
+    assert caches[0].invalidated == [] and caches[1].invalidated == []
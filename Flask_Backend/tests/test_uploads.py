@@ -0,0 +1,48 @@
+import os
+from concurrent.futures import Future
+
+import pytest
+
+# flask_app creates its upload folders under the deployment path at import
+if not os.path.isdir('/home/smarthiringorg/SmartHire/Flask_Backend'):
+    pytest.skip("flask_app needs the deployment directory", allow_module_level=True)
+
+from flask_app import app, rollback_on_failed_upload, wait_for_uploads
+
+
+class FakeConnection:
+    def __init__(self):
+        self.rolled_back = False
+
+    def rollback(self):
+        self.rolled_back = True
+
+
+def finished(result=None, error=None):
+    future = Future()
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+    return future
+
+
+def test_wait_for_uploads_raises_the_first_failure():
+    with pytest.raises(OSError, match="disk full"):
+        wait_for_uploads(finished("resume.pdf"), None, finished(error=OSError("disk full")))
+
+
+def test_failed_upload_rolls_back_instead_of_committing():
+    conn = FakeConnection()
+    with app.app_context():
+        response, status = rollback_on_failed_upload(conn, finished(error=OSError("disk full")))
+
+    assert status == 500
+    assert "disk full" in response.get_json()["error"]
+    assert conn.rolled_back
+
+
+def test_written_uploads_leave_the_transaction_alone():
+    conn = FakeConnection()
+    assert rollback_on_failed_upload(conn, finished("resume.pdf"), None) is None
+    assert not conn.rolled_back
@@ -0,0 +1,296 @@
+"""
+text_vectors.py - Hashed TF-IDF vectors for resume to job similarity
+
+Resumes and job texts are turned into sparse term-frequency vectors with the
+hashing trick (unigrams and bigrams hashed into a fixed number of buckets),
+so no vocabulary has to be fitted and everything runs offline on CPU. Each
+application's resume vector is stored in job_applicants.text_vector when it
+is screened. A per-job index weights the job's candidate vectors by IDF
+computed over that job's own pool and serves top-k cosine similarity.
+
+NumPy and SciPy are used when installed; otherwise the same scoring runs
+over Python dicts.
+"""
+
+import os
+import re
+import math
+import time
+import zlib
+import heapq
+import struct
+import logging
+import threading
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:
+    np = None
+    sparse = None
+
+logger = logging.getLogger(__name__)
+
+# Keeps skill spellings such as c++, c#, node.js and asp.net as one token
+TOKEN_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+
+STOP_WORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or that the this to was were will with
+i me my we our you your he she they them their his her not but if so than then there these those
+""".split())
+
+
+class HashingVectorizer:
+    """Sparse {bucket: weight} vectors of sublinear term frequencies"""
+
+    version = 1
+
+    def __init__(self, n_features=2 ** 18, ngrams=2):
+        self.n_features = n_features
+        self.ngrams = ngrams
+        self.stamp = f"v{self.version}:h{n_features}:n{ngrams}"
+
+    def tokens(self, text):
+        return [
+            token.strip('.') for token in TOKEN_PATTERN.findall((text or '').lower())
+            if token not in STOP_WORDS and len(token) < 40
+        ]
+
+    def transform(self, text):
+        tokens = self.tokens(text)
+        counts = {}
+        for n in range(1, self.ngrams + 1):
+            for i in range(len(tokens) - n + 1):
+                # crc32 is stable across processes, unlike hash()
+                bucket = zlib.crc32(' '.join(tokens[i:i + n]).encode('utf-8')) % self.n_features
+                counts[bucket] = counts.get(bucket, 0) + 1
+        return {bucket: 1.0 + math.log(count) for bucket, count in counts.items()}
+
+
+def encode_vector(vector):
+    """Packs a {bucket: weight} vector as little-endian (count, buckets, weights)"""
+    buckets = sorted(vector)
+    return struct.pack(
+        f"<I{len(buckets)}I{len(buckets)}f",
+        len(buckets), *buckets, *(vector[bucket] for bucket in buckets)
+    )
+
+
+def decode_vector(data):
+    count = struct.unpack_from("<I", data)[0]
+    values = struct.unpack_from(f"<{count}I{count}f", data, 4)
+    return dict(zip(values[:count], values[count:]))
+
+
+def _normalized(vector):
+    norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+    if not norm:
+        return {}
+    return {bucket: weight / norm for bucket, weight in vector.items()}
+
+
+class JobSimilarityIndex:
+    """
+    Per-job candidate vectors weighted by the pool's IDF, for cosine top-k.
+
+    An entry is rebuilt from job_applicants when it is missing, invalidated
+    or older than `ttl` seconds. Newly screened candidates are appended to a
+    cached entry with add(), weighted by the IDF it was built with; the IDF
+    itself is recomputed on the next rebuild.
+    """
+
+    def __init__(self, vectorizer, ttl=300):
+        self.vectorizer = vectorizer
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._version = 0
+        self._entries = {}
+
+    @classmethod
+    def from_env(cls, vectorizer):
+        return cls(vectorizer, ttl=float(os.getenv('JOB_SIMILARITY_CACHE_TTL', 300)))
+
+    def invalidate(self, job_id=None):
+        with self._lock:
+            self._version += 1
+            if job_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(int(job_id), None)
+
+    def _entry(self, cursor, job_id):
+        entry = self._entries.get(job_id)
+        if entry and time.monotonic() - entry['built_at'] < self.ttl:
+            return entry
+
+        version = self._version
+        entry = self._build(cursor, job_id)
+        with self._lock:
+            # Don't store an index that an invalidate() raced past
+            if version == self._version:
+                self._entries[job_id] = entry
+        return entry
+
+    def _build(self, cursor, job_id):
+        started = time.perf_counter()
+        cursor.execute("""
+            SELECT applicant_id, text_vector FROM job_applicants
+            WHERE job_id = %s AND text_vector IS NOT NULL AND text_vector_stamp = %s
+            ORDER BY applicant_id
+        """, (job_id, self.vectorizer.stamp))
+
+        applicant_ids = []
+        vectors = []
+        for applicant_id, data in cursor.fetchall():
+            applicant_ids.append(applicant_id)
+            vectors.append(decode_vector(bytes(data)))
+
+        document_frequency = {}
+        for vector in vectors:
+            for bucket in vector:
+                document_frequency[bucket] = document_frequency.get(bucket, 0) + 1
+
+        # Smoothed IDF; buckets no candidate has get the maximum weight
+        count = len(vectors)
+        idf = {bucket: math.log((1 + count) / (1 + df)) + 1 for bucket, df in document_frequency.items()}
+        default_idf = math.log(1 + count) + 1
+
+        weighted = [
+            _normalized({bucket: weight * idf[bucket] for bucket, weight in vector.items()})
+            for vector in vectors
+        ]
+
+        logger.info(f"Built similarity index for job {job_id}: {count} candidates in "
+                    f"{(time.perf_counter() - started) * 1000:.1f}ms")
+        return {
+            'applicant_ids': applicant_ids,
+            'vectors': weighted,
+            'matrix': self._matrix(weighted),
+            'idf': idf,
+            'default_idf': default_idf,
+            'built_at': time.monotonic()
+        }
+
+    def _matrix(self, weighted):
+        """CSR matrix of the weighted vectors, or None without SciPy"""
+        if sparse is None or not weighted:
+            return None
+
+        indptr = [0]
+        indices = []
+        data = []
+        for vector in weighted:
+            indices.extend(vector)
+            data.extend(vector.values())
+            indptr.append(len(indices))
+        return sparse.csr_matrix(
+            (np.array(data, dtype=np.float32), np.array(indices, dtype=np.int32), np.array(indptr)),
+            shape=(len(weighted), self.vectorizer.n_features)
+        )
+
+    def add(self, job_id, applicant_id, vector):
+        """
+        Appends a committed candidate vector to the job's cached entry, if
+        there is one. Lists are copied and the entry swapped in, so concurrent
+        queries keep a consistent snapshot.
+        """
+        job_id = int(job_id)
+        with self._lock:
+            # An index being built right now may or may not have seen this row
+            self._version += 1
+            entry = self._entries.get(job_id)
+            if entry is None:
+                return
+
+            if applicant_id in entry['applicant_ids']:
+                # A re-screened candidate replaces its vector on the next rebuild
+                del self._entries[job_id]
+                return
+
+            idf = entry['idf']
+            weighted = _normalized({
+                bucket: weight * idf.get(bucket, entry['default_idf'])
+                for bucket, weight in vector.items()
+            })
+
+            matrix = entry['matrix']
+            if matrix is not None:
+                matrix = sparse.vstack([matrix, self._matrix([weighted])], format='csr')
+            else:
+                matrix = self._matrix(entry['vectors'] + [weighted])
+
+            self._entries[job_id] = dict(
+                entry,
+                applicant_ids=entry['applicant_ids'] + [applicant_id],
+                vectors=entry['vectors'] + [weighted],
+                matrix=matrix
+            )
+
+    def top_k(self, cursor, job_id, job_text, k=20):
+        """
+        The `k` candidates of a job whose resumes are most similar to
+        `job_text`, as [(applicant_id, cosine similarity)] best first, and
+        the number of candidates that have a vector.
+        """
+        entry = self._entry(cursor, int(job_id))
+        applicant_ids = entry['applicant_ids']
+        if not applicant_ids:
+            return [], 0
+
+        idf = entry['idf']
+        query = _normalized({
+            bucket: weight * idf.get(bucket, entry['default_idf'])
+            for bucket, weight in self.vectorizer.transform(job_text).items()
+        })
+        if not query:
+            return [], len(applicant_ids)
+
+        if entry['matrix'] is not None:
+            dense_query = np.zeros(self.vectorizer.n_features, dtype=np.float32)
+            dense_query[list(query)] = list(query.values())
+            scores = entry['matrix'].dot(dense_query)
+            k = min(k, len(scores))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind='stable')]
+            ranked = [(applicant_ids[i], float(scores[i])) for i in top.tolist()]
+        else:
+            scores = [
+                sum(weight * vector.get(bucket, 0.0) for bucket, weight in query.items())
+                for vector in entry['vectors']
+            ]
+            top = heapq.nlargest(k, range(len(scores)), key=scores.__getitem__)
+            ranked = [(applicant_ids[i], scores[i]) for i in top]
+
+        return [(applicant_id, round(score, 4)) for applicant_id, score in ranked], len(applicant_ids)
+
+    def stats(self):
+        return {
+            "jobs": len(self._entries),
+            "candidates": sum(len(entry['applicant_ids']) for entry in self._entries.values()),
+            "ttl": self.ttl
+        }
+
+
+TEXT_VECTORIZER = HashingVectorizer(
+    n_features=2 ** int(os.getenv('TEXT_VECTOR_BITS', 18)),
+    ngrams=int(os.getenv('TEXT_VECTOR_NGRAMS', 2))
+)
+
+JOB_SIMILARITY = JobSimilarityIndex.from_env(TEXT_VECTORIZER)
+
+
+def store_text_vector(cursor, job_id, applicant_id, text):
+    """
+    Vectorizes a resume and saves it on the application. Returns the vector,
+    to pass to JOB_SIMILARITY.add() once the transaction commits, or None if
+    the text was empty.
+    """
+    vector = TEXT_VECTORIZER.transform(text)
+    if not vector:
+        return None
+
+    cursor.execute("""
+        UPDATE job_applicants SET text_vector = %s, text_vector_stamp = %s
+        WHERE job_id = %s AND applicant_id = %s
+    """, (encode_vector(vector), TEXT_VECTORIZER.stamp, job_id, applicant_id))
+    return vector
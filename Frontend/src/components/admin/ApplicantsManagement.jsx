@@ -10,6 +10,8 @@ function ApplicantsManagement() {
   const [error, setError] = useState(null);
   const [filter, setFilter] = useState("All");
   const [search, setSearch] = useState("");
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [selectedApplicantId, setSelectedApplicantId] = useState(null);
   const [showDetailModal, setShowDetailModal] = useState(false);
   
@@ -23,14 +25,25 @@ function ApplicantsManagement() {
     };
   }, []);
   
+  // Filtering happens on the server; wait for the user to stop typing
   useEffect(() => {
-    fetchApplicants();
-  }, []);
+    const timer = setTimeout(() => fetchApplicants(), search ? 300 : 0);
+    return () => clearTimeout(timer);
+  }, [filter, search]);
   
-  const fetchApplicants = async () => {
-    setLoading(true);
+  const fetchApplicants = async (cursor = null) => {
+    if (cursor) {
+      setLoadingMore(true);
+    } else {
+      setLoading(true);
+    }
     try {
-      const response = await fetch('/api/applicants', {
+      const params = new URLSearchParams();
+      if (filter !== "All") params.set('status', filter);
+      if (search) params.set('q', search);
+      if (cursor) params.set('cursor', cursor);
+      
+      const response = await fetch(`/api/applicants?${params.toString()}`, {
         credentials: 'include'
       });
       
@@ -41,7 +54,8 @@ function ApplicantsManagement() {
       const data = await response.json();
       // Only update state if component is still mounted
       if (isMounted.current) {
-        setApplicants(data);
+        setApplicants(prevApplicants => cursor ? [...prevApplicants, ...data.applicants] : data.applicants);
+        setNextCursor(data.next_cursor);
       }
     } catch (error) {
       console.error('Error fetching applicants:', error);
@@ -53,6 +67,7 @@ function ApplicantsManagement() {
       // Only update state if component is still mounted
       if (isMounted.current) {
         setLoading(false);
+        setLoadingMore(false);
       }
     }
   };
@@ -117,18 +132,9 @@ function ApplicantsManagement() {
     }
   };
   
+  // The server already filtered; this only hides rows whose status was just changed here
   const filteredApplicants = applicants
-    .filter(app => filter === "All" ? true : app.status === filter)
-    .filter(app => {
-      if (!search) return true;
-      const searchLower = search.toLowerCase();
-      return (
-        app.full_name.toLowerCase().includes(searchLower) ||
-        app.institution.toLowerCase().includes(searchLower) ||
-        app.location.toLowerCase().includes(searchLower) ||
-        app.keywords.toLowerCase().includes(searchLower)
-      );
-    });
+    .filter(app => filter === "All" ? true : app.status === filter);
   
   const handleApplicantClick = (applicantId) => {
     setSelectedApplicantId(applicantId);
@@ -148,7 +154,8 @@ function ApplicantsManagement() {
   };
   
   if (!currentAdmin) return <div className="loading">Checking permissions...</div>;
-  if (loading) return <div className="loading">Loading applicants...</div>;
+  // Keep the search box mounted while a new filter or search is loading
+  if (loading && applicants.length === 0) return <div className="loading">Loading applicants...</div>;
   if (error) return <div className="error-message">{error}</div>;
   
   return (
@@ -307,6 +314,18 @@ function ApplicantsManagement() {
         )}
       </div>
       
+      {nextCursor && (
+        <div className="load-more">
+          <button 
+            onClick={() => fetchApplicants(nextCursor)} 
+            className="app-btn"
+            disabled={loadingMore}
+          >
+            {loadingMore ? 'Loading...' : 'Load more applicants'}
+          </button>
+        </div>
+      )}
+      
       {/* Updated SimpleModal implementation */}
       <SimpleModal 
         isOpen={showDetailModal} 
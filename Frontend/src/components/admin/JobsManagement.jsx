@@ -710,6 +710,8 @@ function JobFormModal({ onHide, jobId, isEdit }) {
 function JobDetailModal({ onHide, jobId, onEdit }) {
   const [job, setJob] = useState(null);
   const [applicants, setApplicants] = useState([]);
+  const [applicantsTotal, setApplicantsTotal] = useState(0);
+  const [applicantsCursor, setApplicantsCursor] = useState(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
   
@@ -753,32 +755,7 @@ function JobDetailModal({ onHide, jobId, onEdit }) {
       setJob(jobData);
 
       // Then try to get the applicants
-      try {
-        const applicantsResponse = await fetch(`/api/jobs/${jobId}/applicants`, {
-          credentials: 'include',
-          headers: {
-            'Accept': 'application/json'
-          }
-        });
-
-        // Check if component is still mounted before updating state
-        if (!isMounted.current) return;
-
-        if (applicantsResponse.ok) {
-          const applicantsData = await applicantsResponse.json();
-          setApplicants(applicantsData);
-        } else {
-          console.warn(`Couldn't fetch applicants: ${applicantsResponse.status}`);
-          setApplicants([]);
-        }
-      } catch (appError) {
-        console.warn("Error fetching applicants:", appError);
-        
-        // Only update state if component is still mounted
-        if (isMounted.current) {
-          setApplicants([]);
-        }
-      }
+      await fetchApplicantsPage();
     } catch (error) {
       console.error("Error in job details fetch:", error);
       
@@ -794,6 +771,48 @@ function JobDetailModal({ onHide, jobId, onEdit }) {
     }
   };
 
+  const fetchApplicantsPage = async (cursor = null) => {
+    try {
+      const params = new URLSearchParams({ sort: 'applied_at', order: 'desc' });
+      if (cursor) {
+        params.set('cursor', cursor);
+      } else {
+        params.set('include_total', '1');
+      }
+      
+      const applicantsResponse = await fetch(`/api/jobs/${jobId}/applicants?${params.toString()}`, {
+        credentials: 'include',
+        headers: {
+          'Accept': 'application/json'
+        }
+      });
+
+      // Check if component is still mounted before updating state
+      if (!isMounted.current) return;
+
+      if (applicantsResponse.ok) {
+        const applicantsData = await applicantsResponse.json();
+        setApplicants(prevApplicants => cursor ? [...prevApplicants, ...applicantsData.applicants] : applicantsData.applicants);
+        setApplicantsCursor(applicantsData.next_cursor);
+        if (!cursor) {
+          setApplicantsTotal(applicantsData.total);
+        }
+      } else {
+        console.warn(`Couldn't fetch applicants: ${applicantsResponse.status}`);
+        if (!cursor) {
+          setApplicants([]);
+        }
+      }
+    } catch (appError) {
+      console.warn("Error fetching applicants:", appError);
+      
+      // Only update state if component is still mounted
+      if (isMounted.current && !cursor) {
+        setApplicants([]);
+      }
+    }
+  };
+
   const handleEditClick = () => {
     onHide();
     onEdit(jobId);
@@ -904,7 +923,7 @@ function JobDetailModal({ onHide, jobId, onEdit }) {
               </div>
 
               <div className="job-applicants-section">
-                <h3>Applicants for this Job</h3>
+                <h3>Applicants for this Job{applicantsTotal > 0 && ` (${applicantsTotal})`}</h3>
 
                 {applicants.length > 0 ? (
                   <div className="applicants-list">
@@ -916,7 +935,10 @@ function JobDetailModal({ onHide, jobId, onEdit }) {
                           </div>
                           <div className="applicant-details">
                             <h4>{applicant.full_name}</h4>
-                            <p className="applicant-meta">{applicant.institution}</p>
+                            <p className="applicant-meta">
+                              {applicant.match_score !== null && `${Math.round(applicant.match_score)}% match · `}
+                              Applied {new Date(applicant.applied_at).toLocaleDateString()}
+                            </p>
                             <span className={`status-indicator ${applicant.status.toLowerCase()}`}>
                               {applicant.status}
                             </span>
@@ -931,6 +953,14 @@ function JobDetailModal({ onHide, jobId, onEdit }) {
                         </button>
                       </div>
                     ))}
+                    {applicantsCursor && (
+                      <button
+                        onClick={() => fetchApplicantsPage(applicantsCursor)}
+                        className="view-applicant-button"
+                      >
+                        Load more applicants
+                      </button>
+                    )}
                   </div>
                 ) : (
                   <div className="no-applicants">